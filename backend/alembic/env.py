@@ -10,7 +10,7 @@ sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 from app.db.session import Base
 from app.core.config import settings
-from app.models import User, Project
+from app.models import User, Project, RevokedRefreshToken, UserCounters, ArchivedUser, ArchivedProject
 
 # this is the Alembic Config object
 config = context.config
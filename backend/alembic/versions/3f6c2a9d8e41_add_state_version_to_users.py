@@ -0,0 +1,25 @@
+"""add state version to users
+
+Revision ID: 3f6c2a9d8e41
+Revises: 8ba682d24ea3
+Create Date: 2026-10-17 09:12:31.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f6c2a9d8e41'
+down_revision = '8ba682d24ea3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Bumped whenever role or active/deleted status changes; embedded in access tokens
+    op.add_column('users', sa.Column('state_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'state_version')
@@ -0,0 +1,76 @@
+"""add archive tables
+
+Revision ID: a4c9e1b7d3f2
+Revises: f7b2d9e4a1c3
+Create Date: 2026-10-17 17:05:12.640218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4c9e1b7d3f2'
+down_revision = 'f7b2d9e4a1c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Reuse the enum types of the users table
+    userrole = postgresql.ENUM(name='userrole', create_type=False)
+    oauthprovider = postgresql.ENUM(name='oauthprovider', create_type=False)
+
+    op.create_table(
+        'archived_users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('hashed_password', sa.String(), nullable=True),
+        sa.Column('full_name', sa.String(), nullable=True),
+        sa.Column('role', userrole, nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('is_verified', sa.Boolean(), nullable=False),
+        sa.Column('oauth_provider', oauthprovider, nullable=False),
+        sa.Column('oauth_provider_id', sa.String(), nullable=True),
+        sa.Column('profile_picture_url', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_archived_users_email', 'archived_users', ['email'], unique=False)
+
+    op.create_table(
+        'archived_projects',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_archived_projects_owner_id', 'archived_projects', ['owner_id'], unique=False)
+
+    # Lets the archive job find its next batch without scanning users
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_deleted_at_id',
+            'users',
+            ['deleted_at', 'id'],
+            unique=False,
+            postgresql_where=sa.text('is_deleted = true'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_deleted_at_id', table_name='users', postgresql_concurrently=True)
+    op.drop_index('ix_archived_projects_owner_id', table_name='archived_projects')
+    op.drop_table('archived_projects')
+    op.drop_index('ix_archived_users_email', table_name='archived_users')
+    op.drop_table('archived_users')
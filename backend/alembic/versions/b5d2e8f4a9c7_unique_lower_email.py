@@ -0,0 +1,66 @@
+"""make live user emails unique case-insensitively
+
+Revision ID: b5d2e8f4a9c7
+Revises: a4c9e1b7d3f2
+Create Date: 2026-10-18 09:42:17.318504
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5d2e8f4a9c7'
+down_revision = 'a4c9e1b7d3f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Emails are looked up by lower(email), so live users whose emails differ only
+    # in case make login and registration pick one of them arbitrarily. They have
+    # to be merged or soft-deleted by hand before the unique index can be built.
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT lower(email) AS email, array_agg(id ORDER BY id) AS ids FROM users "
+        "WHERE is_deleted = false GROUP BY lower(email) HAVING count(*) > 1 ORDER BY 1"
+    )).all()
+    if duplicates:
+        listing = "\n".join(f"  {row.email}: user ids {row.ids}" for row in duplicates)
+        raise RuntimeError(
+            f"{len(duplicates)} emails belong to more than one live user when compared "
+            f"case-insensitively; resolve them before upgrading:\n{listing}"
+        )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_users_lower_email_live',
+            'users',
+            [sa.text('lower(email)')],
+            unique=True,
+            postgresql_where=sa.text('is_deleted = false'),
+            postgresql_concurrently=True,
+        )
+        # Both covered by the index above
+        op.drop_index('ix_users_lower_email_live', table_name='users', postgresql_concurrently=True)
+        op.drop_index('idx_users_email_active', table_name='users', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_users_email_active',
+            'users',
+            ['email'],
+            unique=True,
+            postgresql_where=sa.text('is_deleted = false'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_users_lower_email_live',
+            'users',
+            [sa.text('lower(email)')],
+            unique=False,
+            postgresql_where=sa.text('is_deleted = false'),
+            postgresql_concurrently=True,
+        )
+        op.drop_index('uq_users_lower_email_live', table_name='users', postgresql_concurrently=True)
@@ -0,0 +1,37 @@
+"""add revoked refresh tokens
+
+Revision ID: b71e4d05c9a2
+Revises: 3f6c2a9d8e41
+Create Date: 2026-10-17 10:02:47.583120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b71e4d05c9a2'
+down_revision = '3f6c2a9d8e41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'revoked_refresh_tokens',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_revoked_refresh_tokens_user_id'), 'revoked_refresh_tokens', ['user_id'], unique=False)
+    op.create_index(op.f('ix_revoked_refresh_tokens_expires_at'), 'revoked_refresh_tokens', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_revoked_refresh_tokens_expires_at'), table_name='revoked_refresh_tokens')
+    op.drop_index(op.f('ix_revoked_refresh_tokens_user_id'), table_name='revoked_refresh_tokens')
+    op.drop_table('revoked_refresh_tokens')
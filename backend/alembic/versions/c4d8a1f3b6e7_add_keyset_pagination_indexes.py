@@ -0,0 +1,34 @@
+"""add keyset pagination indexes
+
+Revision ID: c4d8a1f3b6e7
+Revises: b71e4d05c9a2
+Create Date: 2026-10-17 11:24:09.318452
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d8a1f3b6e7'
+down_revision = 'b71e4d05c9a2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_projects_owner_id_created_at_id', 'projects', ['owner_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+    op.create_index(
+        'ix_users_live_created_at_id',
+        'users',
+        ['created_at', 'id'],
+        unique=False,
+        postgresql_where=sa.text('is_deleted = false'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_live_created_at_id', table_name='users')
+    op.drop_index('ix_users_created_at_id', table_name='users')
+    op.drop_index('ix_projects_owner_id_created_at_id', table_name='projects')
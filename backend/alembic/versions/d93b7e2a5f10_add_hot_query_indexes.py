@@ -0,0 +1,57 @@
+"""add hot query indexes
+
+Revision ID: d93b7e2a5f10
+Revises: c4d8a1f3b6e7
+Create Date: 2026-10-17 12:08:51.904617
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd93b7e2a5f10'
+down_revision = 'c4d8a1f3b6e7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The project (owner_id, created_at, id) index was added in c4d8a1f3b6e7.
+    # Built concurrently so the users table stays writable during the migration.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_lower_email_live',
+            'users',
+            [sa.text('lower(email)')],
+            unique=False,
+            postgresql_where=sa.text('is_deleted = false'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_users_role_active_live',
+            'users',
+            ['role', 'is_active'],
+            unique=False,
+            postgresql_where=sa.text('is_deleted = false'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_users_oauth_provider_provider_id',
+            'users',
+            ['oauth_provider', 'oauth_provider_id'],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        # Superseded by the composite index above
+        op.drop_index('ix_users_oauth_provider_id', table_name='users', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_oauth_provider_id', 'users', ['oauth_provider_id'], unique=False, postgresql_concurrently=True
+        )
+        op.drop_index('ix_users_oauth_provider_provider_id', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix_users_role_active_live', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix_users_lower_email_live', table_name='users', postgresql_concurrently=True)
@@ -0,0 +1,43 @@
+"""add user counters
+
+Revision ID: e2f4c7a9b3d1
+Revises: d93b7e2a5f10
+Create Date: 2026-10-17 12:47:30.215846
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+from app.models.user_counters import install_counters
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2f4c7a9b3d1'
+down_revision = 'd93b7e2a5f10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_counters',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('total_users', sa.Integer(), nullable=False),
+        sa.Column('active_users', sa.Integer(), nullable=False),
+        sa.Column('inactive_users', sa.Integer(), nullable=False),
+        sa.Column('admin_users', sa.Integer(), nullable=False),
+        sa.Column('deleted_users', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    # Without the trigger users writes skip the counters row entirely; turning
+    # USER_STATS_COUNTERS on later needs python -m app.commands.user_counters
+    if settings.USER_STATS_COUNTERS:
+        install_counters(op.get_bind())
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS users_counters ON users')
+    op.execute('DROP FUNCTION IF EXISTS user_counters_apply()')
+    op.drop_table('user_counters')
@@ -0,0 +1,43 @@
+"""add project search vector
+
+Revision ID: f1a3c6e8d2b4
+Revises: e2f4c7a9b3d1
+Create Date: 2026-10-17 15:42:10.318274
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.models.project import SEARCH_VECTOR_SQL
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1a3c6e8d2b4'
+down_revision = 'e2f4c7a9b3d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A stored generated column rewrites the projects table once; afterwards
+    # Postgres keeps it current on every insert and update of title/description.
+    op.add_column(
+        'projects',
+        sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR_SQL, persisted=True)),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_projects_search_vector',
+            'projects',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_projects_search_vector', table_name='projects', postgresql_concurrently=True)
+    op.drop_column('projects', 'search_vector')
@@ -0,0 +1,47 @@
+"""add user search indexes
+
+Revision ID: f7b2d9e4a1c3
+Revises: f1a3c6e8d2b4
+Create Date: 2026-10-17 16:20:37.551902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7b2d9e4a1c3'
+down_revision = 'f1a3c6e8d2b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # pg_trgm ships with Postgres (contrib); creating it needs CREATE on the database
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_email_trgm',
+            'users',
+            ['email'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'email': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_users_full_name_trgm',
+            'users',
+            ['full_name'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'full_name': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    # The extension is left installed; other objects may depend on it
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_full_name_trgm', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix_users_email_trgm', table_name='users', postgresql_concurrently=True)
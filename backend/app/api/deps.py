@@ -2,28 +2,28 @@ from typing import Generator, Optional
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db
 from app.core.security import decode_token
-from app.models.user import User
-from app.services import user as user_service
+from app.services import user as user_service, user_cache
+from app.services.aio import user as aio_user_service
+from app.services.user_cache import AuthUser
+from app.core.config import settings
 from app.core.constants import UserRole
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
 
-def get_current_user(
-    request: Request,
-    db: Session = Depends(get_db),
-    token: Optional[str] = Depends(oauth2_scheme)
-) -> User:
-    """Get current authenticated user from httpOnly cookie or Authorization header."""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
 
+def _token_payload(request: Request, token: Optional[str]) -> dict:
+    """Decode the access token from the httpOnly cookie or Authorization header."""
     # Try to get token from cookie first, then fall back to Authorization header
     access_token = request.cookies.get("access_token")
     if not access_token:
@@ -39,14 +39,21 @@ def get_current_user(
     if payload.get("type") != "access":
         raise credentials_exception
 
-    user_id: str = payload.get("sub")
-    if user_id is None:
+    if payload.get("sub") is None:
         raise credentials_exception
 
-    user = user_service.get_user(db, user_id=int(user_id))
-    if user is None:
-        raise credentials_exception
+    return payload
 
+
+def _user_without_db(payload: dict) -> Optional[AuthUser]:
+    """Resolve the user from the cache, or from the token claims when trusted."""
+    user = user_cache.get(int(payload["sub"]))
+    if user is None and settings.JWT_TRUST_EMBEDDED_CLAIMS:
+        user = user_cache.from_claims(payload)
+    return user
+
+
+def _ensure_not_deleted(user: AuthUser) -> AuthUser:
     # Check if user has been deleted
     if user.is_deleted:
         raise HTTPException(
@@ -54,22 +61,69 @@ def get_current_user(
             detail="User account has been deleted",
             headers={"WWW-Authenticate": "Bearer"},
         )
-
     return user
 
 
+def get_current_user(
+    request: Request,
+    db: Session = Depends(get_db),
+    token: Optional[str] = Depends(oauth2_scheme)
+) -> AuthUser:
+    """
+    Get current authenticated user from httpOnly cookie or Authorization header.
+
+    Returns the cached auth record; load the full row with user_service.get_user
+    when the endpoint needs more than id, role and status.
+    """
+    payload = _token_payload(request, token)
+
+    user = _user_without_db(payload)
+    if user is None:
+        db_user = user_service.get_user(db, user_id=int(payload["sub"]))
+        if db_user is None:
+            raise credentials_exception
+        user = user_cache.remember(db_user)
+
+    return _ensure_not_deleted(user)
+
+
+async def get_current_user_async(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    token: Optional[str] = Depends(oauth2_scheme)
+) -> AuthUser:
+    """Async-mode variant of get_current_user; a cache miss queries through asyncpg."""
+    payload = _token_payload(request, token)
+
+    user = _user_without_db(payload)
+    if user is None:
+        db_user = await aio_user_service.get_user(db, user_id=int(payload["sub"]))
+        if db_user is None:
+            raise credentials_exception
+        user = user_cache.remember(db_user)
+
+    return _ensure_not_deleted(user)
+
+
 def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: AuthUser = Depends(get_current_user),
+) -> AuthUser:
     """Get current active user."""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
 
+async def get_current_active_user_async(
+    current_user: AuthUser = Depends(get_current_user_async),
+) -> AuthUser:
+    """Async-mode variant of get_current_active_user."""
+    return get_current_active_user(current_user)
+
+
 def get_current_admin_user(
-    current_user: User = Depends(get_current_active_user),
-) -> User:
+    current_user: AuthUser = Depends(get_current_active_user),
+) -> AuthUser:
     """Get current admin user."""
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
@@ -77,3 +131,10 @@ def get_current_admin_user(
             detail="Not enough permissions"
         )
     return current_user
+
+
+async def get_current_admin_user_async(
+    current_user: AuthUser = Depends(get_current_active_user_async),
+) -> AuthUser:
+    """Async-mode variant of get_current_admin_user."""
+    return get_current_admin_user(current_user)
@@ -1,6 +1,16 @@
 from fastapi import APIRouter
+from app.core.config import settings
 from app.api.v1.routers import auth, users, projects, admin, oauth
 
+if settings.DB_ASYNC_MODE:
+    from app.api.v1.routers import (
+        admin_async as admin,
+        auth_async as auth,
+        oauth_async as oauth,
+        projects_async as projects,
+        users_async as users,
+    )
+
 api_router = APIRouter()
 
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
@@ -1,36 +1,132 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import io
+import json
+import tempfile
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from app.core.config import settings
+from app.core.constants import OAuthProvider, UserRole
+from app.core.pagination import NEXT_CURSOR_HEADER, next_cursor
+from app.core.password_pool import password_pool
+from app.db.query_log import query_log
 from app.db.session import get_db
+from app.schemas.query_log import StatementStats
 from app.schemas.user import User, UserRoleUpdate, UserStats
 from app.services import user as user_service
+from app.services import user_import
+from app.services import export as export_service
 from app.api.deps import get_current_admin_user
-from app.models.user import User as UserModel
+from app.services.user_cache import AuthUser
 
 router = APIRouter()
 
 
 @router.get("/users", response_model=List[User])
 def list_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     include_deleted: bool = False,
-    current_user: UserModel = Depends(get_current_admin_user),
+    cursor: Optional[str] = None,
+    q: Optional[str] = Query(None, max_length=256),
+    role: Optional[UserRole] = None,
+    is_active: Optional[bool] = None,
+    oauth_provider: Optional[OAuthProvider] = None,
+    current_user: AuthUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get list of all users (admin only).
+    Get list of all users (admin only), oldest first.
     Can optionally include deleted users.
+    `q` (3+ characters) matches part of the email or name, or a similar name;
+    role, is_active and oauth_provider narrow the results further.
+    Pass the X-Next-Cursor response header as `cursor` to fetch the next page.
     """
     users = user_service.get_users_with_filters(
-        db, skip=skip, limit=limit, include_deleted=include_deleted
+        db,
+        skip=skip,
+        limit=limit,
+        include_deleted=include_deleted,
+        cursor=cursor,
+        q=q,
+        role=role,
+        is_active=is_active,
+        oauth_provider=oauth_provider,
     )
+    next_page = next_cursor(users, limit)
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
     return users
 
 
+@router.post("/users/import")
+async def import_users(
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    current_user: AuthUser = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Bulk import users from the request body (admin only).
+    CSV needs an email,password,full_name header; NDJSON takes one UserCreate object per line.
+    Streams back NDJSON: an error line per rejected row, a progress line per chunk
+    and a final summary line. A failure part way through ends the stream with a
+    fatal error line and the summary of what was committed. Answers 503 when the
+    password pool has no room for the import.
+    """
+    # Hold the pool slots up front so a busy pool is a 503, not a stream cut short
+    slots = password_pool.reserve(password_pool.workers)
+    # Spool the upload so the body is read once, without holding large files in memory;
+    # past 8 MiB it goes to disk, so write from a thread
+    upload = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    try:
+        async for chunk in request.stream():
+            await run_in_threadpool(upload.write, chunk)
+        await run_in_threadpool(upload.seek, 0)
+    except BaseException:
+        password_pool.release(slots)
+        upload.close()
+        raise
+    stream = io.TextIOWrapper(upload, encoding="utf-8-sig", errors="replace", newline="")
+
+    async def events():
+        async for event in user_import.import_users(
+            db, stream, format, settings.USER_IMPORT_CHUNK_SIZE, reserved=slots
+        ):
+            yield json.dumps(event) + "\n"
+
+    # Runs after the stream ends, and also when the client goes away before it starts
+    async def cleanup():
+        password_pool.release(slots)
+        stream.close()
+
+    return StreamingResponse(events(), media_type="application/x-ndjson", background=BackgroundTask(cleanup))
+
+
+@router.get("/users/export")
+def export_users(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    include_deleted: bool = False,
+    current_user: AuthUser = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream every user as NDJSON or CSV (admin only).
+    """
+    stmt = export_service.users_statement(include_deleted=include_deleted)
+    return StreamingResponse(
+        export_service.stream_export(db, stmt, format, settings.EXPORT_BATCH_SIZE),
+        media_type=export_service.FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
+
+
 @router.get("/users/stats", response_model=UserStats)
 def get_user_statistics(
-    current_user: UserModel = Depends(get_current_admin_user),
+    current_user: AuthUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -41,10 +137,33 @@ def get_user_statistics(
     return stats
 
 
+@router.get("/slow-queries", response_model=List[StatementStats])
+def list_slow_queries(
+    limit: int = Query(20, ge=1, le=100),
+    current_user: AuthUser = Depends(get_current_admin_user)
+):
+    """
+    Get the SQL statements with the most total execution time in this worker (admin only).
+    Slow calls record the route and request ID that issued them; some also carry a query plan.
+    """
+    return query_log.top(limit)
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+def reset_slow_queries(
+    current_user: AuthUser = Depends(get_current_admin_user)
+):
+    """
+    Reset this worker's statement timings (admin only).
+    """
+    query_log.clear()
+    return None
+
+
 @router.put("/users/{user_id}/deactivate", response_model=User)
 def deactivate_user(
     user_id: int,
-    current_user: UserModel = Depends(get_current_admin_user),
+    current_user: AuthUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -62,7 +181,7 @@ def deactivate_user(
 @router.put("/users/{user_id}/activate", response_model=User)
 def activate_user(
     user_id: int,
-    current_user: UserModel = Depends(get_current_admin_user),
+    current_user: AuthUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -80,7 +199,7 @@ def activate_user(
 def change_user_role(
     user_id: int,
     role_update: UserRoleUpdate,
-    current_user: UserModel = Depends(get_current_admin_user),
+    current_user: AuthUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -101,7 +220,7 @@ def change_user_role(
 @router.delete("/users/{user_id}", response_model=User)
 def delete_user(
     user_id: int,
-    current_user: UserModel = Depends(get_current_admin_user),
+    current_user: AuthUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """
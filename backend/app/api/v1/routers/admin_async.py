@@ -0,0 +1,138 @@
+"""Admin endpoints served through the asyncpg engine (DB_ASYNC_MODE)."""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.api.v1.routers import admin
+from app.core.constants import OAuthProvider, UserRole
+from app.core.pagination import NEXT_CURSOR_HEADER, next_cursor
+from app.db.session import get_async_db
+from app.models.user import User as UserModel
+from app.schemas.user import User, UserRoleUpdate, UserStats
+from app.services.aio import user as user_service
+from app.api.deps import get_current_admin_user_async
+from app.services.user_cache import AuthUser
+
+router = APIRouter()
+
+# Bulk import and export need psycopg2 (COPY, server-side cursors) and the query log
+# is in memory, so those endpoints are shared with the sync router as they are
+SHARED_ENDPOINTS = {admin.import_users, admin.export_users, admin.list_slow_queries, admin.reset_slow_queries}
+router.routes.extend(route for route in admin.router.routes if route.endpoint in SHARED_ENDPOINTS)
+
+
+async def _get_user_or_404(db: AsyncSession, user_id: int) -> UserModel:
+    user = await user_service.get_user(db, user_id=user_id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+
+@router.get("/users", response_model=List[User])
+async def list_users(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    include_deleted: bool = False,
+    cursor: Optional[str] = None,
+    q: Optional[str] = Query(None, max_length=256),
+    role: Optional[UserRole] = None,
+    is_active: Optional[bool] = None,
+    oauth_provider: Optional[OAuthProvider] = None,
+    current_user: AuthUser = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get list of all users (admin only), oldest first.
+    Can optionally include deleted users.
+    `q` (3+ characters) matches part of the email or name, or a similar name;
+    role, is_active and oauth_provider narrow the results further.
+    Pass the X-Next-Cursor response header as `cursor` to fetch the next page.
+    """
+    users = await user_service.get_users_with_filters(
+        db,
+        skip=skip,
+        limit=limit,
+        include_deleted=include_deleted,
+        cursor=cursor,
+        q=q,
+        role=role,
+        is_active=is_active,
+        oauth_provider=oauth_provider,
+    )
+    next_page = next_cursor(users, limit)
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
+    return users
+
+
+@router.get("/users/stats", response_model=UserStats)
+async def get_user_statistics(
+    current_user: AuthUser = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get user statistics (admin only).
+    Returns counts of total, active, inactive, admin, and deleted users.
+    """
+    return await user_service.get_user_stats(db)
+
+
+@router.put("/users/{user_id}/deactivate", response_model=User)
+async def deactivate_user(
+    user_id: int,
+    current_user: AuthUser = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Deactivate a user (admin only).
+    Cannot deactivate yourself.
+    """
+    user = await _get_user_or_404(db, user_id)
+    return await user_service.deactivate_user(db, user=user, admin_user=current_user)
+
+
+@router.put("/users/{user_id}/activate", response_model=User)
+async def activate_user(
+    user_id: int,
+    current_user: AuthUser = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Activate a user (admin only).
+    """
+    user = await _get_user_or_404(db, user_id)
+    return await user_service.activate_user(db, user=user)
+
+
+@router.put("/users/{user_id}/role", response_model=User)
+async def change_user_role(
+    user_id: int,
+    role_update: UserRoleUpdate,
+    current_user: AuthUser = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Change user role (admin only).
+    Cannot change your own role.
+    Prevents demoting the last admin.
+    """
+    user = await _get_user_or_404(db, user_id)
+    return await user_service.change_user_role(
+        db, user=user, new_role=role_update.role, admin_user=current_user
+    )
+
+
+@router.delete("/users/{user_id}", response_model=User)
+async def delete_user(
+    user_id: int,
+    current_user: AuthUser = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Soft delete a user (admin only).
+    Cannot delete yourself.
+    Prevents deleting the last admin.
+    """
+    user = await _get_user_or_404(db, user_id)
+    return await user_service.soft_delete_user(db, user=user, admin_user=current_user)
@@ -1,46 +1,45 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Request
 from fastapi.security import OAuth2PasswordRequestForm
+from typing import Optional
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from app.db.session import get_db
+from app.models.user import User
 from app.schemas.user import UserCreate, User as UserSchema
 from app.schemas.token import Token, RefreshToken
-from app.services import user as user_service
-from app.core.security import create_access_token, create_refresh_token, decode_token
+from app.services import user as user_service, refresh_token as refresh_token_service
+from app.core.security import create_access_token, create_refresh_token, decode_token, user_claims
 from app.core.config import settings
+from app.core.password_pool import password_pool
 
 router = APIRouter()
 
 
-@router.post("/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
-def register(user_in: UserCreate, db: Session = Depends(get_db)):
-    """
-    Register a new user.
-
-    Email validation is a stub for future implementation.
-    """
-    # Check if user already exists
-    user = user_service.get_user_by_email(db, email=user_in.email)
-    if user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-
-    # Create new user
-    user = user_service.create_user(db, user=user_in)
-
-    # TODO: Send verification email
+def set_token_cookies(response: Response, access_token: str, refresh_token: str) -> None:
+    """Set the access and refresh tokens as httpOnly cookies."""
+    # Access token: short-lived, httpOnly, secure in production
+    response.set_cookie(
+        key="access_token",
+        value=access_token,
+        httponly=True,
+        secure=settings.SECURE_COOKIES,  # True in production (requires HTTPS)
+        samesite="lax",  # Protect against CSRF
+        max_age=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,  # Convert to seconds
+    )
 
-    return user
+    # Refresh token: long-lived, httpOnly, secure in production
+    response.set_cookie(
+        key="refresh_token",
+        value=refresh_token,
+        httponly=True,
+        secure=settings.SECURE_COOKIES,  # True in production (requires HTTPS)
+        samesite="lax",  # Protect against CSRF
+        max_age=settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,  # Convert to seconds
+    )
 
 
-@router.post("/login", response_model=Token)
-def login(response: Response, db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()):
-    """
-    OAuth2 compatible token login.
-    Sets httpOnly cookies for secure token storage.
-    """
-    user = user_service.authenticate_user(db, email=form_data.username, password=form_data.password)
+def ensure_can_log_in(user: Optional[User]) -> None:
+    """Reject a failed password check, or a deleted or deactivated account."""
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -60,44 +59,9 @@ def login(response: Response, db: Session = Depends(get_db), form_data: OAuth2Pa
             detail="Inactive user"
         )
 
-    # Create tokens
-    access_token = create_access_token(subject=str(user.id))
-    refresh_token = create_refresh_token(subject=str(user.id))
-
-    # Set httpOnly cookies
-    # Access token: short-lived, httpOnly, secure in production
-    response.set_cookie(
-        key="access_token",
-        value=access_token,
-        httponly=True,
-        secure=settings.SECURE_COOKIES,  # True in production (requires HTTPS)
-        samesite="lax",  # Protect against CSRF
-        max_age=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,  # Convert to seconds
-    )
-
-    # Refresh token: long-lived, httpOnly, secure in production
-    response.set_cookie(
-        key="refresh_token",
-        value=refresh_token,
-        httponly=True,
-        secure=settings.SECURE_COOKIES,  # True in production (requires HTTPS)
-        samesite="lax",  # Protect against CSRF
-        max_age=settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,  # Convert to seconds
-    )
-
-    return {
-        "access_token": access_token,
-        "refresh_token": refresh_token,
-        "token_type": "bearer"
-    }
-
 
-@router.post("/refresh", response_model=Token)
-def refresh_token(response: Response, request: Request, db: Session = Depends(get_db)):
-    """
-    Refresh access token using refresh token from httpOnly cookie.
-    """
-    # Get refresh token from cookie
+def refresh_payload(request: Request) -> dict:
+    """The refresh token from the cookie, decoded and checked to be rotatable; 401 otherwise."""
     refresh_token_value = request.cookies.get("refresh_token")
     if not refresh_token_value:
         raise HTTPException(
@@ -114,15 +78,87 @@ def refresh_token(response: Response, request: Request, db: Session = Depends(ge
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user_id = payload.get("sub")
-    if user_id is None:
+    # Tokens without jti/fam predate rotation and cannot be revoked
+    if payload.get("sub") is None or payload.get("jti") is None or payload.get("fam") is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid refresh token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    return payload
+
+
+def logout_payload(request: Request) -> Optional[dict]:
+    """The refresh token from the cookie when it can be revoked, else None."""
+    refresh_token_value = request.cookies.get("refresh_token")
+    payload = decode_token(refresh_token_value) if refresh_token_value else None
+    if payload and payload.get("type") == "refresh" and payload.get("jti") and payload.get("fam"):
+        return payload
+    return None
+
+
+def clear_token_cookies(response: Response) -> None:
+    """Clear cookies by setting them to expire immediately."""
+    response.delete_cookie(key="access_token", samesite="lax")
+    response.delete_cookie(key="refresh_token", samesite="lax")
+
+
+@router.post("/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
+async def register(user_in: UserCreate, db: Session = Depends(get_db)):
+    """
+    Register a new user.
+
+    Email validation is a stub for future implementation.
+    """
+    # Check if user already exists
+    user = await run_in_threadpool(user_service.get_user_by_email, db, email=user_in.email)
+    if user:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
 
-    user = user_service.get_user(db, user_id=int(user_id))
+    # Hash in the dedicated pool so bcrypt doesn't hold an AnyIO worker thread
+    hashed_password = await password_pool.hash(user_in.password)
+    user = await run_in_threadpool(
+        user_service.create_user, db, user=user_in, hashed_password=hashed_password
+    )
+
+    # TODO: Send verification email
+
+    return user
+
+
+@router.post("/login", response_model=Token)
+async def login(response: Response, db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()):
+    """
+    OAuth2 compatible token login.
+    Sets httpOnly cookies for secure token storage.
+    """
+    user = await user_service.authenticate_user_async(
+        db, email=form_data.username, password=form_data.password
+    )
+    ensure_can_log_in(user)
+
+    # Create tokens and set them as httpOnly cookies
+    access_token = create_access_token(subject=str(user.id), claims=user_claims(user))
+    refresh_token = create_refresh_token(subject=str(user.id))
+    set_token_cookies(response, access_token, refresh_token)
+
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer"
+    }
+
+
+@router.post("/refresh", response_model=Token)
+def refresh_token(response: Response, request: Request, db: Session = Depends(get_db)):
+    """
+    Refresh access token using refresh token from httpOnly cookie.
+    """
+    payload = refresh_payload(request)
+    user = user_service.get_user(db, user_id=int(payload["sub"]))
     if user is None or user.is_deleted or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -130,28 +166,11 @@ def refresh_token(response: Response, request: Request, db: Session = Depends(ge
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Create new tokens
-    access_token = create_access_token(subject=str(user.id))
-    new_refresh_token = create_refresh_token(subject=str(user.id))
-
-    # Set new httpOnly cookies
-    response.set_cookie(
-        key="access_token",
-        value=access_token,
-        httponly=True,
-        secure=settings.SECURE_COOKIES,
-        samesite="lax",
-        max_age=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-    )
+    # Consume the presented refresh token (raises 401 on reuse) and create new tokens
+    new_refresh_token = refresh_token_service.rotate(db, payload)
+    access_token = create_access_token(subject=str(user.id), claims=user_claims(user))
 
-    response.set_cookie(
-        key="refresh_token",
-        value=new_refresh_token,
-        httponly=True,
-        secure=settings.SECURE_COOKIES,
-        samesite="lax",
-        max_age=settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,
-    )
+    set_token_cookies(response, access_token, new_refresh_token)
 
     return {
         "access_token": access_token,
@@ -161,14 +180,16 @@ def refresh_token(response: Response, request: Request, db: Session = Depends(ge
 
 
 @router.post("/logout")
-def logout(response: Response):
+def logout(response: Response, request: Request, db: Session = Depends(get_db)):
     """
     Logout endpoint.
-    Clears httpOnly cookies containing access and refresh tokens.
+    Revokes the refresh token family and clears httpOnly cookies containing access and refresh tokens.
     """
-    # Clear cookies by setting them to expire immediately
-    response.delete_cookie(key="access_token", samesite="lax")
-    response.delete_cookie(key="refresh_token", samesite="lax")
+    payload = logout_payload(request)
+    if payload is not None:
+        refresh_token_service.revoke_family(db, payload)
+
+    clear_token_cookies(response)
 
     return {"message": "Successfully logged out"}
 
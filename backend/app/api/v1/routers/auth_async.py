@@ -0,0 +1,107 @@
+"""Auth endpoints served through the asyncpg engine (DB_ASYNC_MODE)."""
+
+from fastapi import APIRouter, Depends, HTTPException, status, Response, Request
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
+from app.schemas.user import UserCreate, User as UserSchema
+from app.schemas.token import Token
+from app.services.aio import user as user_service, refresh_token as refresh_token_service
+from app.core.security import create_access_token, create_refresh_token, user_claims
+from app.api.v1.routers.auth import (
+    clear_token_cookies,
+    ensure_can_log_in,
+    logout_payload,
+    password_reset,
+    refresh_payload,
+    set_token_cookies,
+)
+
+router = APIRouter()
+
+
+@router.post("/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
+async def register(user_in: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Register a new user.
+
+    Email validation is a stub for future implementation.
+    """
+    if await user_service.get_user_by_email(db, email=user_in.email):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
+
+    # TODO: Send verification email
+
+    return await user_service.create_user(db, user=user_in)
+
+
+@router.post("/login", response_model=Token)
+async def login(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    form_data: OAuth2PasswordRequestForm = Depends()
+):
+    """
+    OAuth2 compatible token login.
+    Sets httpOnly cookies for secure token storage.
+    """
+    user = await user_service.authenticate_user(db, email=form_data.username, password=form_data.password)
+    ensure_can_log_in(user)
+
+    access_token = create_access_token(subject=str(user.id), claims=user_claims(user))
+    refresh_token = create_refresh_token(subject=str(user.id))
+    set_token_cookies(response, access_token, refresh_token)
+
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer"
+    }
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh_token(response: Response, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Refresh access token using refresh token from httpOnly cookie.
+    """
+    payload = refresh_payload(request)
+    user = await user_service.get_user(db, user_id=int(payload["sub"]))
+    if user is None or user.is_deleted or not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # Consume the presented refresh token (raises 401 on reuse) and create new tokens
+    new_refresh_token = await refresh_token_service.rotate(db, payload)
+    access_token = create_access_token(subject=str(user.id), claims=user_claims(user))
+    set_token_cookies(response, access_token, new_refresh_token)
+
+    return {
+        "access_token": access_token,
+        "refresh_token": new_refresh_token,
+        "token_type": "bearer"
+    }
+
+
+@router.post("/logout")
+async def logout(response: Response, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Logout endpoint.
+    Revokes the refresh token family and clears httpOnly cookies containing access and refresh tokens.
+    """
+    payload = logout_payload(request)
+    if payload is not None:
+        await refresh_token_service.revoke_family(db, payload)
+
+    clear_token_cookies(response)
+
+    return {"message": "Successfully logged out"}
+
+
+# No database work, so the sync endpoint is shared as is
+router.add_api_route("/password-reset", password_reset, methods=["POST"])
@@ -1,7 +1,12 @@
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from app.db.session import get_db
+from app.db.session import get_db, engine, async_engine, replica_engines
+from app.db import query_log
+from app.db.instrumentation import pool_stats, statement_cache_stats
+from app.core.password_pool import password_pool
+from app.core.security import token_cache
+from app.services import user_cache, refresh_token as refresh_token_service
 
 router = APIRouter()
 
@@ -40,4 +45,15 @@ def metrics():
         "requests_total": 0,
         "requests_in_progress": 0,
         "response_time_seconds": 0,
+        "password_hashing": password_pool.stats(),
+        "token_cache": token_cache.stats(),
+        "user_cache": user_cache.stats(),
+        "refresh_token_revocations": refresh_token_service.stats(),
+        "db_pool": pool_stats(engine),
+        "async_db_pool": pool_stats(async_engine.sync_engine) if async_engine else None,
+        "replica_db_pools": [pool_stats(replica) for replica in replica_engines],
+        "statement_cache": statement_cache_stats(engine),
+        "async_statement_cache": statement_cache_stats(async_engine.sync_engine) if async_engine else None,
+        "db_queries_per_request": query_log.queries_per_request.snapshot(),
+        "db_seconds_per_request": query_log.db_seconds_per_request.snapshot(),
     }
@@ -3,15 +3,18 @@
 from fastapi import APIRouter, Depends, Request, HTTPException, status, Response
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from authlib.integrations.starlette_client import OAuth
 from typing import Optional
 
 from app.api.deps import get_db, get_current_user
 from app.core.config import settings
-from app.core.security import create_access_token, create_refresh_token
+from app.core.security import create_access_token, create_refresh_token, user_claims
 from app.core.constants import OAuthProvider
-from app.services import oauth as oauth_service
-from app.models.user import User
+from app.core.password_pool import password_pool
+from app.api.v1.routers.auth import set_token_cookies
+from app.services import oauth as oauth_service, user as user_service
+from app.services.user_cache import AuthUser
 from app.schemas.user import User as UserSchema, AddPasswordRequest
 
 router = APIRouter()
@@ -48,104 +51,92 @@ async def google_login(request: Request):
     return await oauth.google.authorize_redirect(request, redirect_uri)
 
 
-@router.get("/google/callback")
-async def google_callback(request: Request, db: Session = Depends(get_db)):
-    """
-    Handle Google OAuth callback.
-    Exchanges code for token, gets user info, creates/links account, generates JWT tokens.
-    """
+async def google_user_info(request: Request) -> dict:
+    """Exchange the callback's authorization code and return the Google account's details."""
     if not settings.GOOGLE_CLIENT_ID or not settings.GOOGLE_CLIENT_SECRET:
         raise HTTPException(
             status_code=status.HTTP_501_NOT_IMPLEMENTED,
             detail="Google OAuth is not configured."
         )
 
-    try:
-        # Exchange authorization code for access token
-        token = await oauth.google.authorize_access_token(request)
-
-        # Get user info from Google
-        user_info = token.get('userinfo')
-        if not user_info:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to get user information from Google"
-            )
-
-        # Extract user data
-        email = user_info.get('email')
-        email_verified = user_info.get('email_verified', False)
-        full_name = user_info.get('name')
-        picture = user_info.get('picture')
-        google_id = user_info.get('sub')  # Google's unique user ID
-
-        if not email or not google_id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Missing required user information from Google"
-            )
+    # Exchange authorization code for access token
+    token = await oauth.google.authorize_access_token(request)
 
-        # Handle OAuth login (create or link account)
-        user, is_new = oauth_service.handle_oauth_login(
-            db=db,
-            provider=OAuthProvider.GOOGLE,
-            provider_id=google_id,
-            email=email,
-            full_name=full_name,
-            picture=picture,
-            email_verified=email_verified
+    # Get user info from Google
+    user_info = token.get('userinfo')
+    if not user_info:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to get user information from Google"
         )
 
-        # Generate JWT tokens
-        access_token = create_access_token(subject=str(user.id))
-        refresh_token_value = create_refresh_token(subject=str(user.id))
+    # Extract user data
+    email = user_info.get('email')
+    google_id = user_info.get('sub')  # Google's unique user ID
+    if not email or not google_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Missing required user information from Google"
+        )
 
-        # Create redirect response to frontend
-        frontend_url = settings.FRONTEND_URL
-        redirect_url = f"{frontend_url}/auth/callback"
+    return dict(
+        provider=OAuthProvider.GOOGLE,
+        provider_id=google_id,
+        email=email,
+        full_name=user_info.get('name'),
+        picture=user_info.get('picture'),
+        email_verified=user_info.get('email_verified', False),
+    )
 
-        response = RedirectResponse(url=redirect_url)
 
-        # Set httpOnly cookies
-        response.set_cookie(
-            key="access_token",
-            value=access_token,
-            httponly=True,
-            secure=settings.SECURE_COOKIES,
-            samesite="lax",
-            max_age=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-        )
+def login_redirect(user) -> RedirectResponse:
+    """Redirect to the frontend with the user's new tokens set as httpOnly cookies."""
+    access_token = create_access_token(subject=str(user.id), claims=user_claims(user))
+    refresh_token_value = create_refresh_token(subject=str(user.id))
 
-        response.set_cookie(
-            key="refresh_token",
-            value=refresh_token_value,
-            httponly=True,
-            secure=settings.SECURE_COOKIES,
-            samesite="lax",
-            max_age=settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,
-        )
+    response = RedirectResponse(url=f"{settings.FRONTEND_URL}/auth/callback")
+    set_token_cookies(response, access_token, refresh_token_value)
+    return response
 
-        return response
 
+def oauth_failure(e: Exception) -> HTTPException:
+    # Log error in production
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f"OAuth authentication failed: {str(e)}"
+    )
+
+
+@router.get("/google/callback")
+async def google_callback(request: Request, db: Session = Depends(get_db)):
+    """
+    Handle Google OAuth callback.
+    Exchanges code for token, gets user info, creates/links account, generates JWT tokens.
+    """
+    try:
+        user_info = await google_user_info(request)
+        # Handle OAuth login (create or link account)
+        user, is_new = await run_in_threadpool(oauth_service.handle_oauth_login, db=db, **user_info)
+        return login_redirect(user)
     except HTTPException:
         raise
     except Exception as e:
-        # Log error in production
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"OAuth authentication failed: {str(e)}"
-        )
+        raise oauth_failure(e)
 
 
 @router.post("/add-password", response_model=UserSchema)
-def add_password_to_account(
+async def add_password_to_account(
     request: AddPasswordRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Add a password to an OAuth-only account.
     Allows OAuth users to also login with email/password.
     """
-    user = oauth_service.add_password_to_oauth_user(db, current_user, request.password)
+    user = await run_in_threadpool(user_service.get_user, db, user_id=current_user.id)
+    # Check before hashing so accounts that already have a password cost no bcrypt work
+    oauth_service.ensure_no_password(user)
+    hashed_password = await password_pool.hash(request.password)
+    user = await run_in_threadpool(oauth_service.add_password_to_oauth_user, db, user, hashed_password)
     return user
@@ -0,0 +1,47 @@
+"""OAuth endpoints served through the asyncpg engine (DB_ASYNC_MODE)."""
+
+from fastapi import APIRouter, Depends, Request, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user_async
+from app.api.v1.routers.oauth import google_login, google_user_info, login_redirect, oauth_failure
+from app.db.session import get_async_db
+from app.services.aio import oauth as oauth_service, user as user_service
+from app.services.user_cache import AuthUser
+from app.schemas.user import User as UserSchema, AddPasswordRequest
+
+router = APIRouter()
+
+# Only redirects to the provider, so the sync endpoint is shared as is
+router.add_api_route("/google/login", google_login, methods=["GET"])
+
+
+@router.get("/google/callback")
+async def google_callback(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Handle Google OAuth callback.
+    Exchanges code for token, gets user info, creates/links account, generates JWT tokens.
+    """
+    try:
+        user_info = await google_user_info(request)
+        # Handle OAuth login (create or link account)
+        user, is_new = await oauth_service.handle_oauth_login(db=db, **user_info)
+        return login_redirect(user)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise oauth_failure(e)
+
+
+@router.post("/add-password", response_model=UserSchema)
+async def add_password_to_account(
+    request: AddPasswordRequest,
+    current_user: AuthUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Add a password to an OAuth-only account.
+    Allows OAuth users to also login with email/password.
+    """
+    user = await user_service.get_user(db, user_id=current_user.id)
+    return await oauth_service.add_password_to_oauth_user(db, user, request.password)
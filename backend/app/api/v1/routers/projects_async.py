@@ -0,0 +1,197 @@
+"""Project endpoints served through the asyncpg engine (DB_ASYNC_MODE)."""
+
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.core.config import settings
+from app.core.etag import ETAG_HEADER, conditional_get, if_match_versions, list_etag, resource_etag
+from app.core.pagination import NEXT_CURSOR_HEADER, encode_rank_cursor, next_cursor
+from app.db.session import get_async_db
+from app.schemas.project import (
+    Project,
+    ProjectBatchCreate,
+    ProjectBatchDelete,
+    ProjectBatchResult,
+    ProjectBatchUpdate,
+    ProjectCreate,
+    ProjectSearchResult,
+    ProjectUpdate,
+)
+from app.services.aio import project as project_service
+from app.services import export as export_service
+from app.api.deps import get_current_active_user_async
+from app.services.user_cache import AuthUser
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[Project])
+async def list_projects(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    current_user: AuthUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get list of projects for current user, oldest first.
+    Pass the X-Next-Cursor response header as `cursor` to fetch the next page.
+    Answers 304 when If-None-Match has the page's current ETag.
+    """
+    projects = await project_service.get_projects(
+        db, owner_id=current_user.id, skip=skip, limit=limit, cursor=cursor
+    )
+    next_page = next_cursor(projects, limit)
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
+    return conditional_get(if_none_match, response, list_etag(projects)) or projects
+
+
+@router.post("/", response_model=Project, status_code=status.HTTP_201_CREATED)
+async def create_project(
+    project: ProjectCreate,
+    current_user: AuthUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create a new project.
+    """
+    return await project_service.create_project(db, project=project, owner_id=current_user.id)
+
+
+@router.post("/batch", response_model=ProjectBatchResult, status_code=status.HTTP_201_CREATED)
+async def create_projects(
+    batch: ProjectBatchCreate,
+    current_user: AuthUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create up to PROJECT_BATCH_MAX_ITEMS projects in one statement.
+    """
+    projects = await project_service.create_projects(db, projects=batch.items, owner_id=current_user.id)
+    return ProjectBatchResult.created(projects)
+
+
+@router.put("/batch", response_model=ProjectBatchResult)
+async def update_projects(
+    batch: ProjectBatchUpdate,
+    current_user: AuthUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update up to PROJECT_BATCH_MAX_ITEMS projects in one statement.
+    Items that do not exist or are not owned by the current user get status 404.
+    """
+    updated = await project_service.update_projects(db, items=batch.items, owner_id=current_user.id)
+    return ProjectBatchResult.updated([item.id for item in batch.items], updated)
+
+
+@router.delete("/batch", response_model=ProjectBatchResult)
+async def delete_projects(
+    batch: ProjectBatchDelete,
+    current_user: AuthUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Delete up to PROJECT_BATCH_MAX_ITEMS projects in one statement.
+    Ids that do not exist or are not owned by the current user get status 404.
+    """
+    deleted = await project_service.delete_projects(db, project_ids=batch.ids, owner_id=current_user.id)
+    return ProjectBatchResult.deleted(batch.ids, deleted)
+
+
+@router.get("/search", response_model=List[ProjectSearchResult])
+async def search_projects(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=256),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: AuthUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Full-text search over the current user's project titles and descriptions.
+    Accepts web search syntax ("quoted phrases", -excluded, or); results are
+    ranked best first with matches wrapped in <mark> in the highlight fields.
+    Pass the X-Next-Cursor response header as `cursor` to fetch the next page.
+    """
+    results = await project_service.search_projects(
+        db, owner_id=current_user.id, q=q, limit=limit, cursor=cursor
+    )
+    if len(results) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_rank_cursor(results[-1].rank, results[-1].id)
+    return results
+
+
+@router.get("/export")
+async def export_projects(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    current_user: AuthUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Stream all of the current user's projects as NDJSON or CSV.
+    """
+    stmt = export_service.projects_statement(owner_id=current_user.id)
+    return StreamingResponse(
+        export_service.stream_export_async(db, stmt, format, settings.EXPORT_BATCH_SIZE),
+        media_type=export_service.FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="projects.{format}"'},
+    )
+
+
+@router.get("/{project_id}", response_model=Project)
+async def get_project(
+    project_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user: AuthUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get project by ID.
+    Answers 304 when If-None-Match has the project's current ETag.
+    """
+    project = await project_service.get_project(db, project_id=project_id, owner_id=current_user.id)
+    return conditional_get(if_none_match, response, resource_etag(project.id, project.updated_at)) or project
+
+
+@router.put("/{project_id}", response_model=Project)
+async def update_project(
+    project_id: int,
+    project_update: ProjectUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    current_user: AuthUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update a project.
+    Send the ETag from a previous read as If-Match to apply the update only if
+    the project has not changed since; otherwise it fails with 412.
+    """
+    project = await project_service.update_project(
+        db,
+        project_id=project_id,
+        owner_id=current_user.id,
+        project_update=project_update,
+        versions=if_match_versions(if_match, project_id),
+    )
+    response.headers[ETAG_HEADER] = resource_etag(project.id, project.updated_at)
+    return project
+
+
+@router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_project(
+    project_id: int,
+    current_user: AuthUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Delete a project.
+    """
+    await project_service.delete_project(db, project_id=project_id, owner_id=current_user.id)
+    return None
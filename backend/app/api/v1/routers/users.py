@@ -1,61 +1,91 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
+from app.core.etag import conditional_get, resource_etag
+from app.core.pagination import NEXT_CURSOR_HEADER, next_cursor
 from app.db.session import get_db
 from app.schemas.user import User, UserUpdate
 from app.services import user as user_service
+from app.core.password_pool import password_pool
 from app.api.deps import get_current_active_user, get_current_admin_user
-from app.models.user import User as UserModel
+from app.services.user_cache import AuthUser
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=User)
-def read_user_me(current_user: UserModel = Depends(get_current_active_user)):
+def read_user_me(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user: AuthUser = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
     """
     Get current user.
+    Answers 304 when If-None-Match has the user's current ETag.
     """
-    return current_user
+    user = user_service.get_user(db, user_id=current_user.id)
+    return conditional_get(if_none_match, response, resource_etag(user.id, user.updated_at)) or user
 
 
 @router.put("/me", response_model=User)
-def update_user_me(
+async def update_user_me(
     user_update: UserUpdate,
-    current_user: UserModel = Depends(get_current_active_user),
+    current_user: AuthUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
     Update current user.
     """
+    update_data = user_update.model_dump(exclude_unset=True)
+
     # Don't allow users to change their own role
-    if user_update.model_dump(exclude_unset=True).get("role"):
+    if update_data.get("role"):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Cannot change your own role"
         )
 
-    user = user_service.update_user(db, user=current_user, user_update=user_update)
+    hashed_password = None
+    if "password" in update_data:
+        hashed_password = await password_pool.hash(update_data["password"])
+
+    user = await run_in_threadpool(user_service.get_user, db, user_id=current_user.id)
+    user = await run_in_threadpool(
+        user_service.update_user,
+        db,
+        user=user,
+        user_update=user_update,
+        hashed_password=hashed_password,
+    )
     return user
 
 
 @router.get("/", response_model=List[User])
 def read_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    current_user: UserModel = Depends(get_current_admin_user),
+    cursor: Optional[str] = None,
+    current_user: AuthUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get list of users (admin only).
+    Get list of users (admin only), oldest first.
+    Pass the X-Next-Cursor response header as `cursor` to fetch the next page.
     """
-    users = user_service.get_users(db, skip=skip, limit=limit)
+    users = user_service.get_users(db, skip=skip, limit=limit, cursor=cursor)
+    next_page = next_cursor(users, limit)
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
     return users
 
 
 @router.get("/{user_id}", response_model=User)
 def read_user(
     user_id: int,
-    current_user: UserModel = Depends(get_current_admin_user),
+    current_user: AuthUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -0,0 +1,84 @@
+"""User endpoints served through the asyncpg engine (DB_ASYNC_MODE)."""
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.core.etag import conditional_get, resource_etag
+from app.core.pagination import NEXT_CURSOR_HEADER, next_cursor
+from app.db.session import get_async_db
+from app.schemas.user import User, UserUpdate
+from app.services.aio import user as user_service
+from app.api.deps import get_current_active_user_async, get_current_admin_user_async
+from app.services.user_cache import AuthUser
+
+router = APIRouter()
+
+
+@router.get("/me", response_model=User)
+async def read_user_me(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user: AuthUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get current user.
+    Answers 304 when If-None-Match has the user's current ETag.
+    """
+    user = await user_service.get_user(db, user_id=current_user.id)
+    return conditional_get(if_none_match, response, resource_etag(user.id, user.updated_at)) or user
+
+
+@router.put("/me", response_model=User)
+async def update_user_me(
+    user_update: UserUpdate,
+    current_user: AuthUser = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update current user.
+    """
+    # Don't allow users to change their own role
+    if user_update.model_dump(exclude_unset=True).get("role"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Cannot change your own role"
+        )
+
+    user = await user_service.get_user(db, user_id=current_user.id)
+    return await user_service.update_user(db, user=user, user_update=user_update)
+
+
+@router.get("/", response_model=List[User])
+async def read_users(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: AuthUser = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get list of users (admin only), oldest first.
+    Pass the X-Next-Cursor response header as `cursor` to fetch the next page.
+    """
+    users = await user_service.get_users(db, skip=skip, limit=limit, cursor=cursor)
+    next_page = next_cursor(users, limit)
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
+    return users
+
+
+@router.get("/{user_id}", response_model=User)
+async def read_user(
+    user_id: int,
+    current_user: AuthUser = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get user by ID (admin only).
+    """
+    user = await user_service.get_user(db, user_id=user_id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from app.core.keys import key_ring
+
+router = APIRouter()
+
+
+@router.get("/.well-known/jwks.json")
+def jwks():
+    """
+    Public keys for verifying access tokens.
+
+    Empty when tokens are signed with the shared HS256 SECRET_KEY.
+    """
+    return key_ring.jwks()
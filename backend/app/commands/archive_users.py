@@ -0,0 +1,48 @@
+"""
+Move long-deleted users and their projects into the archive tables.
+
+Usage:
+    python -m app.commands.archive_users
+    python -m app.commands.archive_users --days 90 --batch-size 100 --pause-ms 500
+
+Works in small batches, each in its own transaction, so it can be stopped at any
+time and run again to carry on. Exits without doing anything if another run
+(including the in-app schedule, ARCHIVE_INTERVAL_HOURS) is already working.
+"""
+
+import argparse
+import json
+import sys
+
+from app.core.config import settings
+from app.db.session import engine
+from app.services.archive import archive_deleted_users
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=settings.ARCHIVE_AFTER_DAYS, help="archive users deleted before")
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE, help="users per transaction")
+    parser.add_argument("--pause-ms", type=int, default=settings.ARCHIVE_BATCH_PAUSE_MS, help="sleep between batches")
+    parser.add_argument(
+        "--lock-timeout-ms", type=int, default=settings.ARCHIVE_LOCK_TIMEOUT_MS, help="max wait for a row lock"
+    )
+    parser.add_argument("--max-batches", type=int, default=None, help="stop after this many batches")
+    args = parser.parse_args()
+
+    report = archive_deleted_users(
+        engine,
+        older_than_days=args.days,
+        batch_size=args.batch_size,
+        pause_ms=args.pause_ms,
+        lock_timeout_ms=args.lock_timeout_ms,
+        max_batches=args.max_batches,
+    )
+    if report is None:
+        print("Another archive run is in progress", file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
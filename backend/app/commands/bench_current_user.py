@@ -0,0 +1,90 @@
+"""
+Microbenchmark the get_current_user dependency on an auth-cache miss.
+
+Usage:
+    python -m app.commands.bench_current_user --iterations 2000
+
+Each call starts with the user cache cleared, so it decodes the token and loads
+the user row through user_service.get_user. The dependency is timed twice: with
+get_user's prebuilt statement and with the db.query() chain it replaced, which
+rebuilds the query and its compiled-cache key on every call. Needs at least one
+user in the database. JWT_TRUST_EMBEDDED_CLAIMS is ignored so every call reaches
+the database.
+"""
+
+import argparse
+import statistics
+import time
+from contextlib import contextmanager
+
+from starlette.requests import Request
+
+from app.api import deps
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.instrumentation import statement_cache_stats
+from app.db.session import SessionLocal, engine
+from app.models.user import User
+from app.services import user as user_service
+from app.services import user_cache
+
+
+def legacy_get_user(db, user_id: int):
+    """get_user as it was before the prebuilt statements."""
+    return db.query(User).filter(User.id == user_id).first()
+
+
+@contextmanager
+def get_user_implementation(get_user):
+    original = user_service.get_user
+    user_service.get_user = get_user
+    try:
+        yield
+    finally:
+        user_service.get_user = original
+
+
+def measure_us(db, request: Request, token: str, iterations: int) -> float:
+    """Median time of one get_current_user call, in microseconds."""
+    timings = []
+    for _ in range(iterations):
+        user_cache.clear()
+        db.expunge_all()
+        start = time.perf_counter()
+        deps.get_current_user(request, db, token)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000, help="calls per variant")
+    parser.add_argument("--warmup", type=int, default=200, help="untimed calls per variant")
+    args = parser.parse_args()
+
+    settings.JWT_TRUST_EMBEDDED_CLAIMS = False
+    request = Request({"type": "http", "headers": []})
+    db = SessionLocal()
+    try:
+        user_id = db.query(User.id).order_by(User.id).limit(1).scalar()
+        if user_id is None:
+            raise SystemExit("No users to authenticate as; create one first")
+        token = create_access_token(subject=user_id)
+
+        results = {}
+        for name, get_user in (("legacy query", legacy_get_user), ("prebuilt", user_service.get_user)):
+            with get_user_implementation(get_user):
+                measure_us(db, request, token, args.warmup)
+                results[name] = measure_us(db, request, token, args.iterations)
+            print(f"{name:>12}: {results[name]:8.1f} us/call")
+            db.rollback()
+    finally:
+        db.close()
+
+    saved = results["legacy query"] - results["prebuilt"]
+    print(f"\nSaved {saved:.1f} us/call ({saved / results['legacy query']:.0%})")
+    print(f"Statement cache: {statement_cache_stats(engine)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark bcrypt on this host and recommend a BCRYPT_ROUNDS value.
+
+Usage:
+    python -m app.commands.calibrate_bcrypt --target-ms 250
+
+Picks the highest cost whose median verify time stays within the target. Existing
+hashes are upgraded to the new cost on each user's next successful login.
+"""
+
+import argparse
+import statistics
+import time
+
+from passlib.hash import bcrypt
+
+SAMPLE_PASSWORD = "calibration-password"
+
+
+def measure_verify_ms(rounds: int, samples: int) -> float:
+    """Median time to verify one password at the given cost, in milliseconds."""
+    hashed = bcrypt.using(rounds=rounds).hash(SAMPLE_PASSWORD)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        bcrypt.verify(SAMPLE_PASSWORD, hashed)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms: float, min_rounds: int, max_rounds: int, samples: int) -> int:
+    """Return the highest cost within target_ms, never below min_rounds."""
+    chosen = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        elapsed = measure_verify_ms(rounds, samples)
+        print(f"rounds={rounds:>2}  verify={elapsed:8.1f} ms")
+        if elapsed > target_ms:
+            break
+        chosen = rounds
+    return chosen
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-ms", type=float, default=250.0, help="target verify latency")
+    parser.add_argument("--min-rounds", type=int, default=10, help="lowest acceptable cost")
+    parser.add_argument("--max-rounds", type=int, default=16, help="highest cost to try")
+    parser.add_argument("--samples", type=int, default=3, help="verifications per cost")
+    args = parser.parse_args()
+
+    rounds = calibrate(args.target_ms, args.min_rounds, args.max_rounds, args.samples)
+    print(f"\nRecommended setting: BCRYPT_ROUNDS={rounds}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Bulk import users from a CSV or NDJSON file.
+
+Usage:
+    python -m app.commands.import_users users.csv
+    python -m app.commands.import_users users.ndjson --format ndjson
+
+CSV files need an email,password,full_name header; NDJSON files hold one
+{"email": ..., "password": ..., "full_name": ...} object per line. Rejected
+rows are printed as they are found, followed by progress after every chunk.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from app.core.config import settings
+from app.core.password_pool import password_pool
+from app.db.session import SessionLocal
+from app.services.user_import import FORMATS, import_users
+
+
+async def run(path: str, fmt: str, chunk_size: int) -> dict:
+    """Import one file and return the summary."""
+    summary = {}
+    db = SessionLocal()
+    try:
+        with open(path, encoding="utf-8-sig", newline="") as stream:
+            async for event in import_users(db, stream, fmt, chunk_size):
+                if event["type"] == "error":
+                    print(f"row {event['row']}: {event['error']} ({event['email']})", file=sys.stderr)
+                elif event["type"] == "progress":
+                    print(f"processed={event['processed']} created={event['created']} failed={event['failed']}")
+                else:
+                    summary = event
+    finally:
+        db.close()
+        password_pool.shutdown()
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="CSV or NDJSON file to import")
+    parser.add_argument("--format", choices=FORMATS, help="file format (default: from the file extension)")
+    parser.add_argument("--chunk-size", type=int, default=settings.USER_IMPORT_CHUNK_SIZE, help="rows per COPY")
+    args = parser.parse_args()
+
+    fmt = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+    summary = asyncio.run(run(args.path, fmt, args.chunk_size))
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
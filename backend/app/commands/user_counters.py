@@ -0,0 +1,35 @@
+"""
+Install or remove the user counters trigger to match USER_STATS_COUNTERS.
+
+Usage:
+    USER_STATS_COUNTERS=true python -m app.commands.user_counters
+    USER_STATS_COUNTERS=false python -m app.commands.user_counters
+
+The setting is off by default, since the trigger serializes concurrent users
+writes; opt in only when counting a huge users table is too slow. Run after
+changing the setting. Turning it on recounts the users under a table
+lock, so pick a quiet moment on a large table; turning it off drops the trigger
+and the counters row, and the admin stats go back to counting users.
+"""
+
+import argparse
+
+from app.core.config import settings
+from app.db.session import engine
+from app.models.user_counters import install_counters, remove_counters
+
+
+def main() -> None:
+    argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter).parse_args()
+
+    with engine.begin() as conn:
+        if settings.USER_STATS_COUNTERS:
+            install_counters(conn)
+            print("User counters trigger installed")
+        else:
+            remove_counters(conn)
+            print("User counters trigger removed")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,12 +20,103 @@ class Settings(BaseSettings):
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return self.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    # Connection pool (DB_POOL_SIZE unset = derive from Postgres max_connections / WEB_CONCURRENCY at startup)
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800  # seconds; recycling replaces pre-ping for stale connections
+    DB_POOL_PRE_PING: bool = False
+    DB_RESERVED_CONNECTIONS: int = 10  # left free for migrations, psql and other services
+    WEB_CONCURRENCY: int = 1  # uvicorn/gunicorn worker processes sharing the database
+    # Compiled SQL per engine (SQLAlchemy's default is 500); raise it if /health/metrics
+    # shows statement_cache misses continuing once the app has warmed up
+    DB_QUERY_CACHE_SIZE: int = 1200
+
+    # Slow-query log (app.db.query_log): statements over SLOW_QUERY_MS (0 = off) are logged
+    # with their route and request ID; this share of slow SELECTs also gets EXPLAIN ANALYZE
+    SLOW_QUERY_MS: int = 200
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.05
+    QUERY_LOG_MAX_STATEMENTS: int = 500  # distinct statements timed for /admin/slow-queries
+    # Debugging aid: X-DB-Query-Count / X-DB-Query-Time-Ms headers on every response
+    DB_QUERY_DEBUG_HEADERS: bool = False
+
+    # Read replicas (comma-separated SQLAlchemy URLs); list reads go to a replica unless the
+    # caller wrote recently. "sticky" pins those callers to the primary, "lsn" lets them read
+    # from a replica once it has replayed their last write.
+    DATABASE_REPLICA_URLS: Union[list[str], str] = []
+    REPLICA_CONSISTENCY: str = "lsn"
+    REPLICA_STICKY_SECONDS: int = 10  # how long after a write the caller's reads stay consistent
+
+    @field_validator("DATABASE_REPLICA_URLS", mode="before")
+    @classmethod
+    def parse_replica_urls(cls, v):
+        if isinstance(v, str):
+            return [url.strip() for url in v.split(",") if url.strip()]
+        return v
+
+    # Serve the auth, OAuth, user, project and admin endpoints from the asyncpg engine instead of
+    # thread-pooled sync sessions (bulk import/export stay on the sync engine, which needs psycopg2)
+    DB_ASYNC_MODE: bool = False
+
+    # Largest array accepted by the /projects/batch endpoints
+    PROJECT_BATCH_MAX_ITEMS: int = 500
+
     # Security
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
-    ALGORITHM: str = "HS256"
+    ALGORITHM: str = "HS256"  # RS256/ES256 sign with the key ring in JWT_KEYS_DIR
+    JWT_KEYS_DIR: Optional[str] = None  # one <kid>.pem private key per file
+    JWT_ACTIVE_KID: Optional[str] = None  # defaults to the last kid in sort order
+    # Authorize from token claims on a user-cache miss. Claims older than a role/status change
+    # this worker has seen are ignored; other workers may honour them until the token expires.
+    JWT_TRUST_EMBEDDED_CLAIMS: bool = False
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Expected number of live revoked refresh tokens (sizes the in-memory Bloom filter)
+    REFRESH_TOKEN_FILTER_CAPACITY: int = 100000
+
+    # Verified-token cache used by decode_token
+    TOKEN_CACHE_ENABLED: bool = True
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+
+    # Authenticated-user cache (other workers see writes after the TTL)
+    USER_CACHE_ENABLED: bool = True
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_MAX_SIZE: int = 10000
+
+    # Admin user statistics: read the trigger-maintained counters row instead of counting users.
+    # Off by default: the trigger makes every users write update that one row, serializing
+    # concurrent writes, so only opt in when counting a huge users table is too slow; after
+    # changing this, run python -m app.commands.user_counters to add or drop the trigger.
+    USER_STATS_COUNTERS: bool = False
+    USER_STATS_CACHE_SECONDS: int = 10
+
+    # bcrypt cost factor (pick one per fleet with `python -m app.commands.calibrate_bcrypt`)
+    BCRYPT_ROUNDS: int = 12
+
+    # Rows fetched per server-side cursor round trip by the export endpoints
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Bulk user import (rows validated, hashed and loaded per chunk)
+    USER_IMPORT_CHUNK_SIZE: int = 1000
+
+    # Archival of soft-deleted users and their projects (python -m app.commands.archive_users;
+    # ARCHIVE_INTERVAL_HOURS > 0 also runs it from every worker, one at a time)
+    ARCHIVE_AFTER_DAYS: int = 30
+    ARCHIVE_BATCH_SIZE: int = 200
+    ARCHIVE_BATCH_PAUSE_MS: int = 200
+    ARCHIVE_LOCK_TIMEOUT_MS: int = 2000
+    ARCHIVE_INTERVAL_HOURS: float = 0
+
+    # Password hashing pool (0 workers = one per CPU)
+    PASSWORD_HASH_WORKERS: int = 0
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+
     # Cookie settings (set SECURE_COOKIES=True in production with HTTPS)
     SECURE_COOKIES: bool = False  # Set to True in production (requires HTTPS)
 
@@ -55,8 +146,16 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     SENTRY_DSN: Optional[str] = None
 
-    # Rate Limiting
+    # Rate Limiting (per user when authenticated, otherwise per client IP)
+    RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_PER_MINUTE: int = 60
+    RATE_LIMIT_ROUTES: dict[str, int] = {  # path prefix -> requests per minute
+        "/api/v1/auth/login": 10,
+        "/api/v1/auth/register": 5,
+        "/api/v1/auth/refresh": 30,
+    }
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" or "redis" (shared across workers)
+    RATE_LIMIT_REDIS_URL: Optional[str] = None
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,86 @@
+"""Weak ETags and conditional requests for resources versioned by updated_at.
+
+A single resource's tag is its id and updated_at (in microseconds), so it
+changes whenever the row is written. A listing's tag hashes the (id,
+updated_at) pair of every row on the page, so adding, removing, reordering or
+editing any of them changes it. Responses are marked "private, no-cache": the
+browser keeps its copy but revalidates with If-None-Match on every poll, and
+an unchanged resource is answered with an empty 304 instead of being
+serialized again.
+
+The tags are weak because they identify a version of the row, not the bytes
+of one encoding of it. If-Match compares them the same way: the version in the
+tag becomes a condition on updated_at in the UPDATE itself, so a write based
+on a stale read fails with 412 instead of overwriting the newer one.
+"""
+
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from fastapi import Response, status
+
+ETAG_HEADER = "ETag"
+CACHE_CONTROL = "private, no-cache"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _version(updated_at: datetime) -> int:
+    return (updated_at - _EPOCH) // _MICROSECOND
+
+
+def _tags(header: str) -> list[str]:
+    """The opaque tags of an If-Match/If-None-Match header, weak or not."""
+    tags = []
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        tags.append(tag.strip('"'))
+    return tags
+
+
+def resource_etag(id: int, updated_at: datetime) -> str:
+    """Weak ETag of one row."""
+    return f'W/"{id}.{_version(updated_at)}"'
+
+
+def list_etag(items: Iterable) -> str:
+    """Weak ETag of a page of rows with id and updated_at."""
+    digest = hashlib.sha256()
+    for item in items:
+        digest.update(f"{item.id}.{_version(item.updated_at)},".encode())
+    return f'W/"{digest.hexdigest()[:32]}"'
+
+
+def if_match_versions(if_match: Optional[str], id: int) -> Optional[list[datetime]]:
+    """
+    The updated_at values an If-Match header accepts for row id, or None when
+    any version will do (no header, or "*"). Tags for other rows, or that are
+    not ours, accept nothing.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    versions = []
+    for tag in _tags(if_match):
+        tag_id, _, version = tag.partition(".")
+        if tag_id == str(id) and version.isdigit():
+            versions.append(_EPOCH + int(version) * _MICROSECOND)
+    return versions
+
+
+def conditional_get(if_none_match: Optional[str], response: Response, etag: str) -> Optional[Response]:
+    """
+    Tag the response, and return the 304 to send instead when the client's
+    If-None-Match already has this version. Headers set on response before the
+    call are kept on the 304.
+    """
+    response.headers[ETAG_HEADER] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    if if_none_match is None:
+        return None
+    if if_none_match.strip() != "*" and _tags(etag)[0] not in _tags(if_none_match):
+        return None
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=dict(response.headers))
@@ -0,0 +1,72 @@
+"""Key ring for asymmetric JWT signing.
+
+When ALGORITHM is an asymmetric algorithm (RS256, ES256, ...), tokens are signed
+with the private key named by JWT_ACTIVE_KID and carry that kid in their header.
+Every PEM file in JWT_KEYS_DIR is kept for verification, so keys can be rotated by
+adding a new file, switching JWT_ACTIVE_KID, and removing the old file once the
+longest-lived token signed with it has expired. The public halves are published
+as a JWKS document so other services can verify tokens without SECRET_KEY.
+"""
+
+import logging
+from pathlib import Path
+from typing import Optional
+
+from jose import jwk
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ASYMMETRIC_PREFIXES = ("RS", "ES", "PS")
+
+
+def is_asymmetric(algorithm: str) -> bool:
+    """Whether the algorithm signs with a private key."""
+    return algorithm.startswith(ASYMMETRIC_PREFIXES)
+
+
+class KeyRing:
+    """Private signing key plus the public keys accepted for verification."""
+
+    def __init__(self, algorithm: str, keys_dir: Optional[str], active_kid: Optional[str] = None):
+        self.algorithm = algorithm
+        self._private_keys: dict[str, str] = {}
+        self._public_keys: dict[str, dict] = {}
+
+        if keys_dir:
+            for path in sorted(Path(keys_dir).glob("*.pem")):
+                self.add(path.stem, path.read_text())
+
+        self.active_kid = active_kid or (max(self._private_keys) if self._private_keys else None)
+        if self.active_kid is not None and self.active_kid not in self._private_keys:
+            raise ValueError(f"JWT_ACTIVE_KID '{self.active_kid}' not found in {keys_dir}")
+
+    def add(self, kid: str, private_pem: str) -> None:
+        """Register a private key under the given kid."""
+        public_key = jwk.construct(private_pem, self.algorithm).public_key()
+        self._private_keys[kid] = private_pem
+        self._public_keys[kid] = {**public_key.to_dict(), "kid": kid, "use": "sig"}
+
+    def signing_key(self) -> tuple[str, str]:
+        """Return (kid, private PEM) of the active key."""
+        if self.active_kid is None:
+            raise RuntimeError(f"{self.algorithm} signing requires at least one key in JWT_KEYS_DIR")
+        return self.active_kid, self._private_keys[self.active_kid]
+
+    def verification_key(self, kid: Optional[str]) -> Optional[dict]:
+        """Return the public JWK for a kid, or None if it is unknown."""
+        if kid is None:
+            return None
+        return self._public_keys.get(kid)
+
+    def jwks(self) -> dict:
+        """Public keys as a JWKS document."""
+        return {"keys": list(self._public_keys.values())}
+
+
+key_ring = KeyRing(
+    algorithm=settings.ALGORITHM,
+    keys_dir=settings.JWT_KEYS_DIR if is_asymmetric(settings.ALGORITHM) else None,
+    active_kid=settings.JWT_ACTIVE_KID,
+)
@@ -0,0 +1,101 @@
+"""Opaque keyset cursors for listings ordered by (created_at, id).
+
+A cursor encodes the sort key of the last row on a page; the next page continues
+strictly after it with a row comparison, which Postgres answers from an index on
+(created_at, id) no matter how deep the page is. Unlike offset paging, rows
+inserted or deleted between requests do not shift later pages. Search results
+page the same way on (rank, id).
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _pack(values: list) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor"
+    )
+
+
+def _unpack(cursor: str) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise _invalid_cursor()
+    if not isinstance(values, list):
+        raise _invalid_cursor()
+    return values
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Build the cursor that continues after the given row."""
+    return _pack([created_at.isoformat(), id])
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Parse a cursor from encode_cursor, rejecting anything else with 400."""
+    try:
+        created_at, id = _unpack(cursor)
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, TypeError):
+        raise _invalid_cursor()
+
+
+def encode_rank_cursor(rank: float, id: int) -> str:
+    """Build the cursor that continues after a search result ranked (rank, id)."""
+    return _pack([rank, id])
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, int]:
+    """Parse a cursor from encode_rank_cursor, rejecting anything else with 400."""
+    try:
+        rank, id = _unpack(cursor)
+        return float(rank), int(id)
+    except (ValueError, TypeError):
+        raise _invalid_cursor()
+
+
+def keyset(model, cursor: Optional[str]):
+    """ORDER BY and WHERE clauses for the page of model rows after cursor."""
+    order_by = (model.created_at, model.id)
+    if cursor is None:
+        return order_by, None
+    return order_by, tuple_(*order_by) > tuple_(*decode_cursor(cursor))
+
+
+def keyset_after(model):
+    """
+    keyset()'s WHERE clause with bind parameters in place of the cursor values,
+    for statements built once at import; cursor_params supplies the values.
+    """
+    return tuple_(model.created_at, model.id) > tuple_(
+        bindparam("after_created_at", type_=model.created_at.type),
+        bindparam("after_id", type_=model.id.type),
+    )
+
+
+def cursor_params(cursor: str) -> dict:
+    """Bind parameter values for keyset_after."""
+    created_at, id = decode_cursor(cursor)
+    return {"after_created_at": created_at, "after_id": id}
+
+
+def next_cursor(items: Sequence, limit: int) -> Optional[str]:
+    """Cursor for the page after items, or None when this page was the last."""
+    if limit <= 0 or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(last.created_at, last.id)
@@ -0,0 +1,161 @@
+"""Dedicated process pool for bcrypt hashing and verification.
+
+bcrypt is deliberately slow, so running it inline in a sync handler holds one of
+AnyIO's shared worker threads for the whole hash. This module moves that work into
+its own bounded process pool so it scales across cores and never starves the
+thread pool used by the rest of the API.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password
+
+logger = logging.getLogger(__name__)
+
+
+def _hash_batch(passwords: list[str]) -> list[str]:
+    return [get_password_hash(password) for password in passwords]
+
+
+class PasswordHashPool:
+    """Bounded process pool exposing an async bcrypt API."""
+
+    def __init__(self, workers: int = 0, max_queue: int = 64, retry_after: int = 1):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        # Counters are only touched from the event loop thread.
+        self._in_flight = 0
+        self._reserved = 0  # slots held by reserve() and not running a job
+        self._completed = 0
+        self._rejected = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def start(self) -> None:
+        """Start the worker processes (called lazily on first use)."""
+        if self._executor is None:
+            # spawn avoids forking a process that already runs event loop threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"Password hash pool started with {self.workers} workers")
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs waiting for a free worker."""
+        return max(self._in_flight - self.workers, 0)
+
+    def _busy(self) -> HTTPException:
+        self._rejected += 1
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+    async def _submit(self, func: Callable, *args, reserved: bool = False):
+        if reserved:
+            # The job runs in a slot its caller already holds
+            self._reserved -= 1
+        elif self._in_flight + self._reserved >= self.workers + self.max_queue:
+            raise self._busy()
+
+        self.start()
+        self._in_flight += 1
+        start_time = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            elapsed = time.perf_counter() - start_time
+            self._in_flight -= 1
+            if reserved:
+                self._reserved += 1
+            self._completed += 1
+            self._latency_total += elapsed
+            self._latency_max = max(self._latency_max, elapsed)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash in the pool."""
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password in the pool."""
+        return await self._submit(get_password_hash, password)
+
+    def reserve(self, slots: int) -> int:
+        """
+        Hold up to slots pool slots (at most one per worker) for a long job.
+
+        Raises the same 503 as a full pool when they are not free, so a caller can
+        be turned away before it starts rather than half way through. Returns the
+        number of slots held; pass it to hash_many and to release().
+        """
+        slots = min(slots, self.workers)
+        if self._in_flight + self._reserved + slots > self.workers + self.max_queue:
+            raise self._busy()
+        self._reserved += slots
+        return slots
+
+    def release(self, slots: int) -> None:
+        """Give back slots taken with reserve()."""
+        self._reserved -= slots
+
+    async def hash_many(self, passwords: list[str], batch_size: int = 8, reserved: int = 0) -> list[str]:
+        """
+        Hash many passwords across all workers, in input order.
+
+        Work is sent a few passwords per job and at most one job per worker at a
+        time, so interactive logins still interleave and keep their queue slots.
+        With reserved slots from reserve(), jobs run in those and are never rejected.
+        """
+        slots = asyncio.Semaphore(reserved or self.workers)
+
+        async def run(batch: list[str]) -> list[str]:
+            async with slots:
+                return await self._submit(_hash_batch, batch, reserved=bool(reserved))
+
+        batches = [passwords[i:i + batch_size] for i in range(0, len(passwords), batch_size)]
+        results = await asyncio.gather(*(run(batch) for batch in batches))
+        return [hashed for batch in results for hashed in batch]
+
+    def stats(self) -> dict:
+        """Queue depth and latency figures for the metrics endpoint."""
+        avg_latency = self._latency_total / self._completed if self._completed else 0.0
+        return {
+            "workers": self.workers,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "reserved": self._reserved,
+            "max_queue": self.max_queue,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "avg_latency_ms": round(avg_latency * 1000, 2),
+            "max_latency_ms": round(self._latency_max * 1000, 2),
+        }
+
+
+password_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    retry_after=settings.PASSWORD_HASH_RETRY_AFTER_SECONDS,
+)
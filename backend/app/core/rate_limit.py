@@ -0,0 +1,137 @@
+"""Sliding-window rate limit counters.
+
+Each key keeps a counter for the current and the previous fixed window; the
+request rate is estimated by weighting the previous window by how much of it still
+overlaps the sliding window. That needs two integers per key instead of a log of
+timestamps, and gives a smooth limit without bursts at window boundaries.
+"""
+
+import math
+import threading
+import time
+import zlib
+from typing import NamedTuple, Optional
+
+from app.core.config import settings
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    remaining: int
+    retry_after: int  # seconds, 0 when allowed
+
+
+def _evaluate(limit: int, window: int, elapsed: float, previous: int, current: int) -> RateLimitResult:
+    """Decide on a hit given the counts before it; current must not include the hit."""
+    weight = 1 - elapsed / window
+    estimate = previous * weight + current + 1
+    if estimate <= limit:
+        return RateLimitResult(True, int(limit - estimate), 0)
+
+    if current == 0:
+        # A limit of 0 blocks the route outright; there is nothing to slide out
+        return RateLimitResult(False, 0, window)
+    if current + 1 > limit:
+        # The current window alone is full: wait for it to become the previous one
+        # and for enough of it to slide out.
+        wait = window - elapsed + window * (1 - (limit - 1) / current)
+    else:
+        # The previous window still weighs too much: wait for enough of it to slide out.
+        wait = window * (1 - (limit - current - 1) / previous) - elapsed
+    return RateLimitResult(False, 0, max(1, math.ceil(wait)))
+
+
+class InMemoryRateLimitBackend:
+    """Per-process counters, sharded by key so concurrent hits rarely share a lock."""
+
+    def __init__(self, shards: int = 16, max_keys_per_shard: int = 10000):
+        self._shards = [{} for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self.max_keys_per_shard = max_keys_per_shard
+
+    async def hit(self, key: str, limit: int, window: int) -> RateLimitResult:
+        """Count one request for key against limit per window seconds."""
+        now = time.time()
+        window_index, offset = divmod(now, window)
+        window_index = int(window_index)
+
+        shard_id = zlib.crc32(key.encode()) % len(self._shards)
+        shard = self._shards[shard_id]
+        with self._locks[shard_id]:
+            entry = shard.get(key)
+            if entry is None or entry[0] < window_index - 1:
+                previous, current = 0, 0
+            elif entry[0] == window_index - 1:
+                previous, current = entry[2], 0
+            else:
+                previous, current = entry[1], entry[2]
+
+            result = _evaluate(limit, window, offset, previous, current)
+            if result.allowed:
+                current += 1
+            shard[key] = (window_index, previous, current)
+
+            if len(shard) > self.max_keys_per_shard:
+                self._prune(shard, window_index)
+
+        return result
+
+    @staticmethod
+    def _prune(shard: dict, window_index: int) -> None:
+        for key in [k for k, entry in shard.items() if entry[0] < window_index - 1]:
+            del shard[key]
+
+    def reset(self) -> None:
+        """Forget all counters."""
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
+
+
+class SharedRateLimitBackend:
+    """
+    Counters kept in a shared Redis-compatible store so all workers enforce one limit.
+
+    The client only needs an async pipeline and decr, e.g. redis.asyncio.Redis. The
+    increment, its expiry and the previous window's read go in one MULTI, so a
+    counter never outlives its window and a hit costs one round trip.
+    """
+
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def hit(self, key: str, limit: int, window: int) -> RateLimitResult:
+        """Count one request for key against limit per window seconds."""
+        now = time.time()
+        window_index, offset = divmod(now, window)
+        window_index = int(window_index)
+        current_key = f"{self.prefix}{key}:{window_index}"
+        previous_key = f"{self.prefix}{key}:{window_index - 1}"
+
+        async with self.client.pipeline(transaction=True) as pipe:
+            current, _, previous = await (
+                pipe.incr(current_key).expire(current_key, window * 2).get(previous_key).execute()
+            )
+        previous = int(previous or 0)
+
+        result = _evaluate(limit, window, offset, previous, current - 1)
+        if not result.allowed:
+            await self.client.decr(current_key)
+        return result
+
+
+def create_backend(backend: str = settings.RATE_LIMIT_BACKEND, redis_url: Optional[str] = settings.RATE_LIMIT_REDIS_URL):
+    """Build the configured backend ("memory" or "redis")."""
+    if backend == "memory":
+        return InMemoryRateLimitBackend()
+    if backend == "redis":
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package") from e
+        return SharedRateLimitBackend(redis.from_url(redis_url))
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {backend}")
+
+
+rate_limit_backend = create_backend()
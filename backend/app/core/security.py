@@ -1,10 +1,25 @@
+import hashlib
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from app.core.cache import LRUCache
 from app.core.config import settings
+from app.core.keys import is_asymmetric, key_ring
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Pinning min/max to the configured cost makes needs_update() flag any hash made
+# with a different cost, so it can be upgraded transparently on the next login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# Already-verified tokens, keyed by SHA-256 digest and evicted at the token's exp
+token_cache = LRUCache(max_size=settings.TOKEN_CACHE_MAX_SIZE)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -17,30 +32,84 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
-    """Create an access token."""
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check whether a hash was made with a different bcrypt cost than configured."""
+    return pwd_context.needs_update(hashed_password)
+
+
+def user_claims(user) -> dict:
+    """Authorization state embedded in access tokens so verifiers can skip the DB."""
+    return {
+        "role": user.role.value,
+        "active": user.is_active and not user.is_deleted,
+        "ver": user.state_version,
+    }
+
+
+def create_access_token(
+    subject: str, expires_delta: Optional[timedelta] = None, claims: Optional[dict] = None
+) -> str:
+    """Create an access token, optionally embedding extra claims (see user_claims)."""
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    to_encode = {"exp": expire, "sub": str(subject), "type": "access"}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+    to_encode = {**(claims or {}), "exp": expire, "sub": str(subject), "type": "access"}
+    return _encode_token(to_encode)
+
 
+def create_refresh_token(subject: str, family: Optional[str] = None) -> str:
+    """
+    Create a refresh token.
 
-def create_refresh_token(subject: str) -> str:
-    """Create a refresh token."""
+    Each token gets a unique jti; rotated tokens keep the family id of the login
+    that started the chain so a reused token can revoke the whole chain.
+    """
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+    to_encode = {
+        "exp": expire,
+        "sub": str(subject),
+        "type": "refresh",
+        "jti": uuid.uuid4().hex,
+        "fam": family or uuid.uuid4().hex,
+    }
+    return _encode_token(to_encode)
+
+
+def _encode_token(to_encode: dict) -> str:
+    if is_asymmetric(settings.ALGORITHM):
+        kid, private_key = key_ring.signing_key()
+        return jwt.encode(to_encode, private_key, algorithm=settings.ALGORITHM, headers={"kid": kid})
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
 def decode_token(token: str) -> Optional[dict]:
-    """Decode and verify a JWT token."""
+    """Decode and verify a JWT token, reusing earlier verifications of the same token."""
+    if not settings.TOKEN_CACHE_ENABLED:
+        return _verify_token(token)
+
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is None:
+        payload = _verify_token(token)
+        if payload is None or "exp" not in payload:
+            return payload
+        token_cache.set(key, payload, expires_at=payload["exp"])
+
+    # Hand out a copy so callers can't mutate the cached claims
+    return dict(payload)
+
+
+def _verify_token(token: str) -> Optional[dict]:
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        if is_asymmetric(settings.ALGORITHM):
+            key = key_ring.verification_key(jwt.get_unverified_header(token).get("kid"))
+            if key is None:
+                return None
+        else:
+            key = settings.SECRET_KEY
+        payload = jwt.decode(token, key, algorithms=[settings.ALGORITHM])
         return payload
     except JWTError:
         return None
@@ -0,0 +1,52 @@
+"""Per-request read-your-writes state for replica routing.
+
+ReplicaConsistencyMiddleware loads the caller's last write position from a cookie
+into `current`. Routing sessions consult it before sending reads to a replica and
+record the position of every write they commit, which the middleware then hands
+back to the caller in the cookie.
+"""
+
+import re
+from contextvars import ContextVar
+from typing import Optional
+
+COOKIE_NAME = "db_pos"
+PRIMARY = "primary"  # cookie value that pins the caller to the primary
+
+_LSN_RE = re.compile(r"^[0-9A-Fa-f]{1,8}/[0-9A-Fa-f]{1,8}$")
+
+
+class WriteState:
+    """What the current request knows about the caller's own writes."""
+
+    __slots__ = ("pinned", "required_lsn", "wrote", "commit_lsn")
+
+    def __init__(self, pinned: bool = False, required_lsn: Optional[int] = None):
+        self.pinned = pinned  # read from the primary for the rest of the request
+        self.required_lsn = required_lsn  # a replica must have replayed this far
+        self.wrote = False  # set when this request committed a write
+        self.commit_lsn: Optional[str] = None  # primary WAL position after that write
+
+    @classmethod
+    def from_cookie(cls, value: Optional[str]) -> "WriteState":
+        if value == PRIMARY:
+            return cls(pinned=True)
+        lsn = parse_lsn(value)
+        return cls(required_lsn=lsn)
+
+    def cookie_value(self) -> Optional[str]:
+        """Cookie to hand back to the caller, or None if this request wrote nothing."""
+        if not self.wrote:
+            return None
+        return self.commit_lsn or PRIMARY
+
+
+current: ContextVar[Optional[WriteState]] = ContextVar("replica_write_state", default=None)
+
+
+def parse_lsn(value: Optional[str]) -> Optional[int]:
+    """Convert a Postgres LSN such as '0/16B3748' to an integer, or None if malformed."""
+    if not value or not _LSN_RE.match(value):
+        return None
+    high, low = value.split("/")
+    return (int(high, 16) << 32) + int(low, 16)
@@ -0,0 +1,147 @@
+"""Connection pool and statement cache instrumentation for the engines in app.db.session."""
+
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.metrics import Histogram
+
+
+class PoolMetrics:
+    """Checkout wait times and failure counters for one pool."""
+
+    def __init__(self):
+        self.checkout_wait = Histogram()
+        self.timeouts = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+
+
+# Pool whose checkout the current thread, task or greenlet is already timing. A
+# context variable rather than a thread-local: async pools run every checkout on
+# the event loop thread, each in its own greenlet and task context.
+_timing_checkout: ContextVar[Optional[object]] = ContextVar("pool_timing_checkout", default=None)
+
+
+class CheckoutTimingMixin:
+    """Records how long each checkout waited for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def resized(self, pool_size: int):
+        """A pool like this one (settings, listeners, metrics) holding pool_size connections."""
+        self._pool.maxsize = pool_size  # recreate() sizes the new pool from it
+        return self.recreate()
+
+    def _do_get(self):
+        # QueuePool._do_get retries by calling itself; only time the outermost call
+        if _timing_checkout.get() is self:
+            return super()._do_get()
+
+        token = _timing_checkout.set(self)
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            _timing_checkout.reset(token)
+            self.metrics.checkout_wait.observe(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(CheckoutTimingMixin, QueuePool):
+    """QueuePool with checkout wait-time metrics."""
+
+
+class InstrumentedAsyncAdaptedQueuePool(CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with checkout wait-time metrics."""
+
+
+def instrument_pool(engine: Engine) -> PoolMetrics:
+    """Attach invalidation counters to an engine's pool and return its metrics."""
+    pool = engine.pool
+    metrics = getattr(pool, "metrics", None)
+    if metrics is None:
+        metrics = pool.metrics = PoolMetrics()
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidations += 1
+
+    @event.listens_for(engine, "soft_invalidate")
+    def on_soft_invalidate(dbapi_connection, connection_record, exception):
+        metrics.soft_invalidations += 1
+
+    return metrics
+
+
+def pool_stats(engine: Engine) -> dict:
+    """Current pool occupancy plus accumulated metrics."""
+    pool = engine.pool
+    metrics: PoolMetrics = pool.metrics
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "checkout_wait_seconds": metrics.checkout_wait.snapshot(),
+        "timeouts": metrics.timeouts,
+        "invalidations": metrics.invalidations,
+        "soft_invalidations": metrics.soft_invalidations,
+    }
+
+
+class StatementCacheMetrics:
+    """How often executed statements found their compiled SQL in the engine's cache."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0  # executed with caching disabled or without a cache key
+
+
+def instrument_statement_cache(engine: Engine) -> StatementCacheMetrics:
+    """Count compiled-cache hits and misses for every statement the engine executes."""
+    metrics = engine.statement_cache_metrics = StatementCacheMetrics()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is None:
+            return
+        if context.cache_hit is CacheStats.CACHE_HIT:
+            metrics.hits += 1
+        elif context.cache_hit is CacheStats.CACHE_MISS:
+            metrics.misses += 1
+        else:
+            metrics.uncached += 1
+
+    return metrics
+
+
+def statement_cache_stats(engine: Engine) -> dict:
+    """Compiled-cache occupancy and hit ratio since startup."""
+    metrics: StatementCacheMetrics = engine.statement_cache_metrics
+    # _compiled_cache is private to SQLAlchemy; size and capacity are left out if it moves
+    cache = getattr(engine, "_compiled_cache", None)
+    lookups = metrics.hits + metrics.misses
+    return {
+        "size": len(cache) if cache is not None else None,
+        "capacity": getattr(cache, "capacity", None),
+        "hits": metrics.hits,
+        "misses": metrics.misses,
+        "uncached": metrics.uncached,
+        "hit_ratio": round(metrics.hits / lookups, 4) if lookups else None,
+    }
@@ -0,0 +1,201 @@
+"""Per-statement and per-request SQL timing, slow-query logging and sampled EXPLAIN capture.
+
+Every statement an instrumented engine runs is timed and aggregated by its SQL
+text (parameters are bound separately, so one entry covers every call of a
+query). Statements slower than SLOW_QUERY_MS are logged with the route and
+request ID of the request that issued them, and a sample of the slow SELECTs is
+re-run under EXPLAIN (ANALYZE, BUFFERS) so the plan can be read later from the
+admin slow-query endpoint. Re-running costs the request another execution of
+the query, which is why only SLOW_QUERY_EXPLAIN_SAMPLE_RATE of them are captured.
+
+Each request's statement count and database time are also totalled, for the
+/metrics histograms and (with DB_QUERY_DEBUG_HEADERS) its response headers.
+"""
+
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+LOGGED_STATEMENT_CHARS = 2000
+
+# Per-request totals for /metrics
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+queries_per_request = Histogram(buckets=QUERY_COUNT_BUCKETS)
+db_seconds_per_request = Histogram()
+
+
+class RequestQueries:
+    """The request being served, and the SQL it has run so far."""
+
+    __slots__ = ("request_id", "scope", "count", "seconds")
+
+    def __init__(self, request_id: str, scope: dict):
+        self.request_id = request_id
+        self.scope = scope  # read lazily: the matched route is only known after routing
+        self.count = 0
+        self.seconds = 0.0
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route")
+        path = getattr(route, "path", None) or self.scope.get("path")
+        return f"{self.scope.get('method')} {path}"
+
+    def observe(self) -> None:
+        """Add this request's totals to the per-request histograms."""
+        queries_per_request.observe(self.count)
+        db_seconds_per_request.observe(self.seconds)
+
+
+# Set by LoggingMiddleware for the duration of each request. Threadpool endpoints
+# get a copy of the context that still points at the same RequestQueries.
+request_context: ContextVar[Optional[RequestQueries]] = ContextVar("query_log_request", default=None)
+
+
+class StatementStats:
+    """Running totals for one SQL statement."""
+
+    __slots__ = ("calls", "total", "max", "slow_calls", "last_route", "last_request_id", "plan")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.slow_calls = 0
+        self.last_route = None
+        self.last_request_id = None
+        self.plan = None
+
+
+class QueryLog:
+    """Statement timings shared by every instrumented engine in the process."""
+
+    def __init__(self, max_statements: int):
+        self.max_statements = max_statements
+        self._stats: dict[str, StatementStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, elapsed: float, slow: bool, route, request_id) -> None:
+        with self._lock:
+            stats = self._stats.get(statement)
+            if stats is None:
+                if len(self._stats) >= self.max_statements:
+                    return  # keep the statements already tracked
+                stats = self._stats[statement] = StatementStats()
+            stats.calls += 1
+            stats.total += elapsed
+            stats.max = max(stats.max, elapsed)
+            if slow:
+                stats.slow_calls += 1
+                stats.last_route = route
+                stats.last_request_id = request_id
+
+    def store_plan(self, statement: str, plan: str) -> None:
+        with self._lock:
+            stats = self._stats.get(statement)
+            if stats is not None:
+                stats.plan = plan
+
+    def top(self, limit: int) -> list[dict]:
+        """The limit statements with the most total time, slowest first."""
+        with self._lock:
+            ranked = sorted(self._stats.items(), key=lambda item: item[1].total, reverse=True)[:limit]
+            return [
+                {
+                    "statement": statement,
+                    "calls": stats.calls,
+                    "total_ms": round(stats.total * 1000, 3),
+                    "mean_ms": round(stats.total * 1000 / stats.calls, 3),
+                    "max_ms": round(stats.max * 1000, 3),
+                    "slow_calls": stats.slow_calls,
+                    "last_slow_route": stats.last_route,
+                    "last_slow_request_id": stats.last_request_id,
+                    "plan": stats.plan,
+                }
+                for statement, stats in ranked
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+query_log = QueryLog(max_statements=settings.QUERY_LOG_MAX_STATEMENTS)
+
+
+def _explain(conn, statement: str, parameters) -> Optional[str]:
+    """EXPLAIN (ANALYZE, BUFFERS) the statement in a savepoint on the same connection."""
+    explain_cursor = conn.connection.cursor()
+    try:
+        explain_cursor.execute("SAVEPOINT query_log_explain")
+        try:
+            explain_cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+            plan = "\n".join(row[0] for row in explain_cursor.fetchall())
+        except Exception:
+            explain_cursor.execute("ROLLBACK TO SAVEPOINT query_log_explain")
+            raise
+        explain_cursor.execute("RELEASE SAVEPOINT query_log_explain")
+        return plan
+    finally:
+        explain_cursor.close()
+
+
+def instrument_query_log(engine: Engine) -> None:
+    """Time every statement the engine runs; log, and sometimes EXPLAIN, the slow ones."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context.query_log_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "query_log_start", None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        request = request_context.get()
+        if request is not None:
+            request.count += 1
+            request.seconds += elapsed
+
+        threshold = settings.SLOW_QUERY_MS / 1000
+        slow = 0 < threshold <= elapsed
+        request_id, route = (request.request_id, request.route) if slow and request is not None else (None, None)
+        query_log.record(statement, elapsed, slow, route, request_id)
+        if not slow:
+            return
+
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.1f} ms) in {route or 'background task'}"
+            f" [request {request_id}]: {statement[:LOGGED_STATEMENT_CHARS]}",
+            extra={"request_id": request_id, "route": route, "duration_ms": round(elapsed * 1000, 1)},
+        )
+
+        # Only plain SELECTs: ANALYZE executes the statement again. Streaming
+        # (server-side cursor) results are still being read on this connection.
+        if (
+            executemany
+            or not statement.lstrip().upper().startswith("SELECT")
+            or context.execution_options.get("stream_results")
+            or random.random() >= settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+        ):
+            return
+        try:
+            plan = _explain(conn, statement, parameters)
+        except Exception as e:
+            logger.warning(f"Could not EXPLAIN slow query: {e}")
+            return
+        query_log.store_plan(statement, plan)
+        logger.warning(f"Plan for slow query [request {request_id}]:\n{plan}")
@@ -1,10 +1,204 @@
-from sqlalchemy import create_engine
+import logging
+import random
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 from app.core.config import settings
+from app.db import consistency
+from app.db.instrumentation import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    instrument_pool,
+    instrument_statement_cache,
+)
+from app.db.query_log import instrument_query_log
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_POOL_SIZE = 5
+
+
+def pool_size_for(max_connections: int) -> int:
+    """
+    This worker's share of max_connections, per pool.
+
+    Each worker can hold pool_size + max_overflow connections per engine, so the
+    connection budget left after DB_RESERVED_CONNECTIONS is split across
+    WEB_CONCURRENCY workers and engines before overflow is subtracted.
+    """
+    engines_per_worker = 2 if settings.DB_ASYNC_MODE else 1
+    budget = (max_connections - settings.DB_RESERVED_CONNECTIONS) // (settings.WEB_CONCURRENCY * engines_per_worker)
+    return max(1, budget - settings.DB_MAX_OVERFLOW)
+
+
+# Engines start with DB_POOL_SIZE, or FALLBACK_POOL_SIZE until size_pools() has asked
+# the server at app startup, so importing this module (alembic, CLI commands, test
+# collection) never opens a connection.
+pool_options = dict(
+    pool_size=settings.DB_POOL_SIZE or FALLBACK_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+)
+
+engine = create_engine(settings.DATABASE_URL, poolclass=InstrumentedQueuePool, **pool_options)
+instrument_pool(engine)
+instrument_statement_cache(engine)
+instrument_query_log(engine)
+
+# Read replicas, each with its own pool on its own server
+replica_engines = []
+for url in settings.DATABASE_REPLICA_URLS:
+    replica = create_engine(url, poolclass=InstrumentedQueuePool, **pool_options)
+    instrument_pool(replica)
+    instrument_statement_cache(replica)
+    instrument_query_log(replica)
+    replica_engines.append(replica)
+
+
+class RoutingSession(Session):
+    """
+    Session that sends SELECTs issued inside replica_reads() to a replica.
+
+    Everything else - flushes, UPDATE/DELETE statements and any query outside a
+    replica_reads() block - goes to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get("replica")
+        if replica is not None and not self._flushing and getattr(clause, "is_select", False):
+            return replica
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+# A write remembers the primary connection it ran on, so the WAL position can be
+# read on that same connection after the commit
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_flush(session, flush_context):
+    session.info["wrote"] = session.connection()
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_statement(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = orm_execute_state.session.connection()
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _discard_write(session):
+    session.info.pop("wrote", None)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _record_write(session):
+    """Remember that this request wrote, and where the primary's WAL was afterwards."""
+    conn = session.info.pop("wrote", None)
+    if conn is None or not replica_engines:
+        return
+    state = consistency.current.get()
+    if state is None:
+        return
+
+    state.wrote = True
+    state.pinned = True
+    if settings.REPLICA_CONSISTENCY == "lsn":
+        try:
+            # The session still holds the committed connection here (it is released
+            # right after), so this costs one round trip and no extra pool checkout
+            state.commit_lsn = conn.exec_driver_sql("SELECT pg_current_wal_lsn()").scalar()
+        except Exception as e:
+            # The caller gets a pin-to-primary cookie instead
+            logger.warning(f"Could not read WAL position after commit: {e}")
+
+
+def _replica_for(db: Session):
+    """Pick a replica fresh enough for the current caller, or None for the primary."""
+    if not replica_engines or not isinstance(db, RoutingSession) or db.info.get("wrote"):
+        return None
+
+    state = consistency.current.get()
+    if state is not None and state.pinned:
+        return None
+
+    replica = random.choice(replica_engines)
+    if state is None or state.required_lsn is None:
+        return replica
+    if settings.REPLICA_CONSISTENCY != "lsn":
+        return None
+
+    # One look at the replica: waiting for it would hold this thread and a replica
+    # connection, while the primary can answer straight away
+    conn = db.connection(bind_arguments={"bind": replica})
+    replayed = consistency.parse_lsn(conn.execute(text("SELECT pg_last_wal_replay_lsn()")).scalar())
+    if replayed is not None and replayed >= state.required_lsn:
+        return replica
+    # Not a standby, or still lagging: stay on the primary for this request
+    state.pinned = True
+    return None
+
+
+@contextmanager
+def replica_reads(db: Session):
+    """Send the SELECTs db issues inside the block to a replica when one is fresh enough."""
+    replica = _replica_for(db)
+    if replica is None:
+        yield db
+        return
+
+    db.info["replica"] = replica
+    try:
+        yield db
+    finally:
+        db.info.pop("replica", None)
+
+
+# Objects stay loaded after commit; server-generated columns arrive through RETURNING
+# (eager_defaults on the models), so responses serialize without a reload
+SessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
+
+# asyncpg engine, only created when the deployment opts into async mode
+async_engine = None
+if settings.DB_ASYNC_MODE:
+    async_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL, poolclass=InstrumentedAsyncAdaptedQueuePool, **pool_options
+    )
+    instrument_pool(async_engine.sync_engine)
+    instrument_statement_cache(async_engine.sync_engine)
+    instrument_query_log(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+
+def size_pools() -> None:
+    """When DB_POOL_SIZE is unset, resize every pool to this worker's share of max_connections (app startup)."""
+    if settings.DB_POOL_SIZE:
+        return
+
+    probe = create_engine(settings.DATABASE_URL, poolclass=NullPool, connect_args={"connect_timeout": 3})
+    try:
+        with probe.connect() as conn:
+            max_connections = int(conn.execute(text("SHOW max_connections")).scalar())
+    except Exception as e:
+        logger.warning(f"Could not read max_connections, keeping pool size {FALLBACK_POOL_SIZE}: {e}")
+        return
+    finally:
+        probe.dispose()
+
+    size = pool_size_for(max_connections)
+    engines = [engine, *replica_engines] + ([async_engine.sync_engine] if async_engine else [])
+    for each in engines:
+        old_pool = each.pool
+        each.pool = old_pool.resized(size)
+        old_pool.dispose()
+    logger.info(f"Connection pools sized to {size} from max_connections={max_connections}")
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
@@ -16,3 +210,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency for async database sessions."""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,12 +1,24 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from app.core.config import settings
+from app.core.password_pool import password_pool
+from app.db.session import SessionLocal, engine, replica_engines, size_pools
+from app.services import archive as archive_service
+from app.services import refresh_token as refresh_token_service
 from app.api.v1.routers import api_router
 from app.api.v1.routers.health import router as health_router
-from app.middleware import LoggingMiddleware, SecurityHeadersMiddleware
+from app.api.v1.routers.well_known import router as well_known_router
+from app.core.rate_limit import rate_limit_backend
+from app.middleware import (
+    LoggingMiddleware,
+    RateLimitMiddleware,
+    ReplicaConsistencyMiddleware,
+    SecurityHeadersMiddleware,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -28,12 +40,37 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     logger.info("Starting up application...")
+    password_pool.start()
+    size_pools()
+
+    db = SessionLocal()
+    try:
+        refresh_token_service.rebuild_filter(db)
+    except Exception as e:
+        logger.error(f"Could not load refresh token revocations: {e}")
+    finally:
+        db.close()
+
+    archive_task = None
+    if settings.ARCHIVE_INTERVAL_HOURS > 0:
+        archive_task = asyncio.create_task(archive_service.run_periodically(
+            engine,
+            settings.ARCHIVE_INTERVAL_HOURS,
+            older_than_days=settings.ARCHIVE_AFTER_DAYS,
+            batch_size=settings.ARCHIVE_BATCH_SIZE,
+            pause_ms=settings.ARCHIVE_BATCH_PAUSE_MS,
+            lock_timeout_ms=settings.ARCHIVE_LOCK_TIMEOUT_MS,
+        ))
+
     logger.info("Application startup complete")
 
     yield
 
     # Shutdown
     logger.info("Shutting down application...")
+    if archive_task is not None:
+        archive_task.cancel()
+    password_pool.shutdown()
 
 
 app = FastAPI(
@@ -45,6 +82,24 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Read-your-writes cookie for replica routing (innermost, wraps only the endpoints)
+if replica_engines:
+    app.add_middleware(
+        ReplicaConsistencyMiddleware,
+        max_age=settings.REPLICA_STICKY_SECONDS,
+        secure=settings.SECURE_COOKIES,
+    )
+
+# Rate limiting (inside CORS, so 429 responses still get CORS headers)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        backend=rate_limit_backend,
+        default_limit=settings.RATE_LIMIT_PER_MINUTE,
+        routes=settings.RATE_LIMIT_ROUTES,
+        path_prefix=settings.API_V1_STR,
+    )
+
 # Session middleware (required for OAuth)
 app.add_middleware(
     SessionMiddleware,
@@ -59,6 +114,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After", "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-Next-Cursor", "ETag"],
 )
 
 # Custom middleware
@@ -68,6 +124,7 @@ app.add_middleware(LoggingMiddleware)
 # Include routers
 app.include_router(api_router, prefix=settings.API_V1_STR)
 app.include_router(health_router)
+app.include_router(well_known_router)
 
 
 @app.get("/")
@@ -1,4 +1,6 @@
 from app.middleware.logging import LoggingMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.replica import ReplicaConsistencyMiddleware
 from app.middleware.security import SecurityHeadersMiddleware
 
-__all__ = ["LoggingMiddleware", "SecurityHeadersMiddleware"]
+__all__ = ["LoggingMiddleware", "RateLimitMiddleware", "ReplicaConsistencyMiddleware", "SecurityHeadersMiddleware"]
@@ -3,6 +3,8 @@ import uuid
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 import logging
+from app.core.config import settings
+from app.db import query_log
 
 logger = logging.getLogger(__name__)
 
@@ -25,8 +27,14 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             }
         )
 
-        # Process request
-        response = await call_next(request)
+        # Process request; SQL it runs is counted and attributed to it in the slow-query log
+        queries = query_log.RequestQueries(request_id, request.scope)
+        context_token = query_log.request_context.set(queries)
+        try:
+            response = await call_next(request)
+        finally:
+            query_log.request_context.reset(context_token)
+        queries.observe()
 
         # Log response
         process_time = time.time() - start_time
@@ -38,10 +46,15 @@ class LoggingMiddleware(BaseHTTPMiddleware):
                 "url": str(request.url),
                 "status_code": response.status_code,
                 "process_time": f"{process_time:.3f}s",
+                "db_queries": queries.count,
+                "db_time": f"{queries.seconds:.3f}s",
             }
         )
 
         # Add request ID to response headers
         response.headers["X-Request-ID"] = request_id
+        if settings.DB_QUERY_DEBUG_HEADERS:
+            response.headers["X-DB-Query-Count"] = str(queries.count)
+            response.headers["X-DB-Query-Time-Ms"] = f"{queries.seconds * 1000:.1f}"
 
         return response
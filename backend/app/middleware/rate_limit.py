@@ -0,0 +1,102 @@
+import logging
+import time
+from typing import Optional
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.security import decode_token
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitMiddleware:
+    """
+    Reject requests over the configured rate with 429 and a Retry-After header.
+
+    Written as plain ASGI rather than BaseHTTPMiddleware so the check adds no
+    per-request task or response wrapping on the hot path.
+
+    Fails open: when the backend errors (e.g. the shared store is down), requests
+    go through unlimited rather than failing, and the error is logged once a window.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        backend,
+        default_limit: int,
+        routes: Optional[dict[str, int]] = None,
+        path_prefix: str = "/api/",
+        window: int = 60,
+    ):
+        self.app = app
+        self.backend = backend
+        self.default_limit = default_limit
+        self.path_prefix = path_prefix
+        self.window = window
+        # Longest prefix first so the most specific rule wins
+        self.routes = sorted((routes or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self._error_logged_at = 0.0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        rule, limit = self._match(scope["path"])
+        key = f"{rule}:{self._client_key(scope)}"
+        try:
+            result = await self.backend.hit(key, limit, self.window)
+        except Exception:
+            now = time.monotonic()
+            if now - self._error_logged_at >= self.window:
+                self._error_logged_at = now
+                logger.exception("Rate limit backend failed; allowing requests without limits")
+            await self.app(scope, receive, send)
+            return
+
+        if not result.allowed:
+            response = JSONResponse(
+                {"detail": "Too many requests"},
+                status_code=429,
+                headers={
+                    "Retry-After": str(result.retry_after),
+                    "X-RateLimit-Limit": str(limit),
+                    "X-RateLimit-Remaining": "0",
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-ratelimit-limit", str(limit).encode()))
+                headers.append((b"x-ratelimit-remaining", str(result.remaining).encode()))
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    def _match(self, path: str) -> tuple[str, int]:
+        for prefix, limit in self.routes:
+            if path.startswith(prefix):
+                return prefix, limit
+        return "*", self.default_limit
+
+    @staticmethod
+    def _client_key(scope: Scope) -> str:
+        request = Request(scope)
+        token = request.cookies.get("access_token")
+        if not token:
+            authorization = request.headers.get("authorization", "")
+            if authorization.lower().startswith("bearer "):
+                token = authorization[7:]
+
+        if token:
+            payload = decode_token(token)  # cached, so cheap for repeat callers
+            if payload and payload.get("type") == "access" and payload.get("sub"):
+                return f"user:{payload['sub']}"
+
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
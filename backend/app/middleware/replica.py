@@ -0,0 +1,47 @@
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.db import consistency
+
+
+class ReplicaConsistencyMiddleware:
+    """
+    Carry each caller's last write position between requests in a cookie.
+
+    The cookie holds the primary's WAL position after the caller's last write (or a
+    pin-to-primary marker) for max_age seconds, so replica routing can keep that
+    caller's reads consistent with their own writes.
+    """
+
+    def __init__(self, app: ASGIApp, max_age: int, secure: bool = False):
+        self.app = app
+        self.max_age = max_age
+        self.secure = secure
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = consistency.WriteState.from_cookie(Request(scope).cookies.get(consistency.COOKIE_NAME))
+        token = consistency.current.set(state)
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                value = state.cookie_value()
+                if value is not None:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"set-cookie", self._cookie(value).encode("latin-1")))
+                    message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            consistency.current.reset(token)
+
+    def _cookie(self, value: str) -> str:
+        # Values are LSNs or a fixed marker, so they need no quoting
+        cookie = f"{consistency.COOKIE_NAME}={value}; Max-Age={self.max_age}; Path=/; HttpOnly; SameSite=lax"
+        if self.secure:
+            cookie += "; Secure"
+        return cookie
@@ -1,4 +1,7 @@
 from app.models.user import User
 from app.models.project import Project
+from app.models.refresh_token import RevokedRefreshToken
+from app.models.user_counters import UserCounters
+from app.models.archive import ArchivedProject, ArchivedUser
 
-__all__ = ["User", "Project"]
+__all__ = ["User", "Project", "RevokedRefreshToken", "UserCounters", "ArchivedUser", "ArchivedProject"]
@@ -0,0 +1,48 @@
+from sqlalchemy import Boolean, Column, DateTime, Enum as SQLEnum, Index, Integer, String, Text
+from sqlalchemy.sql import func
+from app.db.session import Base
+from app.core.constants import OAuthProvider, UserRole
+
+
+class ArchivedUser(Base):
+    """
+    A soft-deleted user moved out of users by the archive job (app.services.archive).
+
+    Same columns as users, less the live-row bookkeeping (is_deleted, state_version);
+    no foreign keys, so archived rows never slow down writes to the hot tables.
+    """
+
+    __tablename__ = "archived_users"
+
+    id = Column(Integer, primary_key=True)  # the id the user had in users
+    email = Column(String, nullable=False, index=True)
+    hashed_password = Column(String, nullable=True)
+    full_name = Column(String, nullable=True)
+    role = Column(SQLEnum(UserRole), nullable=False)
+    is_active = Column(Boolean, nullable=False)
+    is_verified = Column(Boolean, nullable=False)
+    oauth_provider = Column(SQLEnum(OAuthProvider), nullable=False)
+    oauth_provider_id = Column(String, nullable=True)
+    profile_picture_url = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class ArchivedProject(Base):
+    """A project of an archived user, moved out of projects with its owner."""
+
+    __tablename__ = "archived_projects"
+
+    id = Column(Integer, primary_key=True)  # the id the project had in projects
+    title = Column(String, nullable=False)
+    description = Column(Text, nullable=True)
+    owner_id = Column(Integer, nullable=False)  # archived_users.id
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_archived_projects_owner_id", "owner_id"),
+    )
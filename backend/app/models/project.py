@@ -1,9 +1,17 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, Integer, String, Text, ForeignKey, DateTime, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from app.db.session import Base
 
 
+# Shared with the migration that adds the column
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+
 class Project(Base):
     __tablename__ = "projects"
 
@@ -14,5 +22,18 @@ class Project(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    # Full-text search document (title weighted above description), kept current by Postgres
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
+
     # Relationships
     owner = relationship("User", back_populates="projects")
+
+    # Read server-generated columns back with INSERT/UPDATE ... RETURNING
+    __mapper_args__ = {"eager_defaults": True}
+
+    __table_args__ = (
+        # Keyset pagination of an owner's projects (also serves plain owner_id lookups)
+        Index("ix_projects_owner_id_created_at_id", "owner_id", "created_at", "id"),
+        # Full-text search (search_projects)
+        Index("ix_projects_search_vector", "search_vector", postgresql_using="gin"),
+    )
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class RevokedRefreshToken(Base):
+    """A refresh token that was rotated or logged out, or a whole revoked token family."""
+
+    __tablename__ = "revoked_refresh_tokens"
+
+    id = Column(String, primary_key=True)  # token jti, or family id when kind == "family"
+    kind = Column(String, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    revoked_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, Enum as SQLEnum, DateTime
+from sqlalchemy import Boolean, Column, DDL, Integer, String, Enum as SQLEnum, DateTime, Index, event, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.session import Base
@@ -9,17 +9,18 @@ class User(Base):
     __tablename__ = "users"
 
     id = Column(Integer, primary_key=True, index=True)
-    email = Column(String, unique=True, index=True, nullable=False)
+    email = Column(String, nullable=False)  # Unique (case-insensitively) among non-deleted users, see __table_args__
     hashed_password = Column(String, nullable=True)  # Nullable for OAuth-only users
     full_name = Column(String, nullable=True)
     role = Column(SQLEnum(UserRole), default=UserRole.USER, nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
     is_verified = Column(Boolean, default=False, nullable=False)
     is_deleted = Column(Boolean, default=False, nullable=False)
+    state_version = Column(Integer, default=0, nullable=False)  # Bumped on role/status changes, embedded in tokens
 
     # OAuth fields
     oauth_provider = Column(SQLEnum(OAuthProvider), default=OAuthProvider.LOCAL, nullable=False)
-    oauth_provider_id = Column(String, nullable=True, index=True)  # Provider's unique user ID
+    oauth_provider_id = Column(String, nullable=True)  # Provider's unique user ID
     profile_picture_url = Column(String, nullable=True)  # User's profile picture from OAuth provider
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -28,3 +29,44 @@ class User(Base):
 
     # Relationships
     projects = relationship("Project", back_populates="owner", cascade="all, delete-orphan")
+
+    # Read server-generated columns (id, created_at, updated_at) back with
+    # INSERT/UPDATE ... RETURNING instead of a refresh SELECT after commit
+    __mapper_args__ = {"eager_defaults": True}
+
+    __table_args__ = (
+        # Emails are unique among live users regardless of case, which also serves
+        # get_user_by_email's lower(email) lookups; a deleted user's email can be registered again
+        Index(
+            "uq_users_lower_email_live",
+            func.lower(email),
+            unique=True,
+            postgresql_where=text("is_deleted = false"),
+        ),
+        # Admin counts (count_active_admins)
+        Index("ix_users_role_active_live", "role", "is_active", postgresql_where=text("is_deleted = false")),
+        # OAuth logins (get_user_by_oauth)
+        Index("ix_users_oauth_provider_provider_id", "oauth_provider", "oauth_provider_id", unique=True),
+        # Keyset pagination of user listings, with and without deleted users
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_live_created_at_id", "created_at", "id", postgresql_where=text("is_deleted = false")),
+        # Archive job: soft-deleted users in deletion order (app.services.archive)
+        Index("ix_users_deleted_at_id", "deleted_at", "id", postgresql_where=text("is_deleted = true")),
+        # Admin substring/fuzzy search (user_search_statement); trigrams are case-folded,
+        # so these serve ILIKE '%q%' and similarity matches alike
+        Index("ix_users_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+        Index(
+            "ix_users_full_name_trgm",
+            "full_name",
+            postgresql_using="gin",
+            postgresql_ops={"full_name": "gin_trgm_ops"},
+        ),
+    )
+
+
+# The trigram indexes need pg_trgm; migrations install it in f7b2d9e4a1c3
+event.listen(
+    User.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,123 @@
+from sqlalchemy import Column, DDL, Integer, event
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.db.session import Base
+from app.models.user import User
+
+
+class UserCounters(Base):
+    """
+    Single row of user counts for the admin dashboard.
+
+    Maintained by the users_counters trigger on every insert, delete and
+    role/status change, so reading the stats costs one row instead of a scan.
+    The price is paid on writes: every users write updates this one row, so
+    concurrent signups and admin changes queue on its row lock until the
+    writing transaction commits. The trigger and row only exist while
+    USER_STATS_COUNTERS is on; without the row the stats fall back to counting.
+    """
+
+    __tablename__ = "user_counters"
+
+    id = Column(Integer, primary_key=True)  # always 1
+    total_users = Column(Integer, nullable=False, default=0)
+    active_users = Column(Integer, nullable=False, default=0)
+    inactive_users = Column(Integer, nullable=False, default=0)
+    admin_users = Column(Integer, nullable=False, default=0)
+    deleted_users = Column(Integer, nullable=False, default=0)
+
+
+COUNTERS_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION user_counters_apply() RETURNS trigger AS $$
+DECLARE
+    d_total integer := 0;
+    d_active integer := 0;
+    d_inactive integer := 0;
+    d_admin integer := 0;
+    d_deleted integer := 0;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        d_total := d_total - (NOT OLD.is_deleted)::integer;
+        d_active := d_active - (OLD.is_active AND NOT OLD.is_deleted)::integer;
+        d_inactive := d_inactive - (NOT OLD.is_active AND NOT OLD.is_deleted)::integer;
+        d_admin := d_admin - (OLD.role::text = 'ADMIN' AND NOT OLD.is_deleted)::integer;
+        d_deleted := d_deleted - OLD.is_deleted::integer;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        d_total := d_total + (NOT NEW.is_deleted)::integer;
+        d_active := d_active + (NEW.is_active AND NOT NEW.is_deleted)::integer;
+        d_inactive := d_inactive + (NOT NEW.is_active AND NOT NEW.is_deleted)::integer;
+        d_admin := d_admin + (NEW.role::text = 'ADMIN' AND NOT NEW.is_deleted)::integer;
+        d_deleted := d_deleted + NEW.is_deleted::integer;
+    END IF;
+
+    IF d_total <> 0 OR d_active <> 0 OR d_inactive <> 0 OR d_admin <> 0 OR d_deleted <> 0 THEN
+        UPDATE user_counters SET
+            total_users = total_users + d_total,
+            active_users = active_users + d_active,
+            inactive_users = inactive_users + d_inactive,
+            admin_users = admin_users + d_admin,
+            deleted_users = deleted_users + d_deleted
+        WHERE id = 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+COUNTERS_TRIGGER_SQL = """
+CREATE TRIGGER users_counters
+AFTER INSERT OR DELETE OR UPDATE OF role, is_active, is_deleted ON users
+FOR EACH ROW EXECUTE FUNCTION user_counters_apply()
+"""
+
+COUNTERS_RECOUNT_SQL = """
+INSERT INTO user_counters (id, total_users, active_users, inactive_users, admin_users, deleted_users)
+SELECT
+    1,
+    count(*) FILTER (WHERE NOT is_deleted),
+    count(*) FILTER (WHERE is_active AND NOT is_deleted),
+    count(*) FILTER (WHERE NOT is_active AND NOT is_deleted),
+    count(*) FILTER (WHERE role = 'ADMIN' AND NOT is_deleted),
+    count(*) FILTER (WHERE is_deleted)
+FROM users
+"""
+
+
+def install_counters(conn: Connection) -> None:
+    """Count the users into a fresh counters row and add the trigger that keeps it current."""
+    conn.exec_driver_sql(COUNTERS_FUNCTION_SQL)
+    # Lock users so no write slips in between the count and the trigger
+    conn.exec_driver_sql("LOCK TABLE users IN SHARE ROW EXCLUSIVE MODE")
+    conn.exec_driver_sql("DROP TRIGGER IF EXISTS users_counters ON users")
+    conn.exec_driver_sql("DELETE FROM user_counters")
+    conn.exec_driver_sql(COUNTERS_RECOUNT_SQL)
+    conn.exec_driver_sql(COUNTERS_TRIGGER_SQL)
+
+
+def remove_counters(conn: Connection) -> None:
+    """Drop the trigger and the counters row, so users writes no longer touch it."""
+    conn.exec_driver_sql("DROP TRIGGER IF EXISTS users_counters ON users")
+    conn.exec_driver_sql("DELETE FROM user_counters")
+
+
+def counters_enabled(*args, **kwargs) -> bool:
+    return settings.USER_STATS_COUNTERS
+
+
+# Tables created with metadata.create_all (tests, fresh databases) get the same
+# trigger as migrated ones when USER_STATS_COUNTERS is on; the counters start at
+# zero on an empty users table.
+event.listen(User.__table__, "after_create", DDL(COUNTERS_FUNCTION_SQL).execute_if(dialect="postgresql"))
+event.listen(
+    User.__table__,
+    "after_create",
+    DDL(COUNTERS_TRIGGER_SQL).execute_if(dialect="postgresql", callable_=counters_enabled),
+)
+event.listen(
+    UserCounters.__table__,
+    "after_create",
+    DDL("INSERT INTO user_counters (id, total_users, active_users, inactive_users, admin_users, deleted_users) "
+        "VALUES (1, 0, 0, 0, 0, 0)").execute_if(dialect="postgresql", callable_=counters_enabled),
+)
@@ -1,6 +1,7 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional
 from datetime import datetime
+from app.core.config import settings
 
 
 # Shared properties
@@ -36,6 +37,85 @@ class Project(ProjectInDBBase):
     pass
 
 
+# Full-text search hit; highlights are HTML-escaped with matches wrapped in <mark>
+class ProjectSearchResult(Project):
+    rank: float
+    title_highlight: str
+    description_highlight: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, project, rank: float, title_highlight: str, description_highlight: Optional[str]):
+        return cls(
+            **Project.model_validate(project).model_dump(),
+            rank=rank,
+            title_highlight=title_highlight,
+            description_highlight=description_highlight,
+        )
+
+
 # Properties stored in DB
 class ProjectInDB(ProjectInDBBase):
     pass
+
+
+# Batch endpoints
+class ProjectBatchUpdateItem(ProjectUpdate):
+    id: int
+
+
+def _unique_ids(ids: List[int]) -> None:
+    if len(set(ids)) != len(ids):
+        raise ValueError("Project ids must be unique")
+
+
+class ProjectBatchCreate(BaseModel):
+    items: List[ProjectCreate] = Field(min_length=1, max_length=settings.PROJECT_BATCH_MAX_ITEMS)
+
+
+class ProjectBatchUpdate(BaseModel):
+    items: List[ProjectBatchUpdateItem] = Field(min_length=1, max_length=settings.PROJECT_BATCH_MAX_ITEMS)
+
+    @field_validator("items")
+    @classmethod
+    def unique_ids(cls, v):
+        _unique_ids([item.id for item in v])
+        return v
+
+
+class ProjectBatchDelete(BaseModel):
+    ids: List[int] = Field(min_length=1, max_length=settings.PROJECT_BATCH_MAX_ITEMS)
+
+    @field_validator("ids")
+    @classmethod
+    def unique_ids(cls, v):
+        _unique_ids(v)
+        return v
+
+
+class ProjectBatchItemResult(BaseModel):
+    """Outcome for one item, in request order (404 = missing or not owned)."""
+    id: int
+    status: int
+    project: Optional[Project] = None
+
+
+class ProjectBatchResult(BaseModel):
+    results: List[ProjectBatchItemResult]
+
+    @classmethod
+    def created(cls, projects) -> "ProjectBatchResult":
+        return cls(results=[
+            ProjectBatchItemResult(id=p.id, status=201, project=Project.model_validate(p)) for p in projects
+        ])
+
+    @classmethod
+    def updated(cls, ids: List[int], projects: dict) -> "ProjectBatchResult":
+        return cls(results=[
+            ProjectBatchItemResult(id=i, status=200, project=Project.model_validate(projects[i]))
+            if i in projects else ProjectBatchItemResult(id=i, status=404)
+            for i in ids
+        ])
+
+    @classmethod
+    def deleted(cls, ids: List[int], deleted: set) -> "ProjectBatchResult":
+        return cls(results=[ProjectBatchItemResult(id=i, status=204 if i in deleted else 404) for i in ids])
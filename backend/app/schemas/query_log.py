@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class StatementStats(BaseModel):
+    """Timing totals for one SQL statement since startup (or the last reset)."""
+    statement: str
+    calls: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    slow_calls: int
+    last_slow_route: Optional[str] = None
+    last_slow_request_id: Optional[str] = None
+    plan: Optional[str] = None  # EXPLAIN (ANALYZE, BUFFERS) of a sampled slow call
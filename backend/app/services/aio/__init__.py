@@ -0,0 +1,5 @@
+"""Async (asyncpg) versions of the service layer, used when DB_ASYNC_MODE is enabled."""
+
+from app.services.aio import user, project, oauth, refresh_token
+
+__all__ = ["user", "project", "oauth", "refresh_token"]
@@ -0,0 +1,139 @@
+"""Async OAuth service layer for handling OAuth authentication and account linking."""
+
+from typing import Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+
+from app.models.user import User
+from app.schemas.user import UserCreateOAuth
+from app.core.constants import OAuthProvider
+from app.core.password_pool import password_pool
+from app.services.oauth import ensure_no_password
+from app.services.user import USER_BY_EMAIL
+
+
+async def get_user_by_oauth(
+    db: AsyncSession, provider: OAuthProvider, provider_id: str
+) -> Optional[User]:
+    """Get user by OAuth provider and provider ID."""
+    result = await db.scalars(
+        select(User).where(
+            User.oauth_provider == provider,
+            User.oauth_provider_id == provider_id,
+        )
+    )
+    return result.first()
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    """Get user by email, case-insensitively (excluding deleted users)."""
+    result = await db.scalars(USER_BY_EMAIL, {"email": email.lower()})
+    return result.first()
+
+
+async def create_oauth_user(db: AsyncSession, user_data: UserCreateOAuth) -> User:
+    """Create a new user from OAuth data."""
+    db_user = User(
+        email=user_data.email,
+        full_name=user_data.full_name,
+        oauth_provider=user_data.oauth_provider,
+        oauth_provider_id=user_data.oauth_provider_id,
+        profile_picture_url=user_data.profile_picture_url,
+        is_verified=user_data.is_verified,
+        is_active=True,
+        hashed_password=None,  # OAuth users don't have passwords initially
+    )
+    db.add(db_user)
+    await db.commit()
+    return db_user
+
+
+async def link_oauth_to_existing_user(
+    db: AsyncSession,
+    user: User,
+    provider: OAuthProvider,
+    provider_id: str,
+    picture_url: Optional[str] = None,
+) -> User:
+    """Link OAuth provider to existing user account."""
+    user.oauth_provider = provider
+    user.oauth_provider_id = provider_id
+
+    # Update profile picture if provided and user doesn't have one
+    if picture_url and not user.profile_picture_url:
+        user.profile_picture_url = picture_url
+
+    # Auto-verify user if they authenticated via OAuth
+    if not user.is_verified:
+        user.is_verified = True
+
+    await db.commit()
+    return user
+
+
+def _ensure_can_login(user: User) -> None:
+    if user.is_deleted:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="This account has been deleted. Please contact support.",
+        )
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="This account has been deactivated. Please contact support.",
+        )
+
+
+async def handle_oauth_login(
+    db: AsyncSession,
+    provider: OAuthProvider,
+    provider_id: str,
+    email: str,
+    full_name: Optional[str] = None,
+    picture: Optional[str] = None,
+    email_verified: bool = False,
+) -> Tuple[User, bool]:
+    """
+    Handle OAuth login flow with automatic account linking.
+
+    Same rules as app.services.oauth.handle_oauth_login.
+    """
+    # Only allow verified emails from OAuth providers
+    if not email_verified:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email not verified by OAuth provider. Please verify your email with the provider.",
+        )
+
+    existing_oauth_user = await get_user_by_oauth(db, provider, provider_id)
+    if existing_oauth_user:
+        _ensure_can_login(existing_oauth_user)
+        return existing_oauth_user, False
+
+    existing_email_user = await get_user_by_email(db, email)
+    if existing_email_user:
+        _ensure_can_login(existing_email_user)
+        linked_user = await link_oauth_to_existing_user(
+            db, existing_email_user, provider, provider_id, picture
+        )
+        return linked_user, False
+
+    user_data = UserCreateOAuth(
+        email=email,
+        full_name=full_name,
+        oauth_provider=provider,
+        oauth_provider_id=provider_id,
+        profile_picture_url=picture,
+        is_verified=True,  # Auto-verify OAuth users
+    )
+    new_user = await create_oauth_user(db, user_data)
+    return new_user, True
+
+
+async def add_password_to_oauth_user(db: AsyncSession, user: User, password: str) -> User:
+    """Add a password to an OAuth-only user account, hashing it in the password pool."""
+    ensure_no_password(user)
+    user.hashed_password = await password_pool.hash(password)
+    await db.commit()
+    return user
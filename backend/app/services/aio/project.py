@@ -0,0 +1,142 @@
+from datetime import datetime
+from typing import Optional, List
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+from app.models.project import Project
+from app.schemas.project import ProjectBatchUpdateItem, ProjectCreate, ProjectSearchResult, ProjectUpdate
+from app.services.project import (
+    OWNED_PROJECT,
+    batch_delete_statement,
+    batch_update_statement,
+    delete_owned_project_statement,
+    owned_project_exists_statement,
+    precondition_failed_error,
+    project_access_error,
+    project_exists_statement,
+    projects_page,
+    search_results,
+    search_statement,
+    update_owned_project_statement,
+)
+
+
+async def _access_error(db: AsyncSession, project_id: int) -> HTTPException:
+    return project_access_error(await db.scalar(project_exists_statement(project_id)))
+
+
+async def _update_error(
+    db: AsyncSession,
+    project_id: int,
+    owner_id: int,
+    versions: Optional[List[datetime]]
+) -> HTTPException:
+    if versions is not None and await db.scalar(owned_project_exists_statement(project_id, owner_id)):
+        return precondition_failed_error()
+    return await _access_error(db, project_id)
+
+
+async def get_project(db: AsyncSession, project_id: int, owner_id: int) -> Project:
+    """Get a project owned by owner_id; 404 if it does not exist, 403 if it is someone else's."""
+    result = await db.scalars(OWNED_PROJECT, {"project_id": project_id, "owner_id": owner_id})
+    project = result.first()
+    if project is None:
+        raise await _access_error(db, project_id)
+    return project
+
+
+async def get_projects(
+    db: AsyncSession,
+    owner_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> List[Project]:
+    """Get list of projects, optionally filtered by owner, oldest first; a cursor replaces skip."""
+    stmt, params = projects_page(owner_id, skip, limit, cursor)
+    result = await db.scalars(stmt, params)
+    return list(result)
+
+
+async def create_project(db: AsyncSession, project: ProjectCreate, owner_id: int) -> Project:
+    """Create a new project."""
+    db_project = Project(
+        **project.model_dump(),
+        owner_id=owner_id
+    )
+    db.add(db_project)
+    await db.commit()
+    return db_project
+
+
+async def update_project(
+    db: AsyncSession,
+    project_id: int,
+    owner_id: int,
+    project_update: ProjectUpdate,
+    versions: Optional[List[datetime]] = None
+) -> Project:
+    """Update a project owned by owner_id in one UPDATE ... RETURNING; errors and versions as the sync update_project."""
+    update_data = project_update.model_dump(exclude_unset=True)
+    if not update_data:
+        project = await get_project(db, project_id, owner_id)
+        if versions is not None and project.updated_at not in versions:
+            raise precondition_failed_error()
+        return project
+
+    result = await db.scalars(update_owned_project_statement(project_id, owner_id, update_data, versions))
+    project = result.first()
+    if project is None:
+        error = await _update_error(db, project_id, owner_id, versions)
+        await db.rollback()
+        raise error
+    await db.commit()
+    return project
+
+
+async def delete_project(db: AsyncSession, project_id: int, owner_id: int) -> None:
+    """Delete a project owned by owner_id in one DELETE ... RETURNING; errors as get_project."""
+    if await db.scalar(delete_owned_project_statement(project_id, owner_id)) is None:
+        error = await _access_error(db, project_id)
+        await db.rollback()
+        raise error
+    await db.commit()
+
+
+async def create_projects(db: AsyncSession, projects: List[ProjectCreate], owner_id: int) -> List[Project]:
+    """Create projects with a multi-row INSERT ... RETURNING in one transaction, in input order."""
+    result = await db.scalars(
+        insert(Project).returning(Project, sort_by_parameter_order=True),
+        [{**project.model_dump(), "owner_id": owner_id} for project in projects],
+    )
+    created = result.all()
+    await db.commit()
+    return created
+
+
+async def update_projects(db: AsyncSession, items: List[ProjectBatchUpdateItem], owner_id: int) -> dict[int, Project]:
+    """Update projects in one statement and transaction; returns the updated ones by id."""
+    result = await db.scalars(batch_update_statement(items, owner_id))
+    updated = {project.id: project for project in result}
+    await db.commit()
+    return updated
+
+
+async def delete_projects(db: AsyncSession, project_ids: List[int], owner_id: int) -> set[int]:
+    """Delete projects in one statement and transaction; returns the deleted ids."""
+    result = await db.scalars(batch_delete_statement(project_ids, owner_id))
+    deleted = set(result)
+    await db.commit()
+    return deleted
+
+
+async def search_projects(
+    db: AsyncSession,
+    owner_id: int,
+    q: str,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> List[ProjectSearchResult]:
+    """Full-text search over an owner's projects, best match first."""
+    result = await db.execute(search_statement(owner_id, q, limit, cursor))
+    return search_results(result.all())
@@ -0,0 +1,67 @@
+"""Async refresh token rotation and revocation (see app.services.refresh_token).
+
+Uses the same statements and the same in-process revocation filter as the sync
+service, so a revocation seen by either is known to both.
+"""
+
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import create_refresh_token
+from app.models.refresh_token import RevokedRefreshToken
+from app.services import refresh_token
+from app.services.refresh_token import FAMILY, TOKEN, consume_statement, invalid_refresh_token, revoke_statement
+
+logger = logging.getLogger(__name__)
+
+
+async def _revoke(db: AsyncSession, revoked_id: str, kind: str, payload: dict) -> bool:
+    """Record a revocation; returns False if the id was already revoked."""
+    inserted = (await db.execute(revoke_statement(revoked_id, kind, payload))).scalar() is not None
+    await db.commit()
+    refresh_token.revocation_filter.add(revoked_id)
+    return inserted
+
+
+async def _consume(db: AsyncSession, payload: dict) -> bool:
+    """Record the token as used; False if it was used or its family revoked."""
+    consumed = (await db.execute(consume_statement(payload))).scalar() is not None
+    await db.commit()
+    refresh_token.revocation_filter.add(payload["jti"])
+    return consumed
+
+
+async def _is_revoked(db: AsyncSession, revoked_id: str) -> bool:
+    revocation_filter = refresh_token.revocation_filter
+    if not revocation_filter.might_contain(revoked_id):
+        return False
+    if revoked_id in revocation_filter.recent:
+        return True
+    return await db.get(RevokedRefreshToken, revoked_id) is not None
+
+
+async def is_revoked(db: AsyncSession, payload: dict) -> bool:
+    """Check whether a refresh token, or its family, is known to be revoked (see the sync is_revoked)."""
+    return await _is_revoked(db, payload["jti"]) or await _is_revoked(db, payload["fam"])
+
+
+async def revoke_family(db: AsyncSession, payload: dict) -> None:
+    """Revoke every token descended from the same login (logout, or detected reuse)."""
+    await _revoke(db, payload["jti"], TOKEN, payload)
+    await _revoke(db, payload["fam"], FAMILY, payload)
+
+
+async def rotate(db: AsyncSession, payload: dict) -> str:
+    """
+    Consume a refresh token and issue its successor in the same family.
+
+    Raises 401 and revokes the family if the token was already consumed or its
+    family was revoked, by this worker or any other.
+    """
+    if await is_revoked(db, payload) or not await _consume(db, payload):
+        logger.warning(f"Revoked or reused refresh token for user {payload['sub']}, revoking family")
+        await revoke_family(db, payload)
+        raise invalid_refresh_token
+
+    return create_refresh_token(subject=payload["sub"], family=payload["fam"])
@@ -0,0 +1,223 @@
+import time
+from typing import Optional, List
+from datetime import datetime
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+from app.models.user import User
+from app.schemas.user import UserCreate, UserUpdate
+from app.core.security import password_needs_rehash
+from app.core.config import settings
+from app.core.constants import OAuthProvider, UserRole
+from app.core.pagination import keyset
+from app.core.password_pool import password_pool
+from app.services import user_cache
+from app.services.user import (
+    USER_BY_EMAIL,
+    USER_BY_ID,
+    USER_COUNTERS_QUERY,
+    USER_STATS_QUERY,
+    bump_state_version,
+    user_search_statement,
+    user_stats_cache,
+)
+
+
+async def get_user(db: AsyncSession, user_id: int) -> Optional[User]:
+    """Get user by ID."""
+    result = await db.scalars(USER_BY_ID, {"user_id": user_id})
+    return result.first()
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    """Get user by email, case-insensitively (excludes deleted users)."""
+    result = await db.scalars(USER_BY_EMAIL, {"email": email.lower()})
+    return result.first()
+
+
+async def get_users(
+    db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[User]:
+    """Get list of users (excludes deleted users), oldest first; a cursor replaces skip."""
+    order_by, after = keyset(User, cursor)
+    stmt = select(User).where(User.is_deleted == False).order_by(*order_by)
+    stmt = stmt.where(after) if after is not None else stmt.offset(skip)
+    result = await db.scalars(stmt.limit(limit))
+    return list(result)
+
+
+async def create_user(db: AsyncSession, user: UserCreate) -> User:
+    """Create a new user, hashing the password in the hashing pool."""
+    db_user = User(
+        email=user.email,
+        hashed_password=await password_pool.hash(user.password),
+        full_name=user.full_name,
+    )
+    db.add(db_user)
+    await db.commit()
+    return db_user
+
+
+async def update_user(db: AsyncSession, user: User, user_update: UserUpdate) -> User:
+    """Update a user."""
+    update_data = user_update.model_dump(exclude_unset=True)
+
+    if "password" in update_data:
+        update_data["hashed_password"] = await password_pool.hash(update_data.pop("password"))
+
+    for field, value in update_data.items():
+        setattr(user, field, value)
+
+    if "is_active" in update_data:
+        bump_state_version(user)
+
+    db.add(user)
+    await db.commit()
+    user_cache.invalidate(user.id)
+    return user
+
+
+async def delete_user(db: AsyncSession, user: User) -> User:
+    """Delete a user."""
+    await db.delete(user)
+    await db.commit()
+    user_cache.invalidate(user.id)
+    return user
+
+
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    """Authenticate a user with email and password."""
+    user = await get_user_by_email(db, email)
+    if not user:
+        return None
+
+    # OAuth-only users don't have passwords
+    if not user.hashed_password:
+        return None
+
+    if not await password_pool.verify(password, user.hashed_password):
+        return None
+
+    if password_needs_rehash(user.hashed_password):
+        await set_password_hash(db, user, await password_pool.hash(password))
+
+    return user
+
+
+async def set_password_hash(db: AsyncSession, user: User, hashed_password: str) -> User:
+    """Replace a user's stored hash, e.g. after the bcrypt cost was changed."""
+    user.hashed_password = hashed_password
+    db.add(user)
+    await db.commit()
+    return user
+
+
+# Admin service functions
+
+async def count_active_admins(db: AsyncSession) -> int:
+    """Count active admin users (not deleted, not deactivated)."""
+    return await db.scalar(
+        select(func.count()).select_from(User).where(
+            User.role == UserRole.ADMIN,
+            User.is_active == True,
+            User.is_deleted == False
+        )
+    )
+
+
+async def get_users_with_filters(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    include_deleted: bool = False,
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+    role: Optional[UserRole] = None,
+    is_active: Optional[bool] = None,
+    oauth_provider: Optional[OAuthProvider] = None
+) -> List[User]:
+    """Search and filter users (see user_search_statement), oldest first; a cursor replaces skip."""
+    stmt = user_search_statement(q, role, is_active, oauth_provider, include_deleted, cursor)
+    if cursor is None:
+        stmt = stmt.offset(skip)
+    result = await db.scalars(stmt.limit(limit))
+    return list(result)
+
+
+async def _save_status_change(db: AsyncSession, user: User) -> User:
+    bump_state_version(user)
+    db.add(user)
+    await db.commit()
+    user_cache.invalidate(user.id)
+    return user
+
+
+async def deactivate_user(db: AsyncSession, user: User, admin_user) -> User:
+    """Deactivate user. Validation: Cannot deactivate self."""
+    if user.id == admin_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot deactivate your own account"
+        )
+
+    user.is_active = False
+    return await _save_status_change(db, user)
+
+
+async def activate_user(db: AsyncSession, user: User) -> User:
+    """Activate user."""
+    user.is_active = True
+    return await _save_status_change(db, user)
+
+
+async def change_user_role(db: AsyncSession, user: User, new_role: UserRole, admin_user) -> User:
+    """Change user role. Validation: Cannot change own role, check last admin."""
+    if user.id == admin_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot change your own role"
+        )
+
+    # If demoting from admin, check if this is the last admin
+    if user.role == UserRole.ADMIN and new_role == UserRole.USER:
+        if await count_active_admins(db) <= 1:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot demote the last admin user"
+            )
+
+    user.role = new_role
+    return await _save_status_change(db, user)
+
+
+async def soft_delete_user(db: AsyncSession, user: User, admin_user) -> User:
+    """Soft delete user. Validation: Cannot delete self or last admin."""
+    if user.id == admin_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot delete your own account"
+        )
+
+    # If deleting an admin, check if this is the last admin
+    if user.role == UserRole.ADMIN:
+        if await count_active_admins(db) <= 1:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot delete the last admin user"
+            )
+
+    user.is_deleted = True
+    user.deleted_at = datetime.utcnow()
+    return await _save_status_change(db, user)
+
+
+async def get_user_stats(db: AsyncSession) -> dict:
+    """Get user statistics for admin dashboard (see user_service.get_user_stats)."""
+    stats = user_stats_cache.get("stats")
+    if stats is None:
+        row = (await db.execute(USER_COUNTERS_QUERY)).first() if settings.USER_STATS_COUNTERS else None
+        if row is None:
+            row = (await db.execute(USER_STATS_QUERY)).one()
+        stats = dict(row._mapping)
+        user_stats_cache.set("stats", stats, expires_at=time.time() + settings.USER_STATS_CACHE_SECONDS)
+    return dict(stats)
@@ -0,0 +1,149 @@
+"""Archival of soft-deleted users.
+
+Users soft-deleted more than ARCHIVE_AFTER_DAYS ago are moved, together with
+their projects, from users/projects into archived_users/archived_projects, so
+the hot tables and their indexes only hold rows the application still reads.
+
+Each batch is one statement in its own short transaction: it locks up to
+batch_size deleted users (skipping rows another transaction holds), moves their
+projects, then moves the users. lock_timeout keeps a batch from queueing behind
+application writes, and a pause between batches leaves the database headroom.
+The job keeps no state of its own: archived rows leave the hot tables as each
+batch commits, so a run that stops part way is resumed by simply running again.
+An advisory lock keeps concurrent runs (CLI, schedulers in several workers)
+from working at the same time.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from starlette.concurrency import run_in_threadpool
+
+from app.models.archive import ArchivedProject, ArchivedUser
+
+logger = logging.getLogger(__name__)
+
+LOCK_KEY = "archive_deleted_users"
+LOCK_NOT_AVAILABLE = "55P03"
+MAX_LOCK_RETRIES = 3
+
+
+def _columns(model, alias: str = "") -> str:
+    prefix = f"{alias}." if alias else ""
+    return ", ".join(prefix + column.name for column in model.__table__.c if column.name != "archived_at")
+
+
+USER_COLUMNS = _columns(ArchivedUser)
+PROJECT_COLUMNS = _columns(ArchivedProject)
+
+# Projects are deleted in a sibling CTE; the projects.owner_id foreign key is
+# checked at the end of the statement, by which time they are gone.
+ARCHIVE_BATCH_SQL = f"""
+WITH batch AS (
+    SELECT id FROM users
+    WHERE is_deleted = true AND deleted_at < :cutoff
+    ORDER BY deleted_at, id
+    LIMIT :batch_size
+    FOR UPDATE SKIP LOCKED
+),
+moved_projects AS (
+    DELETE FROM projects p USING batch b
+    WHERE p.owner_id = b.id
+    RETURNING {_columns(ArchivedProject, "p")}
+),
+inserted_projects AS (
+    INSERT INTO archived_projects ({PROJECT_COLUMNS})
+    SELECT {PROJECT_COLUMNS} FROM moved_projects
+    RETURNING id
+),
+moved_users AS (
+    DELETE FROM users u USING batch b
+    WHERE u.id = b.id
+    RETURNING {_columns(ArchivedUser, "u")}
+),
+inserted_users AS (
+    INSERT INTO archived_users ({USER_COLUMNS})
+    SELECT {USER_COLUMNS} FROM moved_users
+    RETURNING id
+)
+SELECT
+    (SELECT count(*) FROM inserted_users) AS users,
+    (SELECT count(*) FROM inserted_projects) AS projects
+"""
+
+
+def archive_deleted_users(
+    bind: Engine,
+    older_than_days: int,
+    batch_size: int,
+    pause_ms: int,
+    lock_timeout_ms: int,
+    max_batches: Optional[int] = None
+) -> Optional[dict]:
+    """
+    Archive users deleted more than older_than_days ago, batch by batch.
+
+    Returns the number of batches, users and projects moved, or None when
+    another run holds the archive lock.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    report = {"batches": 0, "users": 0, "projects": 0}
+
+    with bind.connect() as conn:
+        locked = conn.execute(text("SELECT pg_try_advisory_lock(hashtext(:key))"), {"key": LOCK_KEY}).scalar()
+        conn.commit()
+        if not locked:
+            return None
+
+        try:
+            retries = 0
+            while max_batches is None or report["batches"] < max_batches:
+                try:
+                    conn.execute(text(f"SET LOCAL lock_timeout = '{int(lock_timeout_ms)}ms'"))
+                    users, projects = conn.execute(
+                        text(ARCHIVE_BATCH_SQL), {"cutoff": cutoff, "batch_size": batch_size}
+                    ).one()
+                    conn.commit()
+                except OperationalError as e:
+                    conn.rollback()
+                    if getattr(e.orig, "pgcode", None) != LOCK_NOT_AVAILABLE or retries >= MAX_LOCK_RETRIES:
+                        raise
+                    # A live transaction holds a project row; back off and try again
+                    retries += 1
+                    time.sleep(max(pause_ms, 100) * 2 ** retries / 1000)
+                    continue
+
+                retries = 0
+                if not users:
+                    break
+                report["batches"] += 1
+                report["users"] += users
+                report["projects"] += projects
+                if pause_ms:
+                    time.sleep(pause_ms / 1000)
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(hashtext(:key))"), {"key": LOCK_KEY})
+            conn.commit()
+
+    return report
+
+
+async def run_periodically(bind: Engine, interval_hours: float, **options) -> None:
+    """Run archive_deleted_users every interval_hours until cancelled (started from the app lifespan)."""
+    while True:
+        await asyncio.sleep(interval_hours * 3600)
+        try:
+            report = await run_in_threadpool(archive_deleted_users, bind, **options)
+        except Exception as e:
+            logger.error(f"Archiving deleted users failed: {e}")
+            continue
+        if report is None:
+            logger.info("Archiving deleted users skipped: another run holds the lock")
+        else:
+            logger.info(f"Archived deleted users: {report}")
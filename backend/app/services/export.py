@@ -0,0 +1,111 @@
+"""Streaming CSV/NDJSON export of users and projects.
+
+Rows are read as plain column tuples through a server-side cursor (yield_per)
+and encoded one batch at a time, so memory stays flat regardless of table size
+and the first batch is sent as soon as the database returns it.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import AsyncIterator, Iterable, Iterator, Optional
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.session import replica_reads
+from app.models.project import Project
+from app.models.user import User
+
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+USER_COLUMNS = (
+    User.id,
+    User.email,
+    User.full_name,
+    User.role,
+    User.is_active,
+    User.is_verified,
+    User.is_deleted,
+    User.oauth_provider,
+    User.created_at,
+    User.updated_at,
+    User.deleted_at,
+)
+
+PROJECT_COLUMNS = (
+    Project.id,
+    Project.title,
+    Project.description,
+    Project.owner_id,
+    Project.created_at,
+    Project.updated_at,
+)
+
+
+def users_statement(include_deleted: bool = False) -> Select:
+    """All users in (created_at, id) order, matching the listing endpoints."""
+    stmt = select(*USER_COLUMNS).order_by(User.created_at, User.id)
+    if not include_deleted:
+        stmt = stmt.where(User.is_deleted == False)
+    return stmt
+
+
+def projects_statement(owner_id: Optional[int] = None) -> Select:
+    """Projects in (created_at, id) order, optionally for one owner."""
+    stmt = select(*PROJECT_COLUMNS).order_by(Project.created_at, Project.id)
+    if owner_id is not None:
+        stmt = stmt.where(Project.owner_id == owner_id)
+    return stmt
+
+
+def _plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def header(stmt: Select, fmt: str) -> str:
+    """Text that starts the export (the CSV header row; nothing for NDJSON)."""
+    if fmt != "csv":
+        return ""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(stmt.selected_columns.keys())
+    return buffer.getvalue()
+
+
+def encode_batch(rows: Iterable, fmt: str) -> str:
+    """Encode one batch of result rows as CSV lines or NDJSON objects."""
+    if fmt == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows([_plain(value) for value in row] for row in rows)
+        return buffer.getvalue()
+    return "".join(
+        json.dumps({key: _plain(value) for key, value in row._mapping.items()}) + "\n" for row in rows
+    )
+
+
+def stream_export(db: Session, stmt: Select, fmt: str, batch_size: int) -> Iterator[str]:
+    """Yield the export as text chunks, one per batch, read from a replica when available."""
+    head = header(stmt, fmt)
+    if head:
+        yield head
+    with replica_reads(db):
+        result = db.execute(stmt.execution_options(yield_per=batch_size))
+        for batch in result.partitions():
+            yield encode_batch(batch, fmt)
+
+
+async def stream_export_async(db: AsyncSession, stmt: Select, fmt: str, batch_size: int) -> AsyncIterator[str]:
+    """Async variant of stream_export for the asyncpg engine."""
+    head = header(stmt, fmt)
+    if head:
+        yield head
+    result = await db.stream(stmt.execution_options(yield_per=batch_size))
+    async for batch in result.partitions():
+        yield encode_batch(batch, fmt)
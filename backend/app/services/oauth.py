@@ -7,7 +7,7 @@ from fastapi import HTTPException, status
 from app.models.user import User
 from app.schemas.user import UserCreateOAuth
 from app.core.constants import OAuthProvider
-from app.core.security import get_password_hash
+from app.services.user import USER_BY_EMAIL
 from datetime import datetime
 
 
@@ -26,12 +26,8 @@ def get_user_by_oauth(
 
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
-    """Get user by email (excluding deleted users)."""
-    return (
-        db.query(User)
-        .filter(User.email == email, User.is_deleted == False)
-        .first()
-    )
+    """Get user by email, case-insensitively (excluding deleted users)."""
+    return db.scalars(USER_BY_EMAIL, {"email": email.lower()}).first()
 
 
 def create_oauth_user(db: Session, user_data: UserCreateOAuth) -> User:
@@ -48,7 +44,6 @@ def create_oauth_user(db: Session, user_data: UserCreateOAuth) -> User:
     )
     db.add(db_user)
     db.commit()
-    db.refresh(db_user)
     return db_user
 
 
@@ -73,7 +68,6 @@ def link_oauth_to_existing_user(
         user.is_verified = True
 
     db.commit()
-    db.refresh(user)
     return user
 
 
@@ -154,16 +148,18 @@ def handle_oauth_login(
     return new_user, True
 
 
-def add_password_to_oauth_user(db: Session, user: User, password: str) -> User:
-    """Add a password to an OAuth-only user account."""
+def ensure_no_password(user: User) -> None:
+    """Reject adding a password to an account that already has one."""
     if user.hashed_password:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="This account already has a password. Use the password reset flow to change it.",
         )
 
-    # Hash and set the password
-    user.hashed_password = get_password_hash(password)
+
+def add_password_to_oauth_user(db: Session, user: User, hashed_password: str) -> User:
+    """Add a password, hashed by the caller (see password_pool), to an OAuth-only user account."""
+    ensure_no_password(user)
+    user.hashed_password = hashed_password
     db.commit()
-    db.refresh(user)
     return user
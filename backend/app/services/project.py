@@ -1,20 +1,166 @@
+import html
+from datetime import datetime
 from typing import Optional, List
+from sqlalchemy import (
+    ARRAY,
+    Boolean,
+    Integer,
+    REAL,
+    String,
+    Text,
+    any_,
+    bindparam,
+    case,
+    cast,
+    delete,
+    exists,
+    func,
+    insert,
+    literal_column,
+    select,
+    tuple_,
+    update,
+)
 from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from app.core.pagination import cursor_params, decode_rank_cursor, keyset_after
+from app.db.session import replica_reads
 from app.models.project import Project
-from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.schemas.project import ProjectBatchUpdateItem, ProjectCreate, ProjectSearchResult, ProjectUpdate
 
 
-def get_project(db: Session, project_id: int) -> Optional[Project]:
-    """Get project by ID."""
-    return db.query(Project).filter(Project.id == project_id).first()
+# Single-project reads and writes are scoped to the owner in SQL. A miss is
+# followed by an existence probe only to tell "not found" (404) from "not yours" (403).
 
+# Hot reads are built once with bind parameters: executing a prebuilt statement
+# skips query construction, and its key into the engine's compiled cache is
+# computed once instead of on every call.
+OWNED_PROJECT = select(Project).where(
+    Project.id == bindparam("project_id"),
+    Project.owner_id == bindparam("owner_id")
+)
 
-def get_projects(db: Session, owner_id: Optional[int] = None, skip: int = 0, limit: int = 100) -> List[Project]:
-    """Get list of projects, optionally filtered by owner."""
-    query = db.query(Project)
+
+def _projects_page(by_owner: bool, after_cursor: bool):
+    stmt = select(Project).order_by(Project.created_at, Project.id).limit(bindparam("limit"))
+    if by_owner:
+        stmt = stmt.where(Project.owner_id == bindparam("owner_id"))
+    return stmt.where(keyset_after(Project)) if after_cursor else stmt.offset(bindparam("skip"))
+
+
+# get_projects statements by (filtered by owner, continuing from a cursor)
+PROJECT_PAGES = {
+    (by_owner, after): _projects_page(by_owner, after)
+    for by_owner in (False, True)
+    for after in (False, True)
+}
+
+
+def projects_page(
+    owner_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None
+):
+    """The prebuilt get_projects statement for these arguments, and its parameters."""
+    params = cursor_params(cursor) if cursor is not None else {"skip": skip}
+    params["limit"] = limit
     if owner_id is not None:
-        query = query.filter(Project.owner_id == owner_id)
-    return query.offset(skip).limit(limit).all()
+        params["owner_id"] = owner_id
+    return PROJECT_PAGES[owner_id is not None, cursor is not None], params
+
+
+def update_owned_project_statement(
+    project_id: int,
+    owner_id: int,
+    values: dict,
+    versions: Optional[List[datetime]] = None
+):
+    """UPDATE ... RETURNING the project if owner_id owns it and, when versions is given, it is at one of them."""
+    stmt = update(Project).where(Project.id == project_id, Project.owner_id == owner_id)
+    if versions is not None:
+        stmt = stmt.where(Project.updated_at.in_(versions))
+    return (
+        stmt
+        # updated_at is set here rather than left to onupdate so that "fetch" expires it
+        # on an instance already in the session, letting RETURNING load the new value
+        .values(**values, updated_at=func.now())
+        .returning(Project)
+        .execution_options(synchronize_session="fetch")
+    )
+
+
+def delete_owned_project_statement(project_id: int, owner_id: int):
+    """DELETE ... RETURNING id of the project if owner_id owns it."""
+    return (
+        delete(Project)
+        .where(Project.id == project_id, Project.owner_id == owner_id)
+        .returning(Project.id)
+        .execution_options(synchronize_session="fetch")
+    )
+
+
+def project_exists_statement(project_id: int):
+    return select(exists().where(Project.id == project_id))
+
+
+def owned_project_exists_statement(project_id: int, owner_id: int):
+    return select(exists().where(Project.id == project_id, Project.owner_id == owner_id))
+
+
+def precondition_failed_error() -> HTTPException:
+    """Error for a conditional write whose If-Match no longer matches the project."""
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="Project has been modified"
+    )
+
+
+def project_access_error(exists: bool) -> HTTPException:
+    """Error for a project the owner-scoped statement did not match."""
+    if exists:
+        return HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Project not found"
+    )
+
+
+def _access_error(db: Session, project_id: int) -> HTTPException:
+    return project_access_error(db.scalar(project_exists_statement(project_id)))
+
+
+def _update_error(db: Session, project_id: int, owner_id: int, versions: Optional[List[datetime]]) -> HTTPException:
+    if versions is not None and db.scalar(owned_project_exists_statement(project_id, owner_id)):
+        return precondition_failed_error()
+    return _access_error(db, project_id)
+
+
+def get_project(db: Session, project_id: int, owner_id: int) -> Project:
+    """Get a project owned by owner_id; 404 if it does not exist, 403 if it is someone else's."""
+    project = db.scalars(OWNED_PROJECT, {"project_id": project_id, "owner_id": owner_id}).first()
+    if project is None:
+        raise _access_error(db, project_id)
+    return project
+
+
+def get_projects(
+    db: Session,
+    owner_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> List[Project]:
+    """
+    Get list of projects, optionally filtered by owner, oldest first; a cursor replaces skip.
+    Served from a replica when available.
+    """
+    stmt, params = projects_page(owner_id, skip, limit, cursor)
+    with replica_reads(db):
+        return list(db.scalars(stmt, params))
 
 
 def create_project(db: Session, project: ProjectCreate, owner_id: int) -> Project:
@@ -25,25 +171,181 @@ def create_project(db: Session, project: ProjectCreate, owner_id: int) -> Projec
     )
     db.add(db_project)
     db.commit()
-    db.refresh(db_project)
     return db_project
 
 
-def update_project(db: Session, project: Project, project_update: ProjectUpdate) -> Project:
-    """Update a project."""
+def update_project(
+    db: Session,
+    project_id: int,
+    owner_id: int,
+    project_update: ProjectUpdate,
+    versions: Optional[List[datetime]] = None
+) -> Project:
+    """
+    Update a project owned by owner_id in one UPDATE ... RETURNING; errors as get_project.
+    With versions (from If-Match), the update only applies while updated_at is one of
+    them, and fails with 412 once the project has been written since.
+    """
     update_data = project_update.model_dump(exclude_unset=True)
+    if not update_data:
+        project = get_project(db, project_id, owner_id)
+        if versions is not None and project.updated_at not in versions:
+            raise precondition_failed_error()
+        return project
 
-    for field, value in update_data.items():
-        setattr(project, field, value)
-
-    db.add(project)
+    project = db.scalars(update_owned_project_statement(project_id, owner_id, update_data, versions)).first()
+    if project is None:
+        error = _update_error(db, project_id, owner_id, versions)
+        db.rollback()
+        raise error
     db.commit()
-    db.refresh(project)
     return project
 
 
-def delete_project(db: Session, project: Project) -> Project:
-    """Delete a project."""
-    db.delete(project)
+def delete_project(db: Session, project_id: int, owner_id: int) -> None:
+    """Delete a project owned by owner_id in one DELETE ... RETURNING; errors as get_project."""
+    if db.scalar(delete_owned_project_statement(project_id, owner_id)) is None:
+        error = _access_error(db, project_id)
+        db.rollback()
+        raise error
     db.commit()
-    return project
+
+
+# Batch writes: one statement per batch, with ownership checked in its WHERE clause
+
+def _array(items: list, type_):
+    return bindparam(None, items, type_=ARRAY(type_))
+
+
+def batch_update_statement(items: List[ProjectBatchUpdateItem], owner_id: int):
+    """
+    UPDATE ... FROM unnest(...) RETURNING that applies each item's set fields to
+    the rows owner_id owns. The batch travels as five typed arrays, so the
+    statement is the same whatever the batch size.
+    """
+    batch = func.unnest(
+        _array([item.id for item in items], Integer),
+        _array(["title" in item.model_fields_set for item in items], Boolean),
+        _array([item.title for item in items], String),
+        _array(["description" in item.model_fields_set for item in items], Boolean),
+        _array([item.description for item in items], Text),
+    ).table_valued("id", "set_title", "title", "set_description", "description").render_derived(name="batch")
+    return (
+        update(Project)
+        .where(Project.id == batch.c.id, Project.owner_id == owner_id)
+        .values(
+            title=case((batch.c.set_title, batch.c.title), else_=Project.title),
+            description=case((batch.c.set_description, batch.c.description), else_=Project.description),
+        )
+        .returning(Project)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def batch_delete_statement(project_ids: List[int], owner_id: int):
+    """DELETE ... RETURNING id for the given projects that owner_id owns."""
+    return (
+        delete(Project)
+        .where(Project.id == any_(_array(project_ids, Integer)), Project.owner_id == owner_id)
+        .returning(Project.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def create_projects(db: Session, projects: List[ProjectCreate], owner_id: int) -> List[Project]:
+    """Create projects with a multi-row INSERT ... RETURNING in one transaction, in input order."""
+    created = db.scalars(
+        insert(Project).returning(Project, sort_by_parameter_order=True),
+        [{**project.model_dump(), "owner_id": owner_id} for project in projects],
+    ).all()
+    db.commit()
+    return created
+
+
+def update_projects(db: Session, items: List[ProjectBatchUpdateItem], owner_id: int) -> dict[int, Project]:
+    """Update projects in one statement and transaction; returns the updated ones by id."""
+    updated = {project.id: project for project in db.scalars(batch_update_statement(items, owner_id))}
+    db.commit()
+    return updated
+
+
+def delete_projects(db: Session, project_ids: List[int], owner_id: int) -> set[int]:
+    """Delete projects in one statement and transaction; returns the deleted ids."""
+    deleted = set(db.scalars(batch_delete_statement(project_ids, owner_id)))
+    db.commit()
+    return deleted
+
+
+# Full-text search
+
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+
+# ts_headline marks matches with control characters, so the snippet can be
+# HTML-escaped before the markers become <mark> tags
+_MARK_START, _MARK_STOP = "\x02", "\x03"
+HEADLINE_OPTIONS = f"StartSel={_MARK_START}, StopSel={_MARK_STOP}, MaxWords=35, MinWords=15"
+
+
+def search_statement(owner_id: int, q: str, limit: int, cursor: Optional[str] = None):
+    """
+    Owner's projects matching q (web search syntax), best match first.
+
+    The page is picked from the GIN index and ranked in a subquery; only the
+    rows on the page get the comparatively expensive ts_headline snippets.
+    """
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    rank = func.ts_rank_cd(Project.search_vector, query)
+
+    page = (
+        select(Project.id, rank.label("rank"))
+        .where(Project.owner_id == owner_id, Project.search_vector.bool_op("@@")(query))
+        .order_by(rank.desc(), Project.id.desc())
+        .limit(limit)
+    )
+    if cursor is not None:
+        # ts_rank_cd returns real; comparing it with the cursor's float8 would
+        # widen the rank instead, and a tied rank would no longer equal itself
+        cursor_rank, cursor_id = decode_rank_cursor(cursor)
+        page = page.where(tuple_(rank, Project.id) < tuple_(cast(cursor_rank, REAL), cursor_id))
+    page = page.subquery()
+
+    return (
+        select(
+            Project,
+            page.c.rank,
+            func.ts_headline(SEARCH_CONFIG, Project.title, query, HEADLINE_OPTIONS).label("title_highlight"),
+            func.ts_headline(
+                SEARCH_CONFIG, func.coalesce(Project.description, ""), query, HEADLINE_OPTIONS
+            ).label("description_highlight"),
+        )
+        .join(page, page.c.id == Project.id)
+        .order_by(page.c.rank.desc(), Project.id.desc())
+    )
+
+
+def highlight(snippet: Optional[str]) -> Optional[str]:
+    """HTML-escape a ts_headline snippet and turn its match markers into <mark> tags."""
+    if not snippet:
+        return None
+    return html.escape(snippet).replace(_MARK_START, "<mark>").replace(_MARK_STOP, "</mark>")
+
+
+def search_results(rows) -> List[ProjectSearchResult]:
+    """Build response items from search_statement rows."""
+    return [
+        ProjectSearchResult.from_row(project, rank, highlight(title) or "", highlight(description))
+        for project, rank, title, description in rows
+    ]
+
+
+def search_projects(
+    db: Session,
+    owner_id: int,
+    q: str,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> List[ProjectSearchResult]:
+    """Full-text search over an owner's projects, best match first."""
+    with replica_reads(db):
+        rows = db.execute(search_statement(owner_id, q, limit, cursor)).all()
+    return search_results(rows)
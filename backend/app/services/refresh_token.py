@@ -0,0 +1,177 @@
+"""Refresh token rotation and revocation.
+
+Every refresh consumes the presented token: its jti is recorded as revoked and a new
+token from the same family is issued. Presenting a consumed token again means it
+was stolen or replayed, so the whole family is revoked. Logout revokes the family.
+
+Consuming a token is a single INSERT on the primary key that only inserts while
+the token's family is not revoked, so the database settles both "already used"
+and "family revoked" even when another worker did the revoking. In front of it,
+a Bloom filter of revoked ids (rebuilt from the table at startup) plus a small
+exact set of ids revoked by this process reject most replays from memory; the
+filter only ever knows about some revocations, so it can reject early but never
+accept on its own.
+"""
+
+import logging
+from datetime import datetime, timezone
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, exists, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.core.security import create_refresh_token
+from app.models.refresh_token import RevokedRefreshToken
+
+logger = logging.getLogger(__name__)
+
+TOKEN = "token"
+FAMILY = "family"
+
+
+class RevocationFilter:
+    """Bloom filter of revoked ids plus the exact ids revoked since the last rebuild."""
+
+    def __init__(self, capacity: int):
+        self.bloom = BloomFilter(capacity)
+        self.recent: set[str] = set()
+
+    def add(self, revoked_id: str) -> None:
+        self.bloom.add(revoked_id)
+        self.recent.add(revoked_id)
+
+    def might_contain(self, revoked_id: str) -> bool:
+        return revoked_id in self.bloom
+
+    def rebuild(self, revoked_ids) -> None:
+        self.bloom.clear()
+        self.recent.clear()
+        for revoked_id in revoked_ids:
+            self.bloom.add(revoked_id)
+        if self.bloom.count > self.bloom.capacity:
+            logger.warning(
+                f"{self.bloom.count} revoked refresh tokens exceed the filter capacity "
+                f"({self.bloom.capacity}); raise REFRESH_TOKEN_FILTER_CAPACITY"
+            )
+
+    def stats(self) -> dict:
+        return {
+            "filter_items": self.bloom.count,
+            "filter_capacity": self.bloom.capacity,
+            "recent_items": len(self.recent),
+        }
+
+
+revocation_filter = RevocationFilter(settings.REFRESH_TOKEN_FILTER_CAPACITY)
+
+invalid_refresh_token = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Invalid refresh token",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+
+def _expires_at(payload: dict) -> datetime:
+    return datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+
+
+def revoke_statement(revoked_id: str, kind: str, payload: dict):
+    """INSERT recording a revocation, returning the id only if it was not already revoked."""
+    return (
+        insert(RevokedRefreshToken)
+        .values(id=revoked_id, kind=kind, user_id=int(payload["sub"]), expires_at=_expires_at(payload))
+        .on_conflict_do_nothing(index_elements=["id"])
+        .returning(RevokedRefreshToken.id)
+    )
+
+
+def consume_statement(payload: dict):
+    """
+    INSERT recording the token as used unless it already was or its family has
+    been revoked, in one statement; returns the jti only if it was consumed.
+    """
+    family_revoked = exists().where(RevokedRefreshToken.id == payload["fam"])
+    row = select(
+        literal(payload["jti"], RevokedRefreshToken.id.type),
+        literal(TOKEN, RevokedRefreshToken.kind.type),
+        literal(int(payload["sub"]), RevokedRefreshToken.user_id.type),
+        literal(_expires_at(payload), RevokedRefreshToken.expires_at.type),
+    ).where(~family_revoked)
+    return (
+        insert(RevokedRefreshToken)
+        .from_select(["id", "kind", "user_id", "expires_at"], row)
+        .on_conflict_do_nothing(index_elements=["id"])
+        .returning(RevokedRefreshToken.id)
+    )
+
+
+def _revoke(db: Session, revoked_id: str, kind: str, payload: dict) -> bool:
+    """Record a revocation; returns False if the id was already revoked."""
+    inserted = db.execute(revoke_statement(revoked_id, kind, payload)).scalar() is not None
+    db.commit()
+    revocation_filter.add(revoked_id)
+    return inserted
+
+
+def _consume(db: Session, payload: dict) -> bool:
+    """Record the token as used (see consume_statement); False if it was used or its family revoked."""
+    consumed = db.execute(consume_statement(payload)).scalar() is not None
+    db.commit()
+    revocation_filter.add(payload["jti"])
+    return consumed
+
+
+def _is_revoked(db: Session, revoked_id: str) -> bool:
+    if not revocation_filter.might_contain(revoked_id):
+        return False
+    if revoked_id in revocation_filter.recent:
+        return True
+    return db.get(RevokedRefreshToken, revoked_id) is not None
+
+
+def is_revoked(db: Session, payload: dict) -> bool:
+    """
+    Check whether a refresh token, or its family, is known to be revoked.
+
+    False only means no revocation has reached this worker's filter; rotate
+    relies on _consume for the authoritative answer.
+    """
+    return _is_revoked(db, payload["jti"]) or _is_revoked(db, payload["fam"])
+
+
+def revoke_family(db: Session, payload: dict) -> None:
+    """Revoke every token descended from the same login (logout, or detected reuse)."""
+    _revoke(db, payload["jti"], TOKEN, payload)
+    _revoke(db, payload["fam"], FAMILY, payload)
+
+
+def rotate(db: Session, payload: dict) -> str:
+    """
+    Consume a refresh token and issue its successor in the same family.
+
+    Raises 401 and revokes the family if the token was already consumed or its
+    family was revoked, by this worker or any other.
+    """
+    if is_revoked(db, payload) or not _consume(db, payload):
+        logger.warning(f"Revoked or reused refresh token for user {payload['sub']}, revoking family")
+        revoke_family(db, payload)
+        raise invalid_refresh_token
+
+    return create_refresh_token(subject=payload["sub"], family=payload["fam"])
+
+
+def rebuild_filter(db: Session) -> None:
+    """Drop expired revocations and reload the filter from the table."""
+    now = datetime.now(timezone.utc)
+    db.execute(delete(RevokedRefreshToken).where(RevokedRefreshToken.expires_at < now))
+    db.commit()
+    revocation_filter.rebuild(db.execute(select(RevokedRefreshToken.id)).scalars())
+    logger.info(f"Refresh token revocation filter loaded with {revocation_filter.bloom.count} ids")
+
+
+def stats() -> dict:
+    """Filter counters for the metrics endpoint."""
+    return revocation_filter.stats()
@@ -5,6 +5,7 @@ from app.services import user as user_service, project as project_service
 from app.schemas.user import UserCreate
 from app.schemas.project import ProjectCreate
 from app.core.config import settings
+from app.core.security import get_password_hash
 from app.core.constants import UserRole
 
 logger = logging.getLogger(__name__)
@@ -27,12 +28,13 @@ def seed_data():
                 password=settings.FIRST_SUPERUSER_PASSWORD,
                 full_name="Admin User"
             )
-            admin = user_service.create_user(db, user=admin_user)
+            admin = user_service.create_user(
+                db, user=admin_user, hashed_password=get_password_hash(admin_user.password)
+            )
             # Set admin role
             admin.role = UserRole.ADMIN
             admin.is_verified = True
             db.commit()
-            db.refresh(admin)
             logger.info(f"Admin user created: {admin.email}")
 
             # Create sample projects for admin
@@ -1,32 +1,53 @@
+import time
 from typing import Optional, List
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import String, bindparam, func, or_, select
 from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+from app.db.session import replica_reads
 from app.models.user import User
+from app.models.user_counters import UserCounters
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
-from app.core.constants import UserRole
+from app.core.security import password_needs_rehash
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.constants import OAuthProvider, UserRole
+from app.core.pagination import keyset
+from app.core.password_pool import password_pool
+from app.services import user_cache
+
+
+# Hot lookups are built once with bind parameters: executing a prebuilt statement
+# skips query construction, and its key into the engine's compiled cache is
+# computed once instead of on every call.
+USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+USER_BY_EMAIL = select(User).where(
+    func.lower(User.email) == bindparam("email", type_=String),
+    User.is_deleted == False
+)
 
 
 def get_user(db: Session, user_id: int) -> Optional[User]:
     """Get user by ID."""
-    return db.query(User).filter(User.id == user_id).first()
+    return db.scalars(USER_BY_ID, {"user_id": user_id}).first()
 
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
-    """Get user by email (excludes deleted users)."""
-    return db.query(User).filter(User.email == email, User.is_deleted == False).first()
+    """Get user by email, case-insensitively (excludes deleted users)."""
+    return db.scalars(USER_BY_EMAIL, {"email": email.lower()}).first()
 
 
-def get_users(db: Session, skip: int = 0, limit: int = 100):
-    """Get list of users (excludes deleted users)."""
-    return db.query(User).filter(User.is_deleted == False).offset(skip).limit(limit).all()
+def get_users(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    """Get list of users (excludes deleted users), oldest first; a cursor replaces skip."""
+    order_by, after = keyset(User, cursor)
+    query = db.query(User).filter(User.is_deleted == False).order_by(*order_by)
+    query = query.filter(after) if after is not None else query.offset(skip)
+    return query.limit(limit).all()
 
 
-def create_user(db: Session, user: UserCreate) -> User:
-    """Create a new user."""
-    hashed_password = get_password_hash(user.password)
+def create_user(db: Session, user: UserCreate, hashed_password: str) -> User:
+    """Create a new user with a password hashed by the caller (see password_pool)."""
     db_user = User(
         email=user.email,
         hashed_password=hashed_password,
@@ -34,25 +55,31 @@ def create_user(db: Session, user: UserCreate) -> User:
     )
     db.add(db_user)
     db.commit()
-    db.refresh(db_user)
     return db_user
 
 
-def update_user(db: Session, user: User, user_update: UserUpdate) -> User:
-    """Update a user."""
+def update_user(db: Session, user: User, user_update: UserUpdate, hashed_password: Optional[str]) -> User:
+    """
+    Update a user. hashed_password is the caller's hash of the new password
+    (see password_pool), or None when the update does not change it.
+    """
     update_data = user_update.model_dump(exclude_unset=True)
 
     if "password" in update_data:
-        hashed_password = get_password_hash(update_data["password"])
+        if hashed_password is None:
+            raise ValueError("update_user needs the hash of the new password")
         del update_data["password"]
         update_data["hashed_password"] = hashed_password
 
     for field, value in update_data.items():
         setattr(user, field, value)
 
+    if "is_active" in update_data:
+        bump_state_version(user)
+
     db.add(user)
     db.commit()
-    db.refresh(user)
+    user_cache.invalidate(user.id)
     return user
 
 
@@ -60,12 +87,13 @@ def delete_user(db: Session, user: User) -> User:
     """Delete a user."""
     db.delete(user)
     db.commit()
+    user_cache.invalidate(user.id)
     return user
 
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-    """Authenticate a user with email and password."""
-    user = get_user_by_email(db, email)
+async def authenticate_user_async(db: Session, email: str, password: str) -> Optional[User]:
+    """Authenticate a user, running bcrypt in the password hashing pool."""
+    user = await run_in_threadpool(get_user_by_email, db, email)
     if not user:
         return None
 
@@ -73,14 +101,31 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     if not user.hashed_password:
         return None
 
-    if not verify_password(password, user.hashed_password):
+    if not await password_pool.verify(password, user.hashed_password):
         return None
 
+    if password_needs_rehash(user.hashed_password):
+        hashed_password = await password_pool.hash(password)
+        await run_in_threadpool(set_password_hash, db, user, hashed_password)
+
+    return user
+
+
+def set_password_hash(db: Session, user: User, hashed_password: str) -> User:
+    """Replace a user's stored hash, e.g. after the bcrypt cost was changed."""
+    user.hashed_password = hashed_password
+    db.add(user)
+    db.commit()
     return user
 
 
 # Admin service functions
 
+def bump_state_version(user: User) -> None:
+    """Mark role/status as changed so tokens carrying an older version can be told apart."""
+    user.state_version = (user.state_version or 0) + 1
+
+
 def count_active_admins(db: Session) -> int:
     """Count active admin users (not deleted, not deactivated)."""
     return db.query(User).filter(
@@ -90,19 +135,83 @@ def count_active_admins(db: Session) -> int:
     ).count()
 
 
+# Trigram indexes can only narrow a search by at least one whole trigram
+USER_SEARCH_MIN_LENGTH = 3
+
+
+def _like_contains(q: str) -> str:
+    """LIKE pattern matching q anywhere, with q's wildcards escaped (backslash is the default escape)."""
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def user_search_statement(
+    q: Optional[str] = None,
+    role: Optional[UserRole] = None,
+    is_active: Optional[bool] = None,
+    oauth_provider: Optional[OAuthProvider] = None,
+    include_deleted: bool = False,
+    cursor: Optional[str] = None
+):
+    """
+    Admin user lookup, oldest first; returns a select(User) to add skip/limit to.
+
+    Every predicate is one an index on users can answer: q (at least
+    USER_SEARCH_MIN_LENGTH characters) is a case-insensitive substring match on
+    email or full name, or a trigram similarity match on full name, all served
+    by the gin_trgm_ops indexes; role and is_active use ix_users_role_active_live
+    and oauth_provider the leading column of ix_users_oauth_provider_provider_id.
+    """
+    order_by, after = keyset(User, cursor)
+    stmt = select(User).order_by(*order_by)
+
+    if not include_deleted:
+        stmt = stmt.where(User.is_deleted == False)
+    if q is not None:
+        q = q.strip()
+        if len(q) < USER_SEARCH_MIN_LENGTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Search must be at least {USER_SEARCH_MIN_LENGTH} characters"
+            )
+        pattern = _like_contains(q)
+        stmt = stmt.where(or_(
+            User.email.ilike(pattern),
+            User.full_name.ilike(pattern),
+            # pg_trgm similarity above pg_trgm.similarity_threshold (0.3 by default)
+            User.full_name.bool_op("%")(q),
+        ))
+    if role is not None:
+        stmt = stmt.where(User.role == role)
+    if is_active is not None:
+        stmt = stmt.where(User.is_active == is_active)
+    if oauth_provider is not None:
+        stmt = stmt.where(User.oauth_provider == oauth_provider)
+    if after is not None:
+        stmt = stmt.where(after)
+    return stmt
+
+
 def get_users_with_filters(
     db: Session,
     skip: int = 0,
     limit: int = 100,
-    include_deleted: bool = False
+    include_deleted: bool = False,
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+    role: Optional[UserRole] = None,
+    is_active: Optional[bool] = None,
+    oauth_provider: Optional[OAuthProvider] = None
 ) -> List[User]:
-    """Get users with optional deleted filter."""
-    query = db.query(User)
-
-    if not include_deleted:
-        query = query.filter(User.is_deleted == False)
-
-    return query.offset(skip).limit(limit).all()
+    """
+    Search and filter users (see user_search_statement), oldest first; a cursor replaces skip.
+    Served from a replica when available.
+    """
+    stmt = user_search_statement(q, role, is_active, oauth_provider, include_deleted, cursor)
+    if cursor is None:
+        stmt = stmt.offset(skip)
+    with replica_reads(db):
+        return list(db.scalars(stmt.limit(limit)))
 
 
 def deactivate_user(db: Session, user: User, admin_user: User) -> User:
@@ -114,18 +223,20 @@ def deactivate_user(db: Session, user: User, admin_user: User) -> User:
         )
 
     user.is_active = False
+    bump_state_version(user)
     db.add(user)
     db.commit()
-    db.refresh(user)
+    user_cache.invalidate(user.id)
     return user
 
 
 def activate_user(db: Session, user: User) -> User:
     """Activate user."""
     user.is_active = True
+    bump_state_version(user)
     db.add(user)
     db.commit()
-    db.refresh(user)
+    user_cache.invalidate(user.id)
     return user
 
 
@@ -147,9 +258,10 @@ def change_user_role(db: Session, user: User, new_role: UserRole, admin_user: Us
             )
 
     user.role = new_role
+    bump_state_version(user)
     db.add(user)
     db.commit()
-    db.refresh(user)
+    user_cache.invalidate(user.id)
     return user
 
 
@@ -172,33 +284,46 @@ def soft_delete_user(db: Session, user: User, admin_user: User) -> User:
 
     user.is_deleted = True
     user.deleted_at = datetime.utcnow()
+    bump_state_version(user)
     db.add(user)
     db.commit()
-    db.refresh(user)
+    user_cache.invalidate(user.id)
     return user
 
 
+# All dashboard counts in one pass over users
+USER_STATS_QUERY = select(
+    func.count().filter(User.is_deleted == False).label("total_users"),
+    func.count().filter(User.is_active == True, User.is_deleted == False).label("active_users"),
+    func.count().filter(User.is_active == False, User.is_deleted == False).label("inactive_users"),
+    func.count().filter(User.role == UserRole.ADMIN, User.is_deleted == False).label("admin_users"),
+    func.count().filter(User.is_deleted == True).label("deleted_users"),
+)
+
+USER_COUNTERS_QUERY = select(
+    UserCounters.total_users,
+    UserCounters.active_users,
+    UserCounters.inactive_users,
+    UserCounters.admin_users,
+    UserCounters.deleted_users,
+).where(UserCounters.id == 1)
+
+# Shared with the async service; the dashboard polls, so a few seconds of staleness is fine
+user_stats_cache = LRUCache(max_size=1)
+
+
 def get_user_stats(db: Session) -> dict:
-    """Get user statistics for admin dashboard."""
-    total_users = db.query(User).filter(User.is_deleted == False).count()
-    active_users = db.query(User).filter(
-        User.is_active == True,
-        User.is_deleted == False
-    ).count()
-    inactive_users = db.query(User).filter(
-        User.is_active == False,
-        User.is_deleted == False
-    ).count()
-    admin_users = db.query(User).filter(
-        User.role == UserRole.ADMIN,
-        User.is_deleted == False
-    ).count()
-    deleted_users = db.query(User).filter(User.is_deleted == True).count()
-
-    return {
-        "total_users": total_users,
-        "active_users": active_users,
-        "inactive_users": inactive_users,
-        "admin_users": admin_users,
-        "deleted_users": deleted_users
-    }
+    """
+    Get user statistics for admin dashboard.
+    Reads the counters row (or one aggregate query without it), cached for
+    USER_STATS_CACHE_SECONDS and served from a replica when available.
+    """
+    stats = user_stats_cache.get("stats")
+    if stats is None:
+        with replica_reads(db):
+            row = db.execute(USER_COUNTERS_QUERY).first() if settings.USER_STATS_COUNTERS else None
+            if row is None:
+                row = db.execute(USER_STATS_QUERY).one()
+        stats = dict(row._mapping)
+        user_stats_cache.set("stats", stats, expires_at=time.time() + settings.USER_STATS_CACHE_SECONDS)
+    return dict(stats)
@@ -0,0 +1,113 @@
+"""In-process cache of the user fields needed to authorize a request.
+
+get_current_user only needs to know whether a user exists, is active, is deleted
+and what role they have. Caching those few fields per user id removes a database
+round trip from every authenticated request. Entries are dropped by the user
+service whenever one of those fields changes; other worker processes pick the
+change up once USER_CACHE_TTL_SECONDS has elapsed.
+
+With JWT_TRUST_EMBEDDED_CLAIMS, a cache miss is answered from the role and
+status embedded in the access token instead. Each token also carries the
+user's state_version, and a token older than the newest version this worker
+has seen is not trusted: the user is loaded from the database instead. A
+change made through this worker therefore applies to the user's next request.
+Other workers only learn the new version when they next load the user, so
+until then they may honour the old claims for up to ACCESS_TOKEN_EXPIRE_MINUTES.
+"""
+
+import math
+import time
+from typing import Optional
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.constants import UserRole
+from app.models.user import User
+
+
+class AuthUser:
+    """Authenticated user as seen by the auth dependencies."""
+
+    __slots__ = ("id", "role", "is_active", "is_deleted", "state_version")
+
+    def __init__(self, id: int, role: UserRole, is_active: bool, is_deleted: bool, state_version: int = 0):
+        self.id = id
+        self.role = role
+        self.is_active = is_active
+        self.is_deleted = is_deleted
+        self.state_version = state_version
+
+    @classmethod
+    def from_user(cls, user: User) -> "AuthUser":
+        return cls(
+            id=user.id,
+            role=user.role,
+            is_active=user.is_active,
+            is_deleted=user.is_deleted,
+            state_version=user.state_version,
+        )
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> Optional["AuthUser"]:
+        """Build a record from the claims embedded by security.user_claims, if present."""
+        if not {"role", "active", "ver"} <= payload.keys():
+            return None
+        return cls(
+            id=int(payload["sub"]),
+            role=UserRole(payload["role"]),
+            is_active=payload["active"],
+            is_deleted=False,
+            state_version=payload["ver"],
+        )
+
+
+_cache = LRUCache(max_size=settings.USER_CACHE_MAX_SIZE)
+
+# Lowest state_version a token may carry for its claims to be trusted, per user.
+# Kept for an access token's lifetime: any token older than that has expired anyway.
+_min_versions = LRUCache(max_size=settings.USER_CACHE_MAX_SIZE)
+
+
+def _note_version(user_id: int, version: float) -> None:
+    _min_versions.set(user_id, version, expires_at=time.time() + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
+def get(user_id: int) -> Optional[AuthUser]:
+    """Get the cached auth record for a user, if present and fresh."""
+    if not settings.USER_CACHE_ENABLED:
+        return None
+    return _cache.get(user_id)
+
+
+def from_claims(payload: dict) -> Optional[AuthUser]:
+    """The record embedded in a token, unless its state_version is older than one seen since."""
+    record = AuthUser.from_claims(payload)
+    if record is None or record.state_version < (_min_versions.get(record.id) or 0):
+        return None
+    return record
+
+
+def remember(user: User) -> AuthUser:
+    """Cache the auth-relevant fields of a freshly loaded user."""
+    record = AuthUser.from_user(user)
+    _note_version(user.id, user.state_version)
+    if settings.USER_CACHE_ENABLED:
+        _cache.set(user.id, record, expires_at=time.time() + settings.USER_CACHE_TTL_SECONDS)
+    return record
+
+
+def invalidate(user_id: int) -> None:
+    """Drop a user's cached record after a write, and distrust token claims until it is reloaded."""
+    _cache.delete(user_id)
+    _note_version(user_id, math.inf)
+
+
+def clear() -> None:
+    """Drop every cached record."""
+    _cache.clear()
+    _min_versions.clear()
+
+
+def stats() -> dict:
+    """Cache counters for the metrics endpoint."""
+    return _cache.stats()
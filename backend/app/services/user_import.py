@@ -0,0 +1,203 @@
+"""Bulk user import from CSV or NDJSON.
+
+Rows are read as a stream and processed in chunks. Each chunk is validated with
+UserCreate, its passwords are hashed across the password pool's worker processes,
+and the valid rows are loaded with COPY into a temporary staging table. A single
+INSERT ... SELECT then merges them into users, skipping any email that already
+belongs to a non-deleted user. Each chunk commits on its own, so a failure part
+way through keeps the chunks already loaded.
+"""
+
+import csv
+import io
+import json
+import logging
+from typing import AsyncIterator, Iterable, Iterator, Optional, TextIO
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.password_pool import password_pool
+from app.schemas.user import UserCreate
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "ndjson")
+
+STAGING_DDL = """
+CREATE TEMP TABLE user_import_staging (
+    row_no integer NOT NULL,
+    email varchar NOT NULL,
+    hashed_password varchar NOT NULL,
+    full_name varchar
+) ON COMMIT DROP
+"""
+
+# Deleted users do not block their email; rows whose email belongs to a live user,
+# including one registered concurrently (caught by the partial unique index), are skipped.
+MERGE_SQL = """
+WITH inserted AS (
+    INSERT INTO users (
+        email, hashed_password, full_name, role, is_active, is_verified,
+        is_deleted, state_version, oauth_provider
+    )
+    SELECT s.email, s.hashed_password, s.full_name, 'USER', true, false, false, 0, 'LOCAL'
+    FROM user_import_staging s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM users u WHERE lower(u.email) = lower(s.email) AND u.is_deleted = false
+    )
+    ON CONFLICT DO NOTHING
+    RETURNING email
+)
+SELECT s.row_no FROM user_import_staging s JOIN inserted i ON i.email = s.email
+"""
+
+
+class ImportReport:
+    """Running totals for an import, plus the rows that failed."""
+
+    def __init__(self):
+        self.processed = 0
+        self.created = 0
+        self.errors: list[dict] = []
+
+    def error(self, row: int, message: str, email: Optional[str] = None) -> dict:
+        entry = {"row": row, "email": email, "error": message}
+        self.errors.append(entry)
+        return entry
+
+    def summary(self) -> dict:
+        return {
+            "processed": self.processed,
+            "created": self.created,
+            "failed": len(self.errors),
+        }
+
+
+def read_rows(stream: TextIO, fmt: str) -> Iterator[tuple[int, object]]:
+    """Yield (row number, dict) pairs; unparseable rows yield their exception instead."""
+    if fmt == "csv":
+        for row_no, row in enumerate(csv.DictReader(stream), start=1):
+            yield row_no, {key: value for key, value in row.items() if key is not None and value != ""}
+    elif fmt == "ndjson":
+        row_no = 0
+        for line in stream:
+            if not line.strip():
+                continue
+            row_no += 1
+            try:
+                yield row_no, json.loads(line)
+            except ValueError as e:
+                yield row_no, e
+    else:
+        raise ValueError(f"Unknown import format: {fmt}")
+
+
+def _chunks(rows: Iterable, size: int) -> Iterator[list]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _validate(chunk: list, seen: set, report: ImportReport) -> list[tuple[int, UserCreate]]:
+    valid = []
+    for row_no, data in chunk:
+        if isinstance(data, Exception):
+            report.error(row_no, f"Invalid row: {data}")
+            continue
+        try:
+            user = UserCreate.model_validate(data)
+        except ValidationError as e:
+            email = data.get("email") if isinstance(data, dict) else None
+            report.error(row_no, "; ".join(err["msg"] for err in e.errors()), email)
+            continue
+        key = user.email.lower()
+        if key in seen:
+            report.error(row_no, "Duplicate email in import", user.email)
+            continue
+        seen.add(key)
+        valid.append((row_no, user))
+    return valid
+
+
+def load_chunk(db: Session, rows: list[tuple[int, UserCreate]], hashes: list[str]) -> set[int]:
+    """COPY one validated chunk into staging, merge it into users and commit; returns created row numbers."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for (row_no, user), hashed in zip(rows, hashes):
+        writer.writerow([row_no, user.email, hashed, user.full_name if user.full_name is not None else ""])
+    buffer.seek(0)
+
+    try:
+        connection = db.connection()
+        connection.exec_driver_sql(STAGING_DDL)
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(
+                "COPY user_import_staging (row_no, email, hashed_password, full_name) "
+                "FROM STDIN WITH (FORMAT csv, NULL '')",
+                buffer,
+            )
+        finally:
+            cursor.close()
+        created = {row_no for (row_no,) in connection.execute(text(MERGE_SQL))}
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return created
+
+
+async def import_users(
+    db: Session, stream: TextIO, fmt: str, chunk_size: int, reserved: int = 0
+) -> AsyncIterator[dict]:
+    """
+    Import users from a CSV (email,password,full_name header) or NDJSON stream.
+
+    Yields an {"type": "error", ...} event per rejected row, a {"type": "progress", ...}
+    event after each chunk and a final {"type": "summary", ...} event. reserved is
+    the number of password pool slots the caller holds for the import.
+
+    The response is already streaming when a chunk fails (a busy password pool, a
+    database error), so the failure is reported as a {"type": "error", "fatal": true}
+    event followed by the summary of the chunks committed before it.
+    """
+    report = ImportReport()
+    seen: set[str] = set()
+    reported = 0
+    chunks = _chunks(read_rows(stream, fmt), chunk_size)
+    try:
+        # Parsing reads the (possibly disk-backed) stream, so keep it off the event loop
+        while (chunk := await run_in_threadpool(next, chunks, None)) is not None:
+            valid = _validate(chunk, seen, report)
+            if valid:
+                hashes = await password_pool.hash_many([user.password for _, user in valid], reserved=reserved)
+                created = await run_in_threadpool(load_chunk, db, valid, hashes)
+                report.created += len(created)
+                for row_no, user in valid:
+                    if row_no not in created:
+                        report.error(row_no, "Email already registered", user.email)
+            report.processed += len(chunk)
+
+            for entry in report.errors[reported:]:
+                yield {"type": "error", **entry}
+            reported = len(report.errors)
+            yield {"type": "progress", **report.summary()}
+    except HTTPException as e:
+        # The failed chunk was not committed, so its rows count as neither processed nor failed
+        del report.errors[reported:]
+        yield {"type": "error", "fatal": True, "error": e.detail}
+    except Exception:
+        logger.exception("User import stopped after %d rows", report.processed)
+        del report.errors[reported:]
+        yield {"type": "error", "fatal": True, "error": "Import stopped by a server error"}
+
+    yield {"type": "summary", **report.summary()}
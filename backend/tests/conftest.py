@@ -1,16 +1,23 @@
+from contextlib import contextmanager
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from app.db.session import Base, get_db
+from app.db.query_log import instrument_query_log
 from app.main import app
 from app.core.config import settings
+from app.core.rate_limit import rate_limit_backend
+from app.services import user_cache
+from app.services.user import user_stats_cache
 
 # Create test database
 SQLALCHEMY_TEST_DATABASE_URL = f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_SERVER}:{settings.POSTGRES_PORT}/test_db"
 
 engine = create_engine(SQLALCHEMY_TEST_DATABASE_URL)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+instrument_query_log(engine)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 
 @pytest.fixture(scope="function")
@@ -35,6 +42,39 @@ def client(db):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    # Tables are recreated per test, so user ids get reused
+    user_cache.clear()
+    user_stats_cache.clear()
+    rate_limit_backend.reset()
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    Context manager failing the test when the block runs more than limit SQL statements.
+
+        with assert_max_queries(2):
+            client.get("/api/v1/projects/", headers=headers)
+
+    Yields the list of statements run so far, which the failure message prints.
+    """
+    @contextmanager
+    def assert_max(limit: int):
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        assert len(statements) <= limit, (
+            f"{len(statements)} queries, expected at most {limit}:\n" + "\n\n".join(statements)
+        )
+
+    return assert_max
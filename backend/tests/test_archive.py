@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.archive import ArchivedProject, ArchivedUser
+from app.models.project import Project
+from app.models.user import User
+from app.services.archive import archive_deleted_users
+
+
+def deleted_user(email: str, days_ago: int) -> User:
+    return User(
+        email=email, hashed_password="x", is_deleted=True, deleted_at=datetime.utcnow() - timedelta(days=days_ago)
+    )
+
+
+def archive(db: Session, **options) -> dict:
+    options = {"older_than_days": 30, "batch_size": 2, "pause_ms": 0, "lock_timeout_ms": 1000, **options}
+    return archive_deleted_users(db.get_bind(), **options)
+
+
+def test_archives_long_deleted_users_with_their_projects(db: Session):
+    """Test users deleted before the cutoff move to the archive tables with their projects."""
+    old = [deleted_user(f"old{i}@example.com", days_ago=40) for i in range(3)]
+    recent = deleted_user("recent@example.com", days_ago=1)
+    live = User(email="live@example.com", hashed_password="x")
+    db.add_all([*old, recent, live])
+    db.flush()
+    db.add_all([Project(title=f"Old {i}", owner_id=old[0].id) for i in range(2)])
+    db.add(Project(title="Live", owner_id=live.id))
+    db.commit()
+    old_ids = {user.id for user in old}
+
+    # Two batches of at most two users, then an empty one ends the run
+    assert archive(db) == {"batches": 2, "users": 3, "projects": 2}
+
+    db.expire_all()
+    assert {user.email for user in db.scalars(select(User))} == {"recent@example.com", "live@example.com"}
+    assert [project.title for project in db.scalars(select(Project))] == ["Live"]
+    assert set(db.scalars(select(ArchivedUser.id))) == old_ids
+    assert sorted(db.scalars(select(ArchivedProject.title))) == ["Old 0", "Old 1"]
+
+    # Nothing left to do: running again is a no-op
+    assert archive(db) == {"batches": 0, "users": 0, "projects": 0}
+
+
+def test_max_batches_stops_early_and_next_run_resumes(db: Session):
+    """Test a run cut short by max_batches is finished by the next run."""
+    db.add_all([deleted_user(f"old{i}@example.com", days_ago=40) for i in range(5)])
+    db.commit()
+
+    assert archive(db, max_batches=1) == {"batches": 1, "users": 2, "projects": 0}
+    assert archive(db) == {"batches": 2, "users": 3, "projects": 0}
+    assert db.scalar(select(func.count()).select_from(ArchivedUser)) == 5
@@ -1,4 +1,14 @@
+import pytest
 from fastapi.testclient import TestClient
+from passlib.hash import bcrypt
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.constants import OAuthProvider
+from app.core.security import create_access_token, decode_token
+from app.models.user import User
+from app.services import refresh_token as refresh_token_service
 
 
 def test_register_user(client: TestClient):
@@ -38,6 +48,24 @@ def test_register_duplicate_email(client: TestClient):
     assert response.status_code == 400
 
 
+def test_emails_unique_regardless_of_case(client: TestClient, db: Session):
+    """Test an email differing only in case cannot be registered or inserted for a second live user."""
+    response = client.post("/api/v1/auth/register", json={"email": "Case@Example.com", "password": "testpassword123"})
+    assert response.status_code == 201
+
+    response = client.post("/api/v1/auth/register", json={"email": "case@example.com", "password": "testpassword123"})
+    assert response.status_code == 400
+
+    db.add(User(email="CASE@EXAMPLE.COM", hashed_password="x"))
+    with pytest.raises(IntegrityError):
+        db.commit()
+    db.rollback()
+
+    # Only live users count: a deleted user's email can be reused in any case
+    db.add(User(email="CASE@example.com", hashed_password="x", is_deleted=True))
+    db.commit()
+
+
 def test_login(client: TestClient):
     """Test user login."""
     # Register user
@@ -74,3 +102,124 @@ def test_login_invalid_credentials(client: TestClient):
         }
     )
     assert response.status_code == 401
+
+
+def test_login_upgrades_hash_with_other_cost(client: TestClient, db: Session):
+    """Test a hash made with another bcrypt cost is rehashed on successful login only."""
+    old_hash = bcrypt.using(rounds=4).hash("testpassword123")
+    user = User(email="legacy@example.com", hashed_password=old_hash)
+    db.add(user)
+    db.commit()
+
+    response = client.post("/api/v1/auth/login", data={"username": "legacy@example.com", "password": "wrong"})
+    assert response.status_code == 401
+    db.refresh(user)
+    assert user.hashed_password == old_hash
+
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "legacy@example.com", "password": "testpassword123"}
+    )
+    assert response.status_code == 200
+    db.refresh(user)
+    assert user.hashed_password != old_hash
+    assert bcrypt.from_string(user.hashed_password).rounds == settings.BCRYPT_ROUNDS
+    assert bcrypt.verify("testpassword123", user.hashed_password)
+
+
+def login_with_cookies(client: TestClient) -> dict:
+    """Helper to register, login and return the token response."""
+    client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "test@example.com",
+            "password": "testpassword123",
+        }
+    )
+    response = client.post(
+        "/api/v1/auth/login",
+        data={
+            "username": "test@example.com",
+            "password": "testpassword123",
+        }
+    )
+    return response.json()
+
+
+def test_refresh_rotates_token(client: TestClient):
+    """Test refresh issues a new refresh token."""
+    tokens = login_with_cookies(client)
+
+    response = client.post("/api/v1/auth/refresh")
+    assert response.status_code == 200
+    assert response.json()["refresh_token"] != tokens["refresh_token"]
+
+
+def test_refresh_token_reuse_revokes_family(client: TestClient):
+    """Test replaying a consumed refresh token revokes its successors too."""
+    tokens = login_with_cookies(client)
+
+    response = client.post("/api/v1/auth/refresh")
+    new_refresh_token = response.json()["refresh_token"]
+
+    # Replay the consumed token
+    client.cookies.set("refresh_token", tokens["refresh_token"])
+    response = client.post("/api/v1/auth/refresh")
+    assert response.status_code == 401
+
+    # The successor belongs to the revoked family
+    client.cookies.set("refresh_token", new_refresh_token)
+    response = client.post("/api/v1/auth/refresh")
+    assert response.status_code == 401
+
+
+def test_family_revoked_on_one_worker_is_rejected_on_another(client: TestClient, monkeypatch):
+    """Test a successor token is refused by a worker whose filter never saw the family revocation."""
+    worker_a = refresh_token_service.RevocationFilter(capacity=1000)
+    worker_b = refresh_token_service.RevocationFilter(capacity=1000)
+
+    monkeypatch.setattr(refresh_token_service, "revocation_filter", worker_a)
+    tokens = login_with_cookies(client)
+    successor = client.post("/api/v1/auth/refresh").json()["refresh_token"]
+
+    # Reuse detected on worker A revokes the family there
+    client.cookies.set("refresh_token", tokens["refresh_token"])
+    assert client.post("/api/v1/auth/refresh").status_code == 401
+
+    # Worker B has never heard of the family or the successor
+    monkeypatch.setattr(refresh_token_service, "revocation_filter", worker_b)
+    family = decode_token(successor)["fam"]
+    assert not worker_b.might_contain(family)
+
+    client.cookies.set("refresh_token", successor)
+    assert client.post("/api/v1/auth/refresh").status_code == 401
+
+
+def test_logout_revokes_refresh_token(client: TestClient):
+    """Test a refresh token stops working after logout."""
+    tokens = login_with_cookies(client)
+
+    client.post("/api/v1/auth/logout")
+
+    client.cookies.set("refresh_token", tokens["refresh_token"])
+    response = client.post("/api/v1/auth/refresh")
+    assert response.status_code == 401
+
+
+def test_oauth_user_adds_password_once(client: TestClient, db: Session):
+    """Test an OAuth-only user can add a password, log in with it, and not add another."""
+    user = User(email="oauth@example.com", oauth_provider=OAuthProvider.GOOGLE, oauth_provider_id="g-1")
+    db.add(user)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(str(user.id))}"}
+
+    response = client.post("/api/v1/auth/add-password", headers=headers, json={"password": "newpassword123"})
+    assert response.status_code == 200
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "oauth@example.com", "password": "newpassword123"}
+    )
+    assert response.status_code == 200
+
+    response = client.post("/api/v1/auth/add-password", headers=headers, json={"password": "otherpassword123"})
+    assert response.status_code == 400
@@ -0,0 +1,83 @@
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from app.api.v1.routers import well_known
+from app.core import security
+from app.core.config import settings
+from app.core.keys import KeyRing
+from app.main import app
+
+
+def write_key(keys_dir, kid: str) -> None:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    (keys_dir / f"{kid}.pem").write_bytes(pem)
+
+
+@pytest.fixture
+def rs256(tmp_path, monkeypatch):
+    """RS256 signing with a ring of two keys, "2024-01" (old) and "2025-01" (active)."""
+    write_key(tmp_path, "2024-01")
+    write_key(tmp_path, "2025-01")
+    monkeypatch.setattr(settings, "ALGORITHM", "RS256")
+    monkeypatch.setattr(settings, "TOKEN_CACHE_ENABLED", False)
+
+    def use_ring(active_kid=None) -> KeyRing:
+        ring = KeyRing("RS256", str(tmp_path), active_kid)
+        monkeypatch.setattr(security, "key_ring", ring)
+        monkeypatch.setattr(well_known, "key_ring", ring)
+        return ring
+
+    return use_ring
+
+
+def test_tokens_carry_active_kid(rs256):
+    """Test tokens are signed with the active key and name it in their header."""
+    rs256()
+    token = security.create_access_token(subject="1")
+
+    assert jwt.get_unverified_header(token)["kid"] == "2025-01"
+    assert security.decode_token(token)["sub"] == "1"
+
+
+def test_rotated_out_key_still_verifies_until_removed(rs256, tmp_path):
+    """Test tokens signed with an older key verify while its file stays in the ring."""
+    rs256(active_kid="2024-01")
+    old_token = security.create_access_token(subject="1")
+
+    rs256()
+    assert security.decode_token(old_token)["sub"] == "1"
+
+    (tmp_path / "2024-01.pem").unlink()
+    rs256()
+    assert security.decode_token(old_token) is None
+
+
+def test_unknown_or_missing_kid_rejected(rs256):
+    """Test a token whose kid is not in the ring, or that has none, is rejected."""
+    ring = rs256()
+    _, private_key = ring.signing_key()
+    claims = {"sub": "1", "type": "access", "exp": 4102444800}
+
+    assert security.decode_token(jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": "other"})) is None
+    assert security.decode_token(jwt.encode(claims, private_key, algorithm="RS256")) is None
+
+
+def test_jwks_publishes_public_keys(rs256):
+    """Test the JWKS endpoint lists every public key by kid, and nothing private."""
+    rs256()
+    token = security.create_access_token(subject="1")
+
+    keys = TestClient(app).get("/.well-known/jwks.json").json()["keys"]
+
+    assert sorted(key["kid"] for key in keys) == ["2024-01", "2025-01"]
+    assert all(key["kty"] == "RSA" and key["use"] == "sig" and "d" not in key for key in keys)
+    active = next(key for key in keys if key["kid"] == "2025-01")
+    assert jwt.decode(token, active, algorithms=["RS256"])["sub"] == "1"
@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+
+from app.core.password_pool import PasswordHashPool
+from app.core.security import verify_password
+
+
+@pytest.fixture
+def pool():
+    """A one-worker pool with room for one queued job."""
+    pool = PasswordHashPool(workers=1, max_queue=1, retry_after=7)
+    yield pool
+    pool.shutdown()
+
+
+async def saturate(pool: PasswordHashPool, seconds: float = 1.0) -> list[asyncio.Task]:
+    """Occupy every worker and queue slot with jobs that sleep for seconds."""
+    jobs = [asyncio.create_task(pool._submit(time.sleep, seconds)) for _ in range(pool.workers + pool.max_queue)]
+    while pool.stats()["in_flight"] < len(jobs):
+        await asyncio.sleep(0)
+    return jobs
+
+
+async def test_full_pool_answers_503_with_retry_after(pool: PasswordHashPool):
+    """Test a hash request past workers + max_queue gets 503 and Retry-After without queueing."""
+    app = FastAPI()
+
+    @app.post("/hash")
+    async def hash_password():
+        return {"hash": await pool.hash("secret-password")}
+
+    jobs = await saturate(pool)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/hash")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "7"
+        assert pool.stats()["in_flight"] == 2
+
+        await asyncio.gather(*jobs)
+        response = await client.post("/hash")
+        assert response.status_code == 200
+        assert verify_password("secret-password", response.json()["hash"])
+
+
+async def test_stats(pool: PasswordHashPool):
+    """Test stats() reports in-flight and queued jobs, completions, rejections and latency."""
+    assert pool.stats()["completed"] == 0
+
+    jobs = await saturate(pool, seconds=0.2)
+    stats = pool.stats()
+    assert stats["workers"] == 1
+    assert stats["in_flight"] == 2
+    assert stats["queue_depth"] == 1
+    assert stats["max_queue"] == 1
+
+    with pytest.raises(HTTPException) as exc:
+        await pool.verify("password", "not-a-hash")
+    assert exc.value.status_code == 503
+    await asyncio.gather(*jobs)
+
+    stats = pool.stats()
+    assert stats["in_flight"] == 0
+    assert stats["queue_depth"] == 0
+    assert stats["completed"] == 2
+    assert stats["rejected"] == 1
+    assert stats["max_latency_ms"] >= 200
+    assert 0 < stats["avg_latency_ms"] <= stats["max_latency_ms"]
+
+
+async def test_reserved_slots_are_kept_for_their_holder(pool: PasswordHashPool):
+    """Test reserved slots turn other work away and run the holder's hash_many."""
+    slots = pool.reserve(5)
+    assert slots == 1
+    assert pool.stats()["reserved"] == 1
+
+    # The one unreserved slot is taken, so everyone else is turned away
+    jobs = [asyncio.create_task(pool._submit(time.sleep, 0.2))]
+    while pool.stats()["in_flight"] < 1:
+        await asyncio.sleep(0)
+    with pytest.raises(HTTPException) as exc:
+        pool.reserve(1)
+    assert exc.value.status_code == 503
+    with pytest.raises(HTTPException):
+        await pool.hash("password")
+
+    hashes = await pool.hash_many(["one", "two"], batch_size=1, reserved=slots)
+    assert verify_password("two", hashes[1])
+    await asyncio.gather(*jobs)
+
+    pool.release(slots)
+    assert pool.stats()["reserved"] == 0
+    assert verify_password("password", await pool.hash("password"))
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.util import greenlet_spawn
+
+from app.db.instrumentation import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    instrument_pool,
+    instrument_statement_cache,
+    statement_cache_stats,
+)
+
+
+class FakeConnection:
+    """Just enough of a DBAPI connection for the pool to hand out and reset."""
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+async def test_concurrent_async_checkouts_are_each_timed():
+    """Test checkouts waiting together on the event loop thread each record their wait and timeout."""
+    pool = InstrumentedAsyncAdaptedQueuePool(FakeConnection, pool_size=1, max_overflow=0, timeout=0.2)
+    held = await greenlet_spawn(pool.connect)
+
+    results = await asyncio.gather(
+        *(greenlet_spawn(pool.connect) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, exc.TimeoutError) for result in results)
+    assert pool.metrics.timeouts == 3
+    snapshot = pool.metrics.checkout_wait.snapshot()
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == pytest.approx(0.6, abs=0.15)
+    await greenlet_spawn(held.close)
+
+
+def test_resized_pool_keeps_metrics_and_listeners():
+    """Test startup resizing swaps in a pool of the new size that reports into the same metrics and events."""
+    engine = create_engine("postgresql://localhost/unused", poolclass=InstrumentedQueuePool, pool_size=5)
+    metrics = instrument_pool(engine)
+
+    old_pool = engine.pool
+    engine.pool = old_pool.resized(3)
+    old_pool.dispose()
+
+    assert engine.pool.size() == 3
+    assert engine.pool.metrics is metrics
+    assert len(engine.pool.dispatch.invalidate) == 1
+
+
+def test_statement_cache_stats_without_private_cache(monkeypatch):
+    """Test the cache stats still report hits and misses if SQLAlchemy drops its private compiled cache."""
+    engine = create_engine("sqlite://")
+    instrument_statement_cache(engine)
+    with engine.connect() as conn:
+        for _ in range(2):
+            conn.execute(text("SELECT 1"))
+
+    stats = statement_cache_stats(engine)
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0.5)
+    assert stats["size"] == 1
+
+    monkeypatch.delattr(engine, "_compiled_cache")
+    stats = statement_cache_stats(engine)
+    assert (stats["hits"], stats["misses"], stats["size"], stats["capacity"]) == (1, 1, None, None)
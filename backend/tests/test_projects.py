@@ -1,4 +1,16 @@
+import csv
+import io
+import json
+
+import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.services import project as project_service
 
 
 def create_test_user_and_login(client: TestClient):
@@ -117,6 +129,57 @@ def test_update_project(client: TestClient):
     assert data["description"] == "Original Description"
 
 
+def test_conditional_get_returns_304_until_changed(client: TestClient):
+    """Test If-None-Match with the current ETag gets an empty 304 until the project changes."""
+    token = create_test_user_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    project_id = client.post("/api/v1/projects/", headers=headers, json={"title": "Polled"}).json()["id"]
+
+    for path in (f"/api/v1/projects/{project_id}", "/api/v1/projects/", "/api/v1/users/me"):
+        etag = client.get(path, headers=headers).headers["ETag"]
+        assert etag.startswith("W/")
+
+        response = client.get(path, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+    list_etag = client.get("/api/v1/projects/", headers=headers).headers["ETag"]
+    client.put(f"/api/v1/projects/{project_id}", headers=headers, json={"title": "Changed"})
+
+    response = client.get("/api/v1/projects/", headers={**headers, "If-None-Match": list_etag})
+    assert response.status_code == 200
+    assert response.json()[0]["title"] == "Changed"
+
+
+def test_update_project_if_match(client: TestClient):
+    """Test If-Match makes an update based on a stale read fail with 412."""
+    token = create_test_user_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    project_id = client.post("/api/v1/projects/", headers=headers, json={"title": "Original"}).json()["id"]
+    read_etag = client.get(f"/api/v1/projects/{project_id}", headers=headers).headers["ETag"]
+
+    first = client.put(
+        f"/api/v1/projects/{project_id}",
+        headers={**headers, "If-Match": read_etag},
+        json={"title": "First writer"}
+    )
+    assert first.status_code == 200
+    assert first.headers["ETag"] != read_etag
+
+    second = client.put(
+        f"/api/v1/projects/{project_id}",
+        headers={**headers, "If-Match": read_etag},
+        json={"title": "Second writer"}
+    )
+    assert second.status_code == 412
+    assert client.get(f"/api/v1/projects/{project_id}", headers=headers).json()["title"] == "First writer"
+
+    # A missing project is still 404, whatever the If-Match
+    missing = client.put("/api/v1/projects/999999", headers={**headers, "If-Match": read_etag}, json={"title": "x"})
+    assert missing.status_code == 404
+
+
 def test_delete_project(client: TestClient):
     """Test deleting a project."""
     token = create_test_user_and_login(client)
@@ -143,3 +206,253 @@ def test_delete_project(client: TestClient):
         headers={"Authorization": f"Bearer {token}"}
     )
     assert get_response.status_code == 404
+
+
+def test_list_projects_cursor_pagination(client: TestClient):
+    """Test paging through projects with the X-Next-Cursor header."""
+    token = create_test_user_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    for i in range(5):
+        client.post("/api/v1/projects/", headers=headers, json={"title": f"Project {i}"})
+
+    titles = []
+    params = {"limit": 2}
+    while True:
+        response = client.get("/api/v1/projects/", headers=headers, params=params)
+        assert response.status_code == 200
+        titles += [project["title"] for project in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params = {"limit": 2, "cursor": cursor}
+
+    assert titles == [f"Project {i}" for i in range(5)]
+
+
+def test_list_projects_invalid_cursor(client: TestClient):
+    """Test a malformed cursor is rejected."""
+    token = create_test_user_and_login(client)
+
+    response = client.get(
+        "/api/v1/projects/",
+        headers={"Authorization": f"Bearer {token}"},
+        params={"cursor": "not-a-cursor"}
+    )
+
+    assert response.status_code == 400
+
+
+def test_project_writes_skip_refresh_select(db: Session):
+    """Test create and update read server-generated columns via RETURNING, not a SELECT."""
+    owner = User(email="owner@example.com", hashed_password="x")
+    db.add(owner)
+    db.commit()
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0].upper())
+
+    event.listen(db.get_bind(), "before_cursor_execute", capture)
+    try:
+        project = project_service.create_project(db, ProjectCreate(title="Fast"), owner_id=owner.id)
+        assert project.created_at is not None
+        created_at = project.created_at
+
+        project = project_service.update_project(db, project.id, owner.id, ProjectUpdate(title="Faster"))
+        assert project.updated_at >= created_at
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", capture)
+
+    assert statements == ["INSERT", "UPDATE"]
+
+
+def test_project_access_is_scoped_in_sql(db: Session):
+    """Test owned reads and writes take one statement, and misses tell 404 from 403."""
+    owner = User(email="owner@example.com", hashed_password="x")
+    other = User(email="other@example.com", hashed_password="x")
+    db.add_all([owner, other])
+    db.commit()
+    project = project_service.create_project(db, ProjectCreate(title="Mine"), owner_id=owner.id)
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0].upper())
+
+    event.listen(db.get_bind(), "before_cursor_execute", capture)
+    try:
+        updated = project_service.update_project(db, project.id, owner.id, ProjectUpdate(title="Still mine"))
+        assert updated.title == "Still mine"
+        assert statements == ["UPDATE"]
+
+        for call in (
+            lambda project_id, owner_id: project_service.get_project(db, project_id, owner_id),
+            lambda project_id, owner_id: project_service.update_project(
+                db, project_id, owner_id, ProjectUpdate(title="Taken")
+            ),
+            lambda project_id, owner_id: project_service.delete_project(db, project_id, owner_id),
+        ):
+            with pytest.raises(HTTPException) as exc:
+                call(project.id, other.id)
+            assert exc.value.status_code == 403
+            with pytest.raises(HTTPException) as exc:
+                call(project.id + 1000, owner.id)
+            assert exc.value.status_code == 404
+
+        del statements[:]
+        project_service.delete_project(db, project.id, owner.id)
+        assert statements == ["DELETE"]
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", capture)
+
+
+def test_batch_create_update_delete(client: TestClient):
+    """Test the batch endpoints apply every item and report per-item results."""
+    token = create_test_user_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.post(
+        "/api/v1/projects/batch",
+        headers=headers,
+        json={"items": [{"title": f"Project {i}"} for i in range(3)]}
+    )
+    assert response.status_code == 201
+    results = response.json()["results"]
+    assert [r["project"]["title"] for r in results] == ["Project 0", "Project 1", "Project 2"]
+    ids = [r["id"] for r in results]
+
+    response = client.put(
+        "/api/v1/projects/batch",
+        headers=headers,
+        json={"items": [
+            {"id": ids[0], "title": "Renamed"},
+            {"id": ids[1], "description": "Described"},
+            {"id": 999999, "title": "Missing"},
+        ]}
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == [200, 200, 404]
+    assert results[0]["project"]["title"] == "Renamed"
+    assert results[1]["project"]["title"] == "Project 1"
+    assert results[1]["project"]["description"] == "Described"
+
+    response = client.request(
+        "DELETE", "/api/v1/projects/batch", headers=headers, json={"ids": [ids[0], 999999]}
+    )
+    assert response.status_code == 200
+    assert [r["status"] for r in response.json()["results"]] == [204, 404]
+
+    remaining = client.get("/api/v1/projects/", headers=headers).json()
+    assert sorted(p["id"] for p in remaining) == ids[1:]
+
+
+def test_batch_update_skips_other_users_projects(client: TestClient):
+    """Test batch updates cannot touch projects owned by someone else."""
+    token = create_test_user_and_login(client)
+    project_id = client.post(
+        "/api/v1/projects/",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"title": "Mine"}
+    ).json()["id"]
+
+    client.post("/api/v1/auth/register", json={"email": "other@example.com", "password": "otherpassword123"})
+    other_token = client.post(
+        "/api/v1/auth/login",
+        data={"username": "other@example.com", "password": "otherpassword123"}
+    ).json()["access_token"]
+
+    response = client.put(
+        "/api/v1/projects/batch",
+        headers={"Authorization": f"Bearer {other_token}"},
+        json={"items": [{"id": project_id, "title": "Stolen"}]}
+    )
+    assert response.json()["results"] == [{"id": project_id, "status": 404, "project": None}]
+
+
+def test_batch_rejects_duplicate_ids(client: TestClient):
+    """Test a batch naming the same project twice is rejected."""
+    token = create_test_user_and_login(client)
+
+    response = client.put(
+        "/api/v1/projects/batch",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"items": [{"id": 1, "title": "a"}, {"id": 1, "title": "b"}]}
+    )
+    assert response.status_code == 422
+
+
+def test_export_projects(client: TestClient):
+    """Test projects stream out as NDJSON and CSV."""
+    token = create_test_user_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    for i in range(3):
+        client.post("/api/v1/projects/", headers=headers, json={"title": f"Project {i}"})
+
+    response = client.get("/api/v1/projects/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["title"] for line in lines] == ["Project 0", "Project 1", "Project 2"]
+
+    response = client.get("/api/v1/projects/export", headers=headers, params={"format": "csv"})
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["title"] for row in rows] == ["Project 0", "Project 1", "Project 2"]
+
+
+def test_search_projects(client: TestClient):
+    """Test full-text search ranks, highlights, pages and scopes to the owner."""
+    token = create_test_user_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post("/api/v1/projects/", headers=headers, json={"title": "Rocket launch", "description": "Fuel <b>tanks</b>"})
+    client.post("/api/v1/projects/", headers=headers, json={"title": "Garden", "description": "A rocket-shaped planter"})
+    client.post("/api/v1/projects/", headers=headers, json={"title": "Groceries"})
+
+    response = client.get("/api/v1/projects/search", headers=headers, params={"q": "rockets", "limit": 1})
+    assert response.status_code == 200
+    first = response.json()
+    # Title matches weigh more than description matches
+    assert [p["title"] for p in first] == ["Rocket launch"]
+    assert first[0]["title_highlight"] == "<mark>Rocket</mark> launch"
+    assert first[0]["description_highlight"] == "Fuel &lt;b&gt;tanks&lt;/b&gt;"
+
+    cursor = response.headers["X-Next-Cursor"]
+    response = client.get(
+        "/api/v1/projects/search", headers=headers, params={"q": "rockets", "limit": 1, "cursor": cursor}
+    )
+    assert [p["title"] for p in response.json()] == ["Garden"]
+
+    # Another user's search does not see these projects
+    client.post("/api/v1/auth/register", json={"email": "other@example.com", "password": "otherpassword123"})
+    other_token = client.post(
+        "/api/v1/auth/login",
+        data={"username": "other@example.com", "password": "otherpassword123"}
+    ).json()["access_token"]
+    other = {"Authorization": f"Bearer {other_token}"}
+    assert client.get("/api/v1/projects/search", headers=other, params={"q": "rocket"}).json() == []
+
+
+def test_search_pages_through_tied_ranks(client: TestClient):
+    """Test paging search results that share one rank returns each project exactly once."""
+    token = create_test_user_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    created = [
+        client.post("/api/v1/projects/", headers=headers, json={"title": f"Rocket {i}"}).json()["id"]
+        for i in range(5)
+    ]
+
+    seen, ranks = [], set()
+    params = {"q": "rocket", "limit": 2}
+    while True:
+        response = client.get("/api/v1/projects/search", headers=headers, params=params)
+        page = response.json()
+        if not page:
+            break
+        seen += [p["id"] for p in page]
+        ranks |= {p["rank"] for p in page}
+        params["cursor"] = response.headers["X-Next-Cursor"]
+
+    assert len(ranks) == 1
+    assert seen == sorted(created, reverse=True)
@@ -0,0 +1,116 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.api.v1.routers import projects_async
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.session import get_async_db
+from app.models.user import User
+from app.services import user_cache
+
+ASYNC_TEST_DATABASE_URL = f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_SERVER}:{settings.POSTGRES_PORT}/test_db"
+
+
+@pytest.fixture
+def owners(db: Session) -> dict:
+    """Two users, with auth headers for each."""
+    alice = User(email="alice@example.com", hashed_password="x")
+    bob = User(email="bob@example.com", hashed_password="x")
+    db.add_all([alice, bob])
+    db.commit()
+    return {
+        "alice": {"Authorization": f"Bearer {create_access_token(str(alice.id))}"},
+        "bob": {"Authorization": f"Bearer {create_access_token(str(bob.id))}"},
+    }
+
+
+@pytest.fixture
+async def client(db: Session):
+    """Async client for the DB_ASYNC_MODE project router, on an asyncpg engine bound to test_db."""
+    engine = create_async_engine(ASYNC_TEST_DATABASE_URL)
+    sessions = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with sessions() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(projects_async.router, prefix="/api/v1/projects")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    user_cache.clear()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as test_client:
+        yield test_client
+    await engine.dispose()
+
+
+async def test_project_crud(client: httpx.AsyncClient, owners: dict):
+    """Test create, list, get, update and delete through the async router."""
+    headers = owners["alice"]
+    response = await client.post("/api/v1/projects/", headers=headers, json={"title": "Async", "description": "A"})
+    assert response.status_code == 201
+    project_id = response.json()["id"]
+
+    response = await client.get("/api/v1/projects/", headers=headers)
+    assert [project["id"] for project in response.json()] == [project_id]
+
+    response = await client.put(f"/api/v1/projects/{project_id}", headers=headers, json={"title": "Renamed"})
+    assert response.status_code == 200
+    assert response.json()["title"] == "Renamed"
+    assert response.json()["description"] == "A"
+
+    response = await client.get(f"/api/v1/projects/{project_id}", headers=headers)
+    assert response.json()["title"] == "Renamed"
+
+    response = await client.delete(f"/api/v1/projects/{project_id}", headers=headers)
+    assert response.status_code == 204
+    response = await client.get(f"/api/v1/projects/{project_id}", headers=headers)
+    assert response.status_code == 404
+
+
+async def test_other_users_project_is_403_and_missing_is_404(client: httpx.AsyncClient, owners: dict):
+    """Test reads and writes of someone else's project are 403 and of a missing one 404."""
+    response = await client.post("/api/v1/projects/", headers=owners["alice"], json={"title": "Private"})
+    project_id = response.json()["id"]
+
+    for method, kwargs in (("GET", {}), ("PUT", {"json": {"title": "Taken"}}), ("DELETE", {})):
+        response = await client.request(method, f"/api/v1/projects/{project_id}", headers=owners["bob"], **kwargs)
+        assert response.status_code == 403
+        response = await client.request(method, "/api/v1/projects/999999", headers=owners["bob"], **kwargs)
+        assert response.status_code == 404
+
+    response = await client.get(f"/api/v1/projects/{project_id}", headers=owners["alice"])
+    assert response.json()["title"] == "Private"
+
+
+async def test_conditional_requests(client: httpx.AsyncClient, owners: dict):
+    """Test If-None-Match 304s and If-Match 412s on the async router."""
+    headers = owners["alice"]
+    response = await client.post("/api/v1/projects/", headers=headers, json={"title": "Original"})
+    project_id = response.json()["id"]
+    read_etag = (await client.get(f"/api/v1/projects/{project_id}", headers=headers)).headers["ETag"]
+
+    response = await client.get(f"/api/v1/projects/{project_id}", headers={**headers, "If-None-Match": read_etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    response = await client.put(
+        f"/api/v1/projects/{project_id}",
+        headers={**headers, "If-Match": read_etag},
+        json={"title": "First writer"}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != read_etag
+
+    response = await client.put(
+        f"/api/v1/projects/{project_id}",
+        headers={**headers, "If-Match": read_etag},
+        json={"title": "Second writer"}
+    )
+    assert response.status_code == 412
+
+    response = await client.get(f"/api/v1/projects/{project_id}", headers={**headers, "If-None-Match": read_etag})
+    assert response.status_code == 200
+    assert response.json()["title"] == "First writer"
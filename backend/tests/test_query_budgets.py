@@ -0,0 +1,72 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.constants import UserRole
+from app.core.security import create_access_token
+from app.models.project import Project
+from app.models.user import User
+
+# Most SQL statements each endpoint may run, counting the user lookup on an
+# auth-cache miss. A listing that starts loading rows one by one (N+1) blows
+# through these as soon as the fixtures have more than a couple of rows.
+BUDGETS = {
+    "/api/v1/projects/": 2,
+    "/api/v1/projects/search?q=project": 2,
+    "/api/v1/admin/users": 2,
+}
+
+
+@pytest.fixture
+def seeded(db: Session) -> dict:
+    """An admin and a user with 10 projects each, and auth headers for both."""
+    admin = User(email="admin@example.com", hashed_password="x", role=UserRole.ADMIN)
+    owner = User(email="owner@example.com", hashed_password="x")
+    db.add_all([admin, owner])
+    db.flush()
+    db.add_all(
+        Project(title=f"Project {n}", description="Budget project", owner_id=user.id)
+        for user in (admin, owner)
+        for n in range(10)
+    )
+    db.commit()
+    project = db.query(Project).filter(Project.owner_id == owner.id).first()
+    return {
+        "admin": {"Authorization": f"Bearer {create_access_token(str(admin.id))}"},
+        "owner": {"Authorization": f"Bearer {create_access_token(str(owner.id))}"},
+        "project_id": project.id,
+    }
+
+
+@pytest.mark.parametrize("path", BUDGETS)
+def test_listing_query_budgets(client: TestClient, seeded: dict, assert_max_queries, path: str):
+    """Test each listing runs a fixed number of queries however many rows it returns."""
+    headers = seeded["admin"] if path.startswith("/api/v1/admin") else seeded["owner"]
+
+    with assert_max_queries(BUDGETS[path]):
+        response = client.get(path, headers=headers)
+
+    assert response.status_code == 200
+    assert len(response.json()) >= 10
+
+
+def test_project_detail_query_budget(client: TestClient, seeded: dict, assert_max_queries):
+    """Test reading one project is the auth lookup and a single owner-scoped SELECT."""
+    with assert_max_queries(2):
+        response = client.get(f"/api/v1/projects/{seeded['project_id']}", headers=seeded["owner"])
+
+    assert response.status_code == 200
+
+
+def test_query_debug_headers(client: TestClient, seeded: dict, monkeypatch):
+    """Test responses carry the request's query count and DB time when enabled."""
+    response = client.get("/api/v1/projects/", headers=seeded["owner"])
+    assert "X-DB-Query-Count" not in response.headers
+
+    monkeypatch.setattr(settings, "DB_QUERY_DEBUG_HEADERS", True)
+    response = client.get("/api/v1/projects/", headers=seeded["owner"])
+
+    # The user is cached by the first request, so only the listing runs
+    assert response.headers["X-DB-Query-Count"] == "1"
+    assert float(response.headers["X-DB-Query-Time-Ms"]) > 0
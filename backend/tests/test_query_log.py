@@ -0,0 +1,47 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.query_log import RequestQueries, query_log, request_context
+
+
+def test_slow_queries_are_attributed_and_explained(db: Session, monkeypatch):
+    """Test a slow SELECT is recorded with its request and gets a sampled plan."""
+    # The test engine is instrumented in conftest
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 20)
+    monkeypatch.setattr(settings, "SLOW_QUERY_EXPLAIN_SAMPLE_RATE", 1.0)
+    query_log.clear()
+
+    request = RequestQueries("request-1", {"method": "GET", "path": "/api/v1/projects/"})
+    token = request_context.set(request)
+    try:
+        db.execute(text("SELECT pg_sleep(0.05)"))
+        db.execute(text("SELECT 1"))
+    finally:
+        request_context.reset(token)
+
+    # The EXPLAIN is not counted as one of the request's queries
+    assert request.count == 2
+    slowest = query_log.top(1)[0]
+    assert slowest["statement"] == "SELECT pg_sleep(0.05)"
+    assert slowest["slow_calls"] == 1
+    assert slowest["last_slow_route"] == "GET /api/v1/projects/"
+    assert slowest["last_slow_request_id"] == "request-1"
+    assert "actual time" in slowest["plan"]
+
+    # The EXPLAIN ran in a savepoint and left the transaction usable
+    assert db.execute(text("SELECT 2")).scalar() == 2
+
+
+def test_slow_queries_endpoint_requires_admin(client: TestClient):
+    """Test non-admins cannot read the statement timings."""
+    client.post("/api/v1/auth/register", json={"email": "user@example.com", "password": "testpassword123"})
+    token = client.post(
+        "/api/v1/auth/login",
+        data={"username": "user@example.com", "password": "testpassword123"}
+    ).json()["access_token"]
+
+    response = client.get("/api/v1/admin/slow-queries", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 403
@@ -0,0 +1,119 @@
+"""Check that each hot service query is answered from its intended index.
+
+The test tables are nearly empty, so sequential scans are disabled for the
+EXPLAIN to show which index the planner would pick on a real table.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.orm import Session
+
+from app.core.constants import OAuthProvider
+from app.core.pagination import encode_cursor
+from app.services import oauth as oauth_service
+from app.services import project as project_service
+from app.services import user as user_service
+
+
+@contextmanager
+def captured_selects(db: Session):
+    """Collect the SELECT statements (and parameters) db sends while in the block."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    bind = db.get_bind()
+    event.listen(bind, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", capture)
+
+
+def explain(db: Session, call) -> str:
+    """Run call(db) and return the query plan of the single SELECT it issued."""
+    with captured_selects(db) as statements:
+        call(db)
+    assert len(statements) == 1, statements
+
+    statement, parameters = statements[0]
+    connection = db.connection()
+    connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    rows = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).all()
+    return "\n".join(row[0] for row in rows)
+
+
+CURSOR = encode_cursor(datetime(2024, 1, 1, tzinfo=timezone.utc), 1)
+
+HOT_QUERIES = {
+    "get_user": (lambda db: user_service.get_user(db, 1), {"users_pkey", "ix_users_id"}),
+    "get_user_by_email": (
+        lambda db: user_service.get_user_by_email(db, "Someone@Example.com"),
+        {"uq_users_lower_email_live"},
+    ),
+    "get_user_by_oauth": (
+        lambda db: oauth_service.get_user_by_oauth(db, OAuthProvider.GOOGLE, "123"),
+        {"ix_users_oauth_provider_provider_id"},
+    ),
+    "count_active_admins": (user_service.count_active_admins, {"ix_users_role_active_live"}),
+    "get_users": (
+        lambda db: user_service.get_users(db, cursor=CURSOR),
+        {"ix_users_live_created_at_id", "ix_users_created_at_id"},
+    ),
+    "get_users_with_filters": (
+        lambda db: user_service.get_users_with_filters(db, include_deleted=True, cursor=CURSOR),
+        {"ix_users_created_at_id"},
+    ),
+    "search_users": (
+        lambda db: user_service.get_users_with_filters(db, q="smith", include_deleted=True),
+        {"ix_users_email_trgm", "ix_users_full_name_trgm"},
+    ),
+    "get_projects": (
+        lambda db: project_service.get_projects(db, owner_id=1),
+        {"ix_projects_owner_id_created_at_id"},
+    ),
+    "get_projects_next_page": (
+        lambda db: project_service.get_projects(db, owner_id=1, cursor=CURSOR),
+        {"ix_projects_owner_id_created_at_id"},
+    ),
+}
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_service_query_uses_index(db: Session, name: str):
+    """Test the service query is planned as an index scan on its index."""
+    call, indexes = HOT_QUERIES[name]
+
+    plan = explain(db, call)
+
+    assert "Seq Scan" not in plan, plan
+    assert any(index in plan for index in indexes), plan
+
+
+def test_hot_queries_reuse_compiled_sql(db: Session):
+    """Test repeating a hot lookup finds its compiled SQL in the statement cache."""
+    cache_hits = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        cache_hits.append(context.cache_hit is CacheStats.CACHE_HIT)
+
+    bind = db.get_bind()
+    event.listen(bind, "after_cursor_execute", record)
+    try:
+        for call in (
+            lambda: user_service.get_user(db, 1),
+            lambda: user_service.get_user_by_email(db, "someone@example.com"),
+            lambda: project_service.get_projects(db, owner_id=1, cursor=CURSOR),
+        ):
+            call()
+            del cache_hits[:]
+            call()
+            assert cache_hits == [True]
+    finally:
+        event.remove(bind, "after_cursor_execute", record)
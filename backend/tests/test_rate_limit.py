@@ -0,0 +1,183 @@
+import asyncio
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.rate_limit import InMemoryRateLimitBackend, SharedRateLimitBackend
+from app.middleware.rate_limit import RateLimitMiddleware
+
+
+class FakePipeline:
+    """Queues commands and runs them on execute, like a redis.asyncio pipeline."""
+
+    def __init__(self, store):
+        self.store = store
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.commands.append((getattr(self.store, name), args))
+            return self
+        return queue
+
+    async def execute(self):
+        return [await command(*args) for command, args in self.commands]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeRedis:
+    """Local stand-in for the shared store (async pipeline, incr/decr/get/expire)."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def incr(self, key):
+        self.data[key] = self.data.get(key, 0) + 1
+        return self.data[key]
+
+    async def decr(self, key):
+        self.data[key] = self.data.get(key, 0) - 1
+        return self.data[key]
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def expire(self, key, seconds):
+        self.ttls[key] = seconds
+        return True
+
+
+class BrokenBackend:
+    """A backend whose store is unreachable."""
+
+    async def hit(self, key, limit, window):
+        raise ConnectionError("store unavailable")
+
+
+def create_limited_app(backend, default_limit=3, routes=None) -> TestClient:
+    """Build a tiny app behind the rate limiter."""
+    app = FastAPI()
+
+    @app.get("/api/v1/items")
+    def items():
+        return {"ok": True}
+
+    @app.post("/api/v1/auth/login")
+    def login():
+        return {"ok": True}
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        backend=backend,
+        default_limit=default_limit,
+        routes=routes,
+        path_prefix="/api/v1",
+    )
+    return TestClient(app)
+
+
+def test_rejects_over_limit_with_retry_after():
+    """Test requests over the limit get 429 and Retry-After."""
+    client = create_limited_app(InMemoryRateLimitBackend(), default_limit=3)
+
+    for _ in range(3):
+        response = client.get("/api/v1/items")
+        assert response.status_code == 200
+
+    response = client.get("/api/v1/items")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.headers["X-RateLimit-Remaining"] == "0"
+
+
+def test_route_limits_are_independent():
+    """Test a per-route limit does not consume the default limit."""
+    client = create_limited_app(
+        InMemoryRateLimitBackend(), default_limit=5, routes={"/api/v1/auth/login": 1}
+    )
+
+    assert client.post("/api/v1/auth/login").status_code == 200
+    assert client.post("/api/v1/auth/login").status_code == 429
+    assert client.get("/api/v1/items").status_code == 200
+
+
+def test_limits_per_user_token():
+    """Test authenticated users are limited separately from each other."""
+    from app.core.security import create_access_token
+
+    client = create_limited_app(InMemoryRateLimitBackend(), default_limit=1)
+    alice = {"Authorization": f"Bearer {create_access_token('1')}"}
+    bob = {"Authorization": f"Bearer {create_access_token('2')}"}
+
+    assert client.get("/api/v1/items", headers=alice).status_code == 200
+    assert client.get("/api/v1/items", headers=alice).status_code == 429
+    assert client.get("/api/v1/items", headers=bob).status_code == 200
+
+
+def test_shared_backend_enforces_one_limit_across_workers():
+    """Test two app instances sharing a store enforce a single limit."""
+    store = FakeRedis()
+    worker_a = create_limited_app(SharedRateLimitBackend(store), default_limit=2)
+    worker_b = create_limited_app(SharedRateLimitBackend(store), default_limit=2)
+
+    assert worker_a.get("/api/v1/items").status_code == 200
+    assert worker_b.get("/api/v1/items").status_code == 200
+    assert worker_a.get("/api/v1/items").status_code == 429
+    assert worker_b.get("/api/v1/items").status_code == 429
+
+
+def test_shared_backend_sets_expiry_on_every_counter():
+    """Test each window counter gets its TTL in the same round trip as the increment."""
+    store = FakeRedis()
+    client = create_limited_app(SharedRateLimitBackend(store), default_limit=5)
+
+    client.get("/api/v1/items")
+
+    assert store.ttls and set(store.ttls) == set(store.data)
+    assert set(store.ttls.values()) == {120}
+
+
+def test_zero_limit_blocks_route():
+    """Test a route limit of 0 rejects every request with a full-window Retry-After."""
+    client = create_limited_app(InMemoryRateLimitBackend(), routes={"/api/v1/auth/login": 0})
+
+    response = client.post("/api/v1/auth/login")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "60"
+    assert client.get("/api/v1/items").status_code == 200
+
+
+def test_backend_errors_fail_open():
+    """Test requests still go through when the rate limit store is down."""
+    client = create_limited_app(BrokenBackend(), default_limit=1)
+
+    for _ in range(3):
+        response = client.get("/api/v1/items")
+        assert response.status_code == 200
+        assert "X-RateLimit-Limit" not in response.headers
+
+
+def test_in_memory_check_overhead():
+    """Benchmark: one in-memory limiter check should cost well under 50µs."""
+    backend = InMemoryRateLimitBackend()
+    keys = [f"*:ip:10.0.{i // 256}.{i % 256}" for i in range(1000)]
+    iterations = 20000
+
+    async def run():
+        start = time.perf_counter()
+        for i in range(iterations):
+            await backend.hit(keys[i % len(keys)], 1_000_000, 60)
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(run())
+    assert elapsed / iterations < 50e-6
@@ -0,0 +1,142 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, event, insert, select, update
+
+from app.db import consistency, session as db_session
+from app.middleware.replica import ReplicaConsistencyMiddleware
+from app.models.user import User
+
+# Engines are never connected to: these tests only check which one a statement is routed to
+primary = create_engine("postgresql://primary/app_db")
+replica = create_engine("postgresql://replica/app_db")
+
+
+def make_session(monkeypatch) -> db_session.RoutingSession:
+    monkeypatch.setattr(db_session, "replica_engines", [replica])
+    return db_session.RoutingSession(bind=primary)
+
+
+def test_reads_inside_block_go_to_replica(monkeypatch):
+    """Test SELECTs in replica_reads() use the replica and writes stay on the primary."""
+    db = make_session(monkeypatch)
+
+    with db_session.replica_reads(db):
+        assert db.get_bind(clause=select(User)) is replica
+        assert db.get_bind(clause=update(User).values(is_active=False)) is primary
+
+    assert db.get_bind(clause=select(User)) is primary
+
+
+def test_pinned_caller_reads_from_primary(monkeypatch):
+    """Test a caller who wrote recently is kept on the primary."""
+    db = make_session(monkeypatch)
+    token = consistency.current.set(consistency.WriteState.from_cookie(consistency.PRIMARY))
+    try:
+        with db_session.replica_reads(db):
+            assert db.get_bind(clause=select(User)) is primary
+    finally:
+        consistency.current.reset(token)
+
+
+def test_sticky_mode_ignores_replicas_until_lsn_cookie_expires(monkeypatch):
+    """Test an LSN cookie keeps reads on the primary in sticky mode."""
+    monkeypatch.setattr(db_session.settings, "REPLICA_CONSISTENCY", "sticky")
+    db = make_session(monkeypatch)
+    token = consistency.current.set(consistency.WriteState.from_cookie("0/16B3748"))
+    try:
+        with db_session.replica_reads(db):
+            assert db.get_bind(clause=select(User)) is primary
+    finally:
+        consistency.current.reset(token)
+
+
+def test_parse_lsn():
+    """Test LSNs compare in WAL order and malformed cookies are ignored."""
+    assert consistency.parse_lsn("0/16B3748") == 0x16B3748
+    assert consistency.parse_lsn("1/0") > consistency.parse_lsn("0/FFFFFFFF")
+    assert consistency.parse_lsn("0/16B3748'; --") is None
+    assert consistency.parse_lsn(None) is None
+
+
+def test_middleware_sets_cookie_after_write():
+    """Test the write position recorded during a request is returned as a cookie."""
+    app = FastAPI()
+
+    @app.post("/write")
+    def write():
+        state = consistency.current.get()
+        state.wrote = True
+        state.commit_lsn = "0/16B3748"
+        return {"ok": True}
+
+    @app.get("/read")
+    def read():
+        return {"required_lsn": consistency.current.get().required_lsn}
+
+    app.add_middleware(ReplicaConsistencyMiddleware, max_age=10)
+    client = TestClient(app)
+
+    response = client.post("/write")
+    assert response.cookies[consistency.COOKIE_NAME] == "0/16B3748"
+
+    response = client.get("/read")
+    assert response.json()["required_lsn"] == 0x16B3748
+    assert consistency.COOKIE_NAME not in response.cookies
+
+
+def test_lagging_replica_is_checked_once(monkeypatch):
+    """Test a replica behind the caller's write is asked once, then the request pins to the primary."""
+    db = make_session(monkeypatch)
+    monkeypatch.setattr(db_session.settings, "REPLICA_CONSISTENCY", "lsn")
+    replay_checks = []
+
+    class LaggingReplica:
+        def execute(self, statement):
+            replay_checks.append(statement)
+            return type("Result", (), {"scalar": lambda self: "0/1000"})()
+
+    monkeypatch.setattr(db, "connection", lambda bind_arguments=None: LaggingReplica())
+    state = consistency.WriteState.from_cookie("0/16B3748")
+    token = consistency.current.set(state)
+    try:
+        with db_session.replica_reads(db):
+            assert db.get_bind(clause=select(User)) is primary
+        assert len(replay_checks) == 1
+        assert state.pinned
+
+        with db_session.replica_reads(db):
+            assert db.get_bind(clause=select(User)) is primary
+        assert len(replay_checks) == 1
+    finally:
+        consistency.current.reset(token)
+
+
+def test_commit_lsn_read_on_the_writing_connection(monkeypatch):
+    """Test the WAL position is read after commit on the session's own connection."""
+    writer = create_engine("sqlite://")
+    statements = []
+
+    @event.listens_for(writer, "connect")
+    def add_lsn_function(dbapi_connection, connection_record):
+        dbapi_connection.create_function("pg_current_wal_lsn", 0, lambda: "0/16B3748")
+
+    @event.listens_for(writer, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    items = Table("items", MetaData(), Column("id", Integer, primary_key=True))
+    items.create(writer)
+    monkeypatch.setattr(db_session, "replica_engines", [replica])
+    monkeypatch.setattr(db_session.settings, "REPLICA_CONSISTENCY", "lsn")
+    db = db_session.RoutingSession(bind=writer)
+    state = consistency.WriteState()
+    token = consistency.current.set(state)
+    try:
+        db.execute(insert(items).values(id=1))
+        db.commit()
+    finally:
+        consistency.current.reset(token)
+        db.close()
+
+    assert state.commit_lsn == "0/16B3748"
+    assert statements[-1] == "SELECT pg_current_wal_lsn()"
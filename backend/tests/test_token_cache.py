@@ -0,0 +1,67 @@
+import base64
+import hashlib
+import json
+import time
+from datetime import timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.core.security import create_access_token, decode_token, token_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "TOKEN_CACHE_ENABLED", True)
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+def cache_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def with_subject(token: str, subject: str) -> str:
+    """The token with its payload's sub replaced, keeping the original signature."""
+    header, payload, signature = token.split(".")
+    claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    claims["sub"] = subject
+    forged = base64.urlsafe_b64encode(json.dumps(claims).encode()).rstrip(b"=").decode()
+    return f"{header}.{forged}.{signature}"
+
+
+def test_cached_token_rejected_after_exp():
+    """Test a cached token stops being accepted once its exp has passed."""
+    token = create_access_token(subject="1", expires_delta=timedelta(seconds=1))
+    assert decode_token(token)["sub"] == "1"
+    assert decode_token(token)["sub"] == "1"
+    assert token_cache.get(cache_key(token)) is not None
+
+    time.sleep(2.1)
+
+    assert decode_token(token) is None
+    assert token_cache.get(cache_key(token)) is None
+
+
+def test_tampered_token_never_cached():
+    """Test a token altered after signing is rejected and neither served from nor added to the cache."""
+    token = create_access_token(subject="1")
+    assert decode_token(token)["sub"] == "1"
+    hits = token_cache.hits
+
+    tampered = with_subject(token, "2")
+    assert decode_token(tampered) is None
+    assert decode_token(tampered) is None
+
+    assert token_cache.hits == hits
+    assert token_cache.get(cache_key(tampered)) is None
+    assert token_cache.stats()["size"] == 1
+
+
+def test_cached_claims_are_copies():
+    """Test callers mutating decoded claims do not change what the cache returns."""
+    token = create_access_token(subject="1")
+    decode_token(token)["sub"] = "2"
+
+    assert decode_token(token)["sub"] == "1"
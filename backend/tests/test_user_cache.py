@@ -0,0 +1,111 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.api.deps import _user_without_db
+from app.core.config import settings
+from app.core.constants import UserRole
+from app.core.security import create_access_token, decode_token, user_claims
+from app.models.user import User
+from app.services import user_cache
+
+
+@pytest.fixture
+def accounts(db: Session) -> dict:
+    """An admin and a regular user, with auth headers for both."""
+    admin = User(email="admin@example.com", hashed_password="x", role=UserRole.ADMIN)
+    member = User(email="member@example.com", hashed_password="x")
+    db.add_all([admin, member])
+    db.commit()
+    return {
+        "admin": {"Authorization": f"Bearer {create_access_token(str(admin.id))}"},
+        "member": {"Authorization": f"Bearer {create_access_token(str(member.id))}"},
+        "member_id": member.id,
+    }
+
+
+def cached_member(client: TestClient, accounts: dict) -> None:
+    """Make a request as the member so their auth record is cached."""
+    assert client.get("/api/v1/users/me", headers=accounts["member"]).status_code == 200
+    assert user_cache.get(accounts["member_id"]) is not None
+
+
+def test_role_change_applies_on_next_request(client: TestClient, accounts: dict):
+    """Test promoting a cached user lets their next request through admin-only routes."""
+    cached_member(client, accounts)
+    assert client.get("/api/v1/admin/users", headers=accounts["member"]).status_code == 403
+
+    response = client.put(
+        f"/api/v1/admin/users/{accounts['member_id']}/role",
+        headers=accounts["admin"],
+        json={"role": "admin"}
+    )
+    assert response.status_code == 200
+
+    assert client.get("/api/v1/admin/users", headers=accounts["member"]).status_code == 200
+
+
+def test_deactivation_applies_on_next_request(client: TestClient, accounts: dict):
+    """Test deactivating and reactivating a cached user takes effect immediately."""
+    cached_member(client, accounts)
+
+    client.put(f"/api/v1/admin/users/{accounts['member_id']}/deactivate", headers=accounts["admin"])
+    response = client.get("/api/v1/users/me", headers=accounts["member"])
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Inactive user"
+
+    client.put(f"/api/v1/admin/users/{accounts['member_id']}/activate", headers=accounts["admin"])
+    assert client.get("/api/v1/users/me", headers=accounts["member"]).status_code == 200
+
+
+def test_soft_delete_applies_on_next_request(client: TestClient, accounts: dict):
+    """Test a soft-deleted cached user is rejected on their next request."""
+    cached_member(client, accounts)
+
+    response = client.delete(f"/api/v1/admin/users/{accounts['member_id']}", headers=accounts["admin"])
+    assert response.status_code == 200
+
+    response = client.get("/api/v1/users/me", headers=accounts["member"])
+    assert response.status_code == 401
+    assert response.json()["detail"] == "User account has been deleted"
+
+
+def embedded_claims_token(user: User) -> str:
+    return create_access_token(str(user.id), claims=user_claims(user))
+
+
+def test_embedded_claims_trusted_until_newer_version_seen(monkeypatch):
+    """Test token claims authorize a cache miss only while no newer state_version is known."""
+    monkeypatch.setattr(settings, "JWT_TRUST_EMBEDDED_CLAIMS", True)
+    user_cache.clear()
+    user = User(
+        id=41, email="claims@example.com", role=UserRole.ADMIN, is_active=True, is_deleted=False, state_version=3
+    )
+    payload = decode_token(embedded_claims_token(user))
+
+    record = _user_without_db(payload)
+    assert (record.role, record.is_active, record.state_version) == (UserRole.ADMIN, True, 3)
+
+    # A write through this worker distrusts the claims until the user is reloaded
+    user_cache.invalidate(user.id)
+    assert _user_without_db(payload) is None
+
+    user.state_version = 4
+    user_cache.remember(user)
+    user_cache._cache.clear()  # the cached record has expired; the known version has not
+    assert _user_without_db(payload) is None
+    assert _user_without_db(decode_token(embedded_claims_token(user))).state_version == 4
+
+
+def test_embedded_claims_ignored_after_deactivation(client: TestClient, accounts: dict, db: Session, monkeypatch):
+    """Test a deactivated user's old token is checked against the database, not its claims."""
+    monkeypatch.setattr(settings, "JWT_TRUST_EMBEDDED_CLAIMS", True)
+    member = db.get(User, accounts["member_id"])
+    headers = {"Authorization": f"Bearer {embedded_claims_token(member)}"}
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+
+    client.put(f"/api/v1/admin/users/{accounts['member_id']}/deactivate", headers=accounts["admin"])
+
+    response = client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Inactive user"
@@ -0,0 +1,100 @@
+import io
+import json
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.constants import UserRole
+from app.core.password_pool import password_pool
+from app.core.security import create_access_token
+from app.models.user import User
+from app.services import user_import
+from app.services.user_import import read_rows
+
+
+def admin_headers(db: Session) -> dict:
+    """Create an admin directly in the database and return auth headers for it."""
+    admin = User(email="admin@example.com", hashed_password="x", role=UserRole.ADMIN)
+    db.add(admin)
+    db.commit()
+    return {"Authorization": f"Bearer {create_access_token(str(admin.id))}"}
+
+
+def test_read_rows_reports_bad_ndjson_lines():
+    """Test unparseable NDJSON lines come back as errors with their row number."""
+    stream = io.StringIO('{"email": "a@example.com"}\n\nnot json\n')
+
+    rows = list(read_rows(stream, "ndjson"))
+
+    assert rows[0] == (1, {"email": "a@example.com"})
+    assert rows[1][0] == 2 and isinstance(rows[1][1], ValueError)
+
+
+def test_import_users_csv(client: TestClient, db: Session):
+    """Test a CSV import creates valid rows and reports every rejected one."""
+    headers = admin_headers(db)
+    deleted = User(email="returning@example.com", hashed_password="x", is_deleted=True)
+    db.add(deleted)
+    db.commit()
+
+    body = "\n".join([
+        "email,password,full_name",
+        "new@example.com,password123,New User",
+        "not-an-email,password123,",
+        "NEW@example.com,password123,Duplicate",
+        "admin@example.com,password123,Existing",
+        "returning@example.com,password123,Returning",
+    ])
+    response = client.post("/api/v1/admin/users/import", headers=headers, content=body)
+
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines()]
+    errors = {event["row"]: event["error"] for event in events if event["type"] == "error"}
+    assert set(errors) == {2, 3, 4}
+    assert errors[3] == "Duplicate email in import"
+    assert errors[4] == "Email already registered"
+    assert events[-1] == {"type": "summary", "processed": 5, "created": 2, "failed": 3}
+
+    assert db.query(User).filter(User.email == "new@example.com").one().full_name == "New User"
+    assert db.query(User).filter(User.email == "returning@example.com", User.is_deleted == False).count() == 1
+
+
+def test_import_users_requires_admin(client: TestClient):
+    """Test non-admins cannot import users."""
+    response = client.post("/api/v1/admin/users/import", content="email,password\n")
+
+    assert response.status_code == 401
+
+
+def test_import_failure_ends_with_fatal_error_and_summary(client: TestClient, db: Session, monkeypatch):
+    """Test a chunk failing mid-stream is reported, followed by a summary of the committed chunks."""
+    headers = admin_headers(db)
+    monkeypatch.setattr(settings, "USER_IMPORT_CHUNK_SIZE", 1)
+    load_chunk = user_import.load_chunk
+
+    def fail_second_chunk(db, rows, hashes):
+        if rows[0][0] == 2:
+            raise RuntimeError("connection lost")
+        return load_chunk(db, rows, hashes)
+
+    monkeypatch.setattr(user_import, "load_chunk", fail_second_chunk)
+    body = "email,password\nfirst@example.com,password123\nsecond@example.com,password123\n"
+    response = client.post("/api/v1/admin/users/import", headers=headers, content=body)
+
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[-2] == {"type": "error", "fatal": True, "error": "Import stopped by a server error"}
+    assert events[-1] == {"type": "summary", "processed": 1, "created": 1, "failed": 0}
+    assert password_pool.stats()["reserved"] == 0
+
+
+def test_import_busy_pool_is_503(client: TestClient, db: Session, monkeypatch):
+    """Test an import is refused up front when the password pool has no free slots."""
+    headers = admin_headers(db)
+    monkeypatch.setattr(password_pool, "_reserved", password_pool.workers + password_pool.max_queue)
+
+    response = client.post("/api/v1/admin/users/import", headers=headers, content="email,password\n")
+
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
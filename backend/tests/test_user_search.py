@@ -0,0 +1,48 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.constants import OAuthProvider, UserRole
+from app.models.user import User
+from app.services import user as user_service
+
+
+@pytest.fixture
+def users(db: Session):
+    db.add_all([
+        User(email="jane.smith@example.com", full_name="Jane Smith", hashed_password="x"),
+        User(email="jsmyth@example.com", full_name="John Smyth", hashed_password="x", is_active=False),
+        User(email="ops@example.com", full_name="Ops Admin", hashed_password="x", role=UserRole.ADMIN),
+        User(email="gh@example.com", full_name="Octo Cat", oauth_provider=OAuthProvider.GITHUB, oauth_provider_id="1"),
+        User(email="100%_real@example.com", full_name="Percent", hashed_password="x"),
+    ])
+    db.commit()
+
+
+def emails(users) -> list:
+    return [user.email for user in users]
+
+
+def test_search_matches_substring_and_similar_names(db: Session, users):
+    """Test q matches email/name substrings case-insensitively and near-miss names."""
+    assert emails(user_service.get_users_with_filters(db, q="SMITH")) == ["jane.smith@example.com"]
+    assert emails(user_service.get_users_with_filters(db, q="Jon Smyth")) == ["jsmyth@example.com"]
+
+
+def test_search_escapes_like_wildcards(db: Session, users):
+    """Test % and _ in q are matched literally."""
+    assert emails(user_service.get_users_with_filters(db, q="0%_r")) == ["100%_real@example.com"]
+
+
+def test_filters_combine(db: Session, users):
+    """Test role, active and OAuth provider filters narrow the listing."""
+    assert emails(user_service.get_users_with_filters(db, role=UserRole.ADMIN)) == ["ops@example.com"]
+    assert emails(user_service.get_users_with_filters(db, q="example", is_active=False)) == ["jsmyth@example.com"]
+    assert emails(user_service.get_users_with_filters(db, oauth_provider=OAuthProvider.GITHUB)) == ["gh@example.com"]
+
+
+def test_search_rejects_short_queries(db: Session):
+    """Test a query too short for the trigram indexes is rejected."""
+    with pytest.raises(HTTPException) as exc:
+        user_service.get_users_with_filters(db, q="ab")
+    assert exc.value.status_code == 400
@@ -0,0 +1,110 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.constants import UserRole
+from app.models.user import User
+from app.models.user_counters import install_counters, remove_counters
+from app.services import user as user_service
+from app.services.user import USER_COUNTERS_QUERY, USER_STATS_QUERY
+
+
+@pytest.fixture
+def user_counters(db: Session, monkeypatch):
+    """Opt in to the counters trigger, which is off by default."""
+    monkeypatch.setattr(settings, "USER_STATS_COUNTERS", True)
+    with db.get_bind().begin() as conn:
+        install_counters(conn)
+
+
+def counters(db: Session) -> dict:
+    return dict(db.execute(USER_COUNTERS_QUERY).one()._mapping)
+
+
+def counted(db: Session) -> dict:
+    return dict(db.execute(USER_STATS_QUERY).one()._mapping)
+
+
+def test_counters_follow_user_writes(db: Session, user_counters):
+    """Test the trigger-maintained counters match a full count after each kind of write."""
+    users = [User(email=f"user{i}@example.com", hashed_password="x") for i in range(4)]
+    users.append(User(email="admin@example.com", hashed_password="x", role=UserRole.ADMIN))
+    db.add_all(users)
+    db.commit()
+    assert counters(db) == counted(db) == {
+        "total_users": 5,
+        "active_users": 5,
+        "inactive_users": 0,
+        "admin_users": 1,
+        "deleted_users": 0,
+    }
+
+    users[0].is_active = False
+    users[1].is_deleted = True
+    users[2].role = UserRole.ADMIN
+    db.commit()
+    assert counters(db) == counted(db)
+
+    db.delete(users[3])
+    db.commit()
+    assert counters(db) == counted(db)
+
+
+def test_counters_survive_concurrent_writes(db: Session, user_counters):
+    """Test counters stay exact when users are created and changed from many connections at once."""
+    bind = db.get_bind()
+
+    def write(worker: int) -> None:
+        with Session(bind) as session:
+            for i in range(10):
+                user = User(email=f"w{worker}-{i}@example.com", hashed_password="x")
+                session.add(user)
+                session.commit()
+                if i % 3 == 0:
+                    user.is_active = False
+                elif i % 3 == 1:
+                    user.role = UserRole.ADMIN
+                else:
+                    user.is_deleted = True
+                session.commit()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(write, range(8)))
+
+    assert counters(db) == counted(db)
+    assert counters(db)["total_users"] == 8 * 7
+
+
+def test_counters_removed_and_reinstalled(db: Session, user_counters, monkeypatch):
+    """Test without the trigger writes skip the counters, and installing it again recounts."""
+    monkeypatch.setattr(settings, "USER_STATS_COUNTERS", False)
+    with db.get_bind().begin() as conn:
+        remove_counters(conn)
+
+    db.add(User(email="user@example.com", hashed_password="x"))
+    db.commit()
+    assert db.execute(USER_COUNTERS_QUERY).first() is None
+    user_service.user_stats_cache.clear()
+    assert user_service.get_user_stats(db)["total_users"] == 1
+
+    with db.get_bind().begin() as conn:
+        install_counters(conn)
+    db.add(User(email="other@example.com", hashed_password="x", role=UserRole.ADMIN))
+    db.commit()
+    assert counters(db) == counted(db)
+    assert counters(db)["admin_users"] == 1
+
+
+def test_user_stats_are_cached(db: Session):
+    """Test repeated stats reads within the TTL do not hit the database."""
+    user_service.user_stats_cache.clear()
+    db.add(User(email="user@example.com", hashed_password="x"))
+    db.commit()
+
+    assert user_service.get_user_stats(db)["total_users"] == 1
+
+    db.add(User(email="other@example.com", hashed_password="x"))
+    db.commit()
+    assert user_service.get_user_stats(db)["total_users"] == 1
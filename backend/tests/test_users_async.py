@@ -0,0 +1,143 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.api.v1.routers import admin_async, auth_async, oauth_async, users_async
+from app.core.config import settings
+from app.core.constants import OAuthProvider, UserRole
+from app.core.security import create_access_token
+from app.db.session import get_async_db
+from app.models.user import User
+from app.services import user_cache
+from app.services.user import user_stats_cache
+
+ASYNC_TEST_DATABASE_URL = f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_SERVER}:{settings.POSTGRES_PORT}/test_db"
+
+
+@pytest.fixture
+async def client(db: Session):
+    """Async client for the DB_ASYNC_MODE auth, OAuth, user and admin routers, bound to test_db."""
+    engine = create_async_engine(ASYNC_TEST_DATABASE_URL)
+    sessions = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with sessions() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(auth_async.router, prefix="/api/v1/auth")
+    app.include_router(oauth_async.router, prefix="/api/v1/auth")
+    app.include_router(users_async.router, prefix="/api/v1/users")
+    app.include_router(admin_async.router, prefix="/api/v1/admin")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    user_cache.clear()
+    user_stats_cache.clear()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as test_client:
+        yield test_client
+    await engine.dispose()
+
+
+async def register_and_login(client: httpx.AsyncClient, email: str = "async@example.com") -> dict:
+    response = await client.post("/api/v1/auth/register", json={"email": email, "password": "asyncpassword123"})
+    assert response.status_code == 201
+    response = await client.post("/api/v1/auth/login", data={"username": email, "password": "asyncpassword123"})
+    assert response.status_code == 200
+    return response.json()
+
+
+async def with_refresh_cookie(client: httpx.AsyncClient, path: str, refresh_token: str) -> httpx.Response:
+    """POST to path with only the given refresh token cookie set."""
+    client.cookies.clear()
+    client.cookies.set("refresh_token", refresh_token)
+    return await client.post(path)
+
+
+async def test_register_login_refresh_logout(client: httpx.AsyncClient):
+    """Test the async auth flow: register, login, rotate the refresh token, reject its reuse, log out."""
+    tokens = await register_and_login(client)
+    response = await client.post("/api/v1/auth/register", json={"email": "ASYNC@example.com", "password": "x" * 12})
+    assert response.status_code == 400
+
+    first_refresh = tokens["refresh_token"]
+    response = await with_refresh_cookie(client, "/api/v1/auth/refresh", first_refresh)
+    assert response.status_code == 200
+    second_refresh = response.json()["refresh_token"]
+
+    assert (await with_refresh_cookie(client, "/api/v1/auth/refresh", first_refresh)).status_code == 401
+    # Reuse revoked the whole family
+    assert (await with_refresh_cookie(client, "/api/v1/auth/refresh", second_refresh)).status_code == 401
+
+    tokens = (await client.post(
+        "/api/v1/auth/login", data={"username": "async@example.com", "password": "asyncpassword123"}
+    )).json()
+    assert (await with_refresh_cookie(client, "/api/v1/auth/logout", tokens["refresh_token"])).status_code == 200
+    assert (await with_refresh_cookie(client, "/api/v1/auth/refresh", tokens["refresh_token"])).status_code == 401
+
+
+async def test_read_and_update_me(client: httpx.AsyncClient):
+    """Test /users/me reads, updates and changes the password through the async router."""
+    tokens = await register_and_login(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    response = await client.put("/api/v1/users/me", headers=headers, json={"full_name": "Async User"})
+    assert response.status_code == 200
+    response = await client.get("/api/v1/users/me", headers=headers)
+    assert response.json()["full_name"] == "Async User"
+
+    response = await client.put("/api/v1/users/me", headers=headers, json={"role": "admin"})
+    assert response.status_code == 403
+
+    await client.put("/api/v1/users/me", headers=headers, json={"password": "changedpassword123"})
+    response = await client.post(
+        "/api/v1/auth/login", data={"username": "async@example.com", "password": "changedpassword123"}
+    )
+    assert response.status_code == 200
+
+
+async def test_admin_user_management(client: httpx.AsyncClient, db: Session):
+    """Test admin listing, stats, role change and deactivation through the async routers."""
+    admin = User(email="admin@example.com", hashed_password="x", role=UserRole.ADMIN)
+    member = User(email="member@example.com", hashed_password="x")
+    db.add_all([admin, member])
+    db.commit()
+    admin_headers = {"Authorization": f"Bearer {create_access_token(str(admin.id))}"}
+    member_headers = {"Authorization": f"Bearer {create_access_token(str(member.id))}"}
+
+    assert (await client.get("/api/v1/users/", headers=member_headers)).status_code == 403
+    response = await client.get("/api/v1/admin/users", headers=admin_headers, params={"q": "member"})
+    assert [user["email"] for user in response.json()] == ["member@example.com"]
+    response = await client.get("/api/v1/admin/users/stats", headers=admin_headers)
+    assert response.json()["total_users"] == 2
+
+    response = await client.put(
+        f"/api/v1/admin/users/{member.id}/role", headers=admin_headers, json={"role": "admin"}
+    )
+    assert response.status_code == 200
+    assert (await client.get("/api/v1/users/", headers=member_headers)).status_code == 200
+
+    await client.put(f"/api/v1/admin/users/{member.id}/deactivate", headers=admin_headers)
+    response = await client.get("/api/v1/users/me", headers=member_headers)
+    assert response.status_code == 400
+
+    response = await client.delete("/api/v1/admin/users/999999", headers=admin_headers)
+    assert response.status_code == 404
+
+
+async def test_oauth_user_adds_password(client: httpx.AsyncClient, db: Session):
+    """Test an OAuth-only user can add a password once through the async router."""
+    user = User(email="oauth@example.com", oauth_provider=OAuthProvider.GOOGLE, oauth_provider_id="g-1")
+    db.add(user)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(str(user.id))}"}
+
+    response = await client.post("/api/v1/auth/add-password", headers=headers, json={"password": "newpassword123"})
+    assert response.status_code == 200
+    response = await client.post(
+        "/api/v1/auth/login", data={"username": "oauth@example.com", "password": "newpassword123"}
+    )
+    assert response.status_code == 200
+
+    response = await client.post("/api/v1/auth/add-password", headers=headers, json={"password": "otherpass123"})
+    assert response.status_code == 400